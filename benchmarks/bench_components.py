@@ -0,0 +1,286 @@
+"""
+Measures the throughput and peak memory of each component of an
+event-driven backtest on a synthetic universe (see
+synthetic_data.py), and of a full BacktestEqualWeightPortFromCSV
+run, saving the results as JSON so that versions can be compared.
+
+Each benchmark runs in its own process, so its peak memory is
+not inflated by the ones before it. Throughput is given in bars
+(timestamps) per second and in symbol bars, one symbol's OHLCV
+at one timestamp, per second.
+
+Usage: python benchmarks/bench_components.py [--symbols 10]
+    [--bars 5000] [--frequency D|M] [--header-format mine]
+    [--only load,update_bars,...] [--output results.json]
+    [--compare previous.json]
+"""
+import argparse
+import datetime
+import json
+import multiprocessing
+import os.path
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from synthetic_data import generate_universe
+from systemtrade import strategy as strategies
+from systemtrade.backtest import BacktestEqualWeightPortFromCSV
+from systemtrade.backtest.backtest_eq_from_csv import header_names
+from systemtrade.data_handler import HistoricCSVDataHandler
+from systemtrade.execution_handler import SimulatedExecutionHandler
+from systemtrade.monitor import configure_logging
+from systemtrade.output import NullOutputSink
+from systemtrade.portfolio import EqualWeightedPortfolio, Portfolio
+from systemtrade.portfolio.performance import create_drawdowns
+
+
+STRATEGIES = [
+    "BuyAndHoldStrategy", "SimpleMovingAverageCrossStrategy",
+    "ExponentialMovingAverageCrossStrategy", "ChannelBreakoutStrategy",
+    "MomentumStrategy", "MACDStrategy", "NewHighStrategy",
+    "BatchMovingAverageCrossStrategy",
+]
+
+START_DATE = datetime.datetime(1992, 1, 2)
+
+
+class _Events(object):
+    """
+    Stands in for the event bus, keeping only the latest event.
+    """
+
+    def __init__(self):
+        self.event = None
+
+    def put(self, event):
+        self.event = event
+
+
+def _load_bars(config):
+    return HistoricCSVDataHandler(
+        _Events(), config["csv_dir"], config["symbols"],
+        header_names(config["header_format"])
+    )
+
+def _step_bars(bars, handler):
+    """
+    Steps through the bars as the backtest does, timing only the
+    handler called with each MarketEvent.
+    """
+    elapsed = 0.0
+    count = 0
+    while bars.continue_backtest:
+        bars.update_bars()
+        event = bars.events.event
+        start = time.time()
+        handler(event)
+        elapsed += time.time() - start
+        count += 1
+    return elapsed, count
+
+def bench_load(config):
+    start = time.time()
+    bars = _load_bars(config)
+    return time.time() - start, len(bars.bar_store)
+
+def bench_update_bars(config):
+    bars = _load_bars(config)
+    count = 0
+    start = time.time()
+    while bars.continue_backtest:
+        bars.update_bars()
+        count += 1
+    return time.time() - start, count
+
+def bench_calculate_signals(config, name):
+    bars = _load_bars(config)
+    strategy = getattr(strategies, name)(bars, _Events())
+    bars.set_max_lookback(strategy.max_lookback)
+    return _step_bars(bars, strategy.calculate_signals)
+
+def bench_update_timeindex(config):
+    bars = _load_bars(config)
+    portfolio = Portfolio(bars, _Events(), START_DATE, config["frequency"])
+    return _step_bars(bars, portfolio.update_timeindex)
+
+def bench_create_drawdowns(config):
+    random_state = np.random.RandomState(0)
+    returns = random_state.normal(0.0002, 0.01, config["bars"])
+    pnl = pd.Series(
+        np.cumprod(1.0 + returns),
+        index=pd.date_range(START_DATE, periods=config["bars"], freq="T")
+    )
+    start = time.time()
+    create_drawdowns(pnl)
+    return time.time() - start, config["bars"]
+
+def bench_backtest(config):
+    backtest = BacktestEqualWeightPortFromCSV(
+        config["csv_dir"], config["symbols"], 100000.0, START_DATE,
+        HistoricCSVDataHandler, SimulatedExecutionHandler,
+        EqualWeightedPortfolio, strategies.SimpleMovingAverageCrossStrategy,
+        periods=config["frequency"], header_format=config["header_format"],
+        output_sink=NullOutputSink()
+    )
+    start = time.time()
+    backtest.simulate_trading()
+    return time.time() - start, len(backtest.data_handler.bar_store)
+
+def get_benchmarks():
+    """
+    Returns the list of (name, function, extra arguments) of
+    every benchmark.
+    """
+    benchmarks = [
+        ("load", bench_load, ()),
+        ("update_bars", bench_update_bars, ()),
+    ]
+    for name in STRATEGIES:
+        benchmarks.append(
+            ("calculate_signals:%s" % name, bench_calculate_signals, (name,))
+        )
+    benchmarks += [
+        ("update_timeindex", bench_update_timeindex, ()),
+        ("create_drawdowns", bench_create_drawdowns, ()),
+        ("backtest", bench_backtest, ()),
+    ]
+    return benchmarks
+
+def _max_rss_mb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def _run_in_child(queue, function, config, args):
+    configure_logging(quiet=True)
+    baseline = _max_rss_mb()
+    seconds, bars = function(config, *args)
+    queue.put((seconds, bars, baseline, _max_rss_mb()))
+
+def run_benchmark(name, function, config, args=()):
+    """
+    Runs one benchmark in a child process and returns its result.
+    """
+    queue = multiprocessing.Queue()
+    child = multiprocessing.Process(
+        target=_run_in_child, args=(queue, function, config, args)
+    )
+    child.start()
+    seconds, bars, baseline, peak = queue.get()
+    child.join()
+
+    symbol_bars = bars if name == "create_drawdowns" else bars * len(config["symbols"])
+    return {
+        "name": name,
+        "seconds": seconds,
+        "bars": bars,
+        "symbol_bars": symbol_bars,
+        "bars_per_sec": bars / seconds if seconds > 0 else None,
+        "symbol_bars_per_sec": symbol_bars / seconds if seconds > 0 else None,
+        "baseline_memory_mb": baseline,
+        "peak_memory_mb": peak,
+    }
+
+def _git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__))
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(previous, results):
+    """
+    Prints the throughput of each benchmark against a previous run.
+    """
+    if previous["universe"] != results["universe"]:
+        print "Warning: the universes differ, %s against %s" % (
+            previous["universe"], results["universe"]
+        )
+    before = dict((r["name"], r) for r in previous["results"])
+    print "%-56s %14s %14s %8s" % ("benchmark", "before", "after", "ratio")
+    for result in results["results"]:
+        old = before.get(result["name"])
+        if old is None or not old["bars_per_sec"] or not result["bars_per_sec"]:
+            continue
+        print "%-56s %14.0f %14.0f %7.2fx" % (
+            result["name"], old["bars_per_sec"], result["bars_per_sec"],
+            result["bars_per_sec"] / old["bars_per_sec"]
+        )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks the backtest components.")
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--bars", type=int, default=5000)
+    parser.add_argument("--frequency", default="D", choices=["D", "M"])
+    parser.add_argument("--header-format", default="mine", choices=["mine", "yahoo", "iqfeed"])
+    parser.add_argument("--missing", type=float, default=0.0,
+                        help="Fraction of bars left out of each file.")
+    parser.add_argument("--only", default=None,
+                        help="Comma separated benchmark names or prefixes to run.")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", default=None,
+                        help="A previous results file to compare against.")
+    args = parser.parse_args(argv)
+
+    csv_dir = tempfile.mkdtemp(prefix="bench_")
+    try:
+        symbols = generate_universe(
+            csv_dir, args.symbols, args.bars, args.frequency,
+            args.header_format, missing=args.missing
+        )
+        config = {
+            "csv_dir": os.path.join(csv_dir, ""),
+            "symbols": symbols,
+            "bars": args.bars,
+            "frequency": args.frequency,
+            "header_format": args.header_format,
+        }
+        only = args.only.split(",") if args.only else None
+
+        runs = []
+        for name, function, extra in get_benchmarks():
+            if only and not any(name.startswith(o) for o in only):
+                continue
+            result = run_benchmark(name, function, config, extra)
+            print "%-56s %10.0f bars/sec %12.0f symbol bars/sec %7.1f MB" % (
+                name, result["bars_per_sec"] or 0, result["symbol_bars_per_sec"] or 0,
+                result["peak_memory_mb"]
+            )
+            runs.append(result)
+    finally:
+        shutil.rmtree(csv_dir, ignore_errors=True)
+
+    results = {
+        "created": datetime.datetime.now().isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "universe": {
+            "symbols": args.symbols,
+            "bars": args.bars,
+            "frequency": args.frequency,
+            "header_format": args.header_format,
+            "missing": args.missing,
+        },
+        "results": runs,
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+    return results
+
+if __name__ == "__main__":
+    main()
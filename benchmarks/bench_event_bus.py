@@ -0,0 +1,84 @@
+"""
+Measures the events per second each event bus delivers in the
+pattern of the backtest loop: a MarketEvent whose handler puts a
+SignalEvent, which leads to an OrderEvent and then a FillEvent.
+The Queue.Queue loop the backtest used before is the baseline.
+
+Usage: python benchmarks/bench_event_bus.py [market events]
+"""
+import os.path
+import Queue
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from systemtrade.event import (
+    MarketEvent, SignalEvent, OrderEvent, FillEvent,
+    DequeEventBus, ThreadSafeEventBus
+)
+
+
+def run_queue(n):
+    """
+    The loop of the original backtest: Queue.Queue drained with
+    get(False) until Queue.Empty, dispatching on event.type.
+    """
+    events = Queue.Queue()
+    signal = SignalEvent(1, "BBL", None, "LONG", 1.0)
+    order = OrderEvent("BBL", "MKT", 100, "BUY")
+    fill = FillEvent(None, "BBL", "ARCA", 100, "BUY", None)
+    count = 0
+    for i in xrange(n):
+        events.put(MarketEvent())
+        while True:
+            try:
+                event = events.get(False)
+            except Queue.Empty:
+                break
+            else:
+                if event is not None:
+                    count += 1
+                    if event.type == 'MARKET':
+                        events.put(signal)
+                    elif event.type == 'SIGNAL':
+                        events.put(order)
+                    elif event.type == 'ORDER':
+                        events.put(fill)
+                    elif event.type == 'FILL':
+                        pass
+    return count
+
+def run_bus(bus_cls, n):
+    """
+    The same flow of events through an EventBus.
+    """
+    events = bus_cls()
+    signal = SignalEvent(1, "BBL", None, "LONG", 1.0)
+    order = OrderEvent("BBL", "MKT", 100, "BUY")
+    fill = FillEvent(None, "BBL", "ARCA", 100, "BUY", None)
+    events.subscribe(MarketEvent, lambda event: events.put(signal))
+    events.subscribe(SignalEvent, lambda event: events.put(order))
+    events.subscribe(OrderEvent, lambda event: events.put(fill))
+    events.subscribe(FillEvent, lambda event: None)
+    count = 0
+    for i in xrange(n):
+        events.put(MarketEvent())
+        count += events.dispatch()
+    return count
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    runs = [
+        ("Queue.Queue", lambda: run_queue(n)),
+        ("DequeEventBus", lambda: run_bus(DequeEventBus, n)),
+        ("ThreadSafeEventBus", lambda: run_bus(ThreadSafeEventBus, n)),
+    ]
+    for name, run in runs:
+        start = time.time()
+        count = run()
+        elapsed = time.time() - start
+        print "%-20s %10.0f events/sec" % (name, count / elapsed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Generates synthetic OHLCV universes for the benchmarks: a CSV
+file per symbol, in any of the header formats the backtests
+read, with daily or minute bars.
+
+Usage: python benchmarks/synthetic_data.py csv_dir [symbols] [bars]
+    [D|M] [mine|yahoo|iqfeed]
+"""
+import datetime
+import os
+import os.path
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+# The header row and column order of each format
+HEADERS = {
+    "mine": ["Date", "Open", "High", "Low", "Close", "Volume"],
+    "yahoo": ["Date", "Open", "High", "Low", "Close", "Volume", "Adj Close"],
+    "iqfeed": ["datetime", "open", "low", "high", "close", "volume", "oi"],
+}
+
+# Minute bars of a 6.5 hour trading day
+MINUTES_PER_DAY = 390
+
+
+def symbol_names(num_symbols):
+    """
+    Returns the names of the symbols of a universe.
+    """
+    return ["SYM%04d" % i for i in xrange(num_symbols)]
+
+def generate_timestamps(num_bars, frequency="D", start=datetime.datetime(1992, 1, 2)):
+    """
+    Returns the DatetimeIndex of num_bars business day bars, or
+    of num_bars minute bars from 09:30 to 16:00 on business days.
+    """
+    if frequency == "D":
+        return pd.bdate_range(start, periods=num_bars)
+    days = pd.bdate_range(start, periods=-(-num_bars // MINUTES_PER_DAY))
+    minutes = np.arange(MINUTES_PER_DAY) * 60 * 10**9 + (9 * 60 + 30) * 60 * 10**9
+    stamps = (days.asi8[:, None] + minutes[None, :]).ravel()[:num_bars]
+    return pd.DatetimeIndex(stamps)
+
+def generate_bars(timestamps, random_state, price=100.0, volatility=0.02):
+    """
+    Returns a DataFrame of OHLCV bars following a geometric
+    random walk, with the high and low bracketing the open and
+    close.
+    """
+    n = len(timestamps)
+    close = price * np.exp(np.cumsum(random_state.normal(0.0, volatility, n)))
+    open_ = np.empty(n)
+    open_[0] = price
+    open_[1:] = close[:-1] * np.exp(random_state.normal(0.0, volatility / 4.0, n - 1))
+    spread = np.abs(random_state.normal(0.0, volatility / 2.0, n))
+    high = np.maximum(open_, close) * (1.0 + spread)
+    low = np.minimum(open_, close) * (1.0 - spread)
+    volume = random_state.randint(1000, 1000000, n)
+    return pd.DataFrame(
+        {"open": open_, "high": high, "low": low, "close": close, "volume": volume},
+        index=timestamps
+    )
+
+def write_csv(path, bars, header_format="mine", date_format=None):
+    """
+    Writes bars to a CSV file in a header format.
+    """
+    columns = {
+        "Open": "open", "High": "high", "Low": "low", "Close": "close",
+        "Volume": "volume", "Adj Close": "close",
+    }
+    out = pd.DataFrame(index=bars.index)
+    for header in HEADERS[header_format][1:]:
+        if header == "oi":
+            out[header] = 0
+        else:
+            out[header] = bars[columns.get(header, header)]
+    out.index.name = HEADERS[header_format][0]
+    out.to_csv(path, date_format=date_format, float_format="%.6f")
+
+def generate_universe(
+    csv_dir, num_symbols, num_bars, frequency="D",
+    header_format="mine", missing=0.0, seed=0
+):
+    """
+    Writes a CSV file of synthetic bars for each symbol of a
+    universe and returns the list of symbols.
+
+    Parameters:
+    csv_dir - The directory to write the CSV files to.
+    num_symbols - The number of symbols.
+    num_bars - The number of bars per symbol.
+    frequency - 'D' for daily or 'M' for minute bars.
+    header_format - 'mine', 'yahoo' or 'iqfeed'.
+    missing - The fraction of bars randomly left out of each file,
+        to exercise the alignment of the data handlers.
+    seed - The seed of the random walks.
+    """
+    if header_format not in HEADERS:
+        raise ValueError("Unknown header format '%s'" % header_format)
+    if not os.path.isdir(csv_dir):
+        os.makedirs(csv_dir)
+    random_state = np.random.RandomState(seed)
+    timestamps = generate_timestamps(num_bars, frequency)
+    date_format = "%Y-%m-%d" if frequency == "D" else "%Y-%m-%d %H:%M:%S"
+    # Daily volatility of 2%, spread over the minutes of a day
+    volatility = 0.02 if frequency == "D" else 0.02 / np.sqrt(MINUTES_PER_DAY)
+
+    symbols = symbol_names(num_symbols)
+    for s in symbols:
+        bars = generate_bars(timestamps, random_state, volatility=volatility)
+        if missing > 0.0:
+            keep = random_state.uniform(size=len(bars)) >= missing
+            keep[0] = True
+            bars = bars[keep]
+        write_csv(
+            os.path.join(csv_dir, "%s.csv" % s), bars,
+            header_format=header_format, date_format=date_format
+        )
+    return symbols
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print __doc__
+        return
+    csv_dir = args[0]
+    num_symbols = int(args[1]) if len(args) > 1 else 10
+    num_bars = int(args[2]) if len(args) > 2 else 5000
+    frequency = args[3] if len(args) > 3 else "D"
+    header_format = args[4] if len(args) > 4 else "mine"
+    generate_universe(csv_dir, num_symbols, num_bars, frequency, header_format)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+from systemtrade.backtest import parameter_sweep
+
+if __name__ == "__main__":
+    parameter_sweep.main()
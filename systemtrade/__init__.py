@@ -5,6 +5,8 @@ import strategy
 import portfolio as port
 import execution_handler as execute
 import backtest as test
+import monitor
+import output
 
 def main():
     csv_dir = "..\\..\\data\\"
@@ -14,6 +16,7 @@ def main():
     periods = "D"
     heartbeat = 0.0
 
+    monitor.configure_logging()
     backtest = test.BacktestEqualWeightPortFromCSV(
                         csv_dir, 
                         symbol_list, 
@@ -26,7 +29,9 @@ def main():
                         periods, 
                         heartbeat,
                         header_format="mine", 
-                        max_iters=None
+                        max_iters=None,
+                        data_handler_params={"use_cache": True},
+                        output_sink=output.CSVOutputSink("equity.csv")
     )
     backtest.simulate_trading()
 
@@ -1,2 +1,4 @@
 #
 from backtest_eq_from_csv import BacktestEqualWeightPortFromCSV
+from vectorized_backtest import VectorizedBacktest, positions_from_signals, check_equivalence
+from parameter_sweep import ParameterSweep
@@ -1,11 +1,57 @@
+import collections
+import cProfile
+import logging
 import pprint
-import Queue
+import pstats
+import StringIO
 import time
 
+from ..event import DequeEventBus, MarketEvent, SignalEvent, OrderEvent, FillEvent
+from ..monitor import ComponentTimer, ProgressReporter, StackSampler
+from ..output import NullOutputSink
+
+logger = logging.getLogger(__name__)
+
+
+def header_names(header_format):
+    """
+    Returns the list of CSV headers of a header format, the first
+    being the datetime column.
+
+    Parameters:
+    header_format - String describing format of CSV data file headers.
+    """
+    if header_format == "iqfeed":
+        return [
+            'datetime', 'open', 'low', 'high', 
+            'close', 'volume', 'oi'
+        ]
+    elif header_format == "quandl":
+        return [
+            'date', 'open', 'high', 'low',
+            'close', 'volume', 'oi'
+        ]
+    elif header_format == "yahoo":
+        return [
+            'date', 'open', 'high', 'low',
+            'close', 'volume', 'adj_close'
+        ]
+    else: # mine
+        return [
+            'date', 'open', 'high', 'low',
+            'close', 'volume'
+        ]
+
+
 class BacktestEqualWeightPortFromCSV(object):
     """
     Enscapsulates the settings and components for carrying out
     an event-driven backtest.
+
+    Several strategies may be run side by side over a single pass
+    through the bars. Each is given its own strategy_id and the
+    portfolio splits the allocation between them equally and keeps
+    their positions and P&L apart.
     """
 
     def __init__(
@@ -13,6 +59,9 @@ class BacktestEqualWeightPortFromCSV(object):
         start_date, data_handler, execution_handler, 
         portfolio, strategy, periods="D", heartbeat=0.0, 
         header_format="iqfeed", max_iters=None,
+        data_handler_params=None, event_bus=DequeEventBus,
+        progress_interval=5.0, output_sink=None, output_writer=None,
+        instrument=False, profile_path=None, flame_graph_path=None,
     ):
         """
         Initialises the backtest.
@@ -25,11 +74,32 @@ class BacktestEqualWeightPortFromCSV(object):
         data_handler - (Class) Handles the market data feed.
         execution_handler - (Class) Handles the orders/fills for trades.
         portfolio - (Class) Keeps track of portfolio current and prior positions.
-        strategy - (Class) Generates signals based on market data.
+        strategy - (Class) Generates signals based on market data. It
+            may also be any callable taking the data handler and
+            events, e.g. a functools.partial setting parameters, a
+            (class, parameter dictionary) pair, or a list of these
+            to run several strategies over the same bars.
         periods - D, H, M or S depending on daily, hourly, minutely or secondly.
         heartbeat - Backtest "heartbeat" in seconds
         header_format - String describing format of CSV data file headers.
         max_iters - Maximum number of market data points to iterate over.
+        data_handler_params - Optional dictionary of extra keyword
+            arguments for the data handler, e.g. {'zero_copy': True}.
+        event_bus - (Class) The EventBus carrying events between
+            the components.
+        progress_interval - Seconds between two progress reports,
+            which are logged at INFO level.
+        output_sink - The OutputSink the results are written to, by
+            default a NullOutputSink. Pass e.g. a CSVOutputSink with
+            an explicit path to keep the equity curve.
+        output_writer - Optional BackgroundWriter to write the
+            results on, rather than waiting for them to be written.
+        instrument - If True, time every component and event type
+            and log the times with the results.
+        profile_path - Optional path to write cProfile stats of the
+            run to, for pstats or snakeviz.
+        flame_graph_path - Optional path to write sampled call stacks
+            of the run to, in the folded format of flame graph tools.
         """
         self.csv_dir = csv_dir
         self.symbol_list = symbol_list
@@ -44,63 +114,174 @@ class BacktestEqualWeightPortFromCSV(object):
         self.execution_handler_cls = execution_handler
         self.portfolio_cls = portfolio
         self.strategy_cls = strategy
+        self.strategy_specs = strategy if isinstance(strategy, list) else [strategy]
         self.max_iters = max_iters
+        self.data_handler_params = data_handler_params or {}
+        self.progress_interval = progress_interval
+        self.output_sink = output_sink if output_sink is not None else NullOutputSink()
+        self.output_writer = output_writer
+        self.instrument = instrument
+        self.profile_path = profile_path
+        self.flame_graph_path = flame_graph_path
+        self.timer = None
+        self.latency = None
 
-        self.events = Queue.Queue()
+        self.events = event_bus()
         
         self.signals = 0
         self.orders = 0
         self.fills = 0
-        self.num_strats = 1
+        self.signals_by_strategy = collections.Counter()
+        self.num_strats = len(self.strategy_specs)
 
     def _assign_header_names(self):
-        if self.header_format == "iqfeed":
-            return [
-                'datetime', 'open', 'low', 'high', 
-                'close', 'volume', 'oi'
-            ]
-        elif self.header_format == "quandl":
-            return [
-                'date', 'open', 'high', 'low',
-                'close', 'volume', 'oi'
-            ]
-        elif self.header_format == "yahoo":
-            return [
-                'date', 'open', 'high', 'low',
-                'close', 'volume', 'adj_close'
-            ]
-        else: # mine
-            return [
-                'date', 'open', 'high', 'Low',
-                'close', 'volume'
-            ]
+        return header_names(self.header_format)
 
     def _generate_trading_instances(self):
         """
         Generates the trading instance objects from 
         their class types.
         """
-        print "Creating DataHandler, Strategy, Portfolio and ExecutionHandler for"
+        logger.info("Creating DataHandler, Strategy, Portfolio and ExecutionHandler")
         self.data_handler = self.data_handler_cls(
-            self.events, self.csv_dir, self.symbol_list, self.header_strings
-        )
-        self.strategy = self.strategy_cls(
-            self.data_handler, self.events
+            self.events, self.csv_dir, self.symbol_list, self.header_strings,
+            **self.data_handler_params
         )
+        self.strategies = [
+            self._create_strategy(spec, i + 1)
+            for i, spec in enumerate(self.strategy_specs)
+        ]
+        self.strategy = self.strategies[0]
+        self.data_handler.set_max_lookback(self._get_max_lookback())
         self.portfolio = self.portfolio_cls(
             self.data_handler, self.events, self.start_date, 
             self.num_strats, self.periods, self.initial_capital
         )
         self.execution_handler = self.execution_handler_cls(self.events)
+        if self.instrument:
+            self._instrument_components()
+        self._subscribe_handlers()
+
+    def _create_strategy(self, spec, strategy_id):
+        """
+        Creates a strategy from its class, callable or (class,
+        parameters) pair and gives it its strategy_id.
+        """
+        if isinstance(spec, tuple):
+            strategy_cls, params = spec
+            strategy = strategy_cls(self.data_handler, self.events, **params)
+        else:
+            strategy = spec(self.data_handler, self.events)
+        strategy.strategy_id = strategy_id
+        return strategy
+
+    def _get_max_lookback(self):
+        """
+        Returns the largest lookback of the strategies, or None if
+        any of them needs the full history.
+        """
+        lookbacks = [strategy.max_lookback for strategy in self.strategies]
+        if None in lookbacks:
+            return None
+        return max(lookbacks)
+
+    def _instrument_components(self):
+        """
+        Replaces the methods of the components called by the
+        backtest loop with timed wrappers.
+        """
+        self.timer = ComponentTimer()
+        components = [(self.data_handler, "update_bars")]
+        components += [(strategy, "calculate_signals") for strategy in self.strategies]
+        components += [
+            (self.portfolio, "update_timeindex"),
+            (self.portfolio, "update_signal"),
+            (self.execution_handler, "execute_order"),
+            (self.portfolio, "update_fill"),
+        ]
+        for component, method in components:
+            name = "%s.%s" % (type(component).__name__, method)
+            if component in self.strategies and self.num_strats > 1:
+                name = "%s[%d].%s" % (type(component).__name__, component.strategy_id, method)
+            setattr(component, method, self.timer.wrap(name, getattr(component, method)))
+
+    def _subscribe_handlers(self):
+        """
+        Routes each class of event to the components handling it.
+        """
+        handlers = [
+            (MarketEvent, self._on_market),
+            (SignalEvent, self._on_signal),
+            (OrderEvent, self._on_order),
+            (FillEvent, self._on_fill),
+        ]
+        if hasattr(self.data_handler, "arrival_time"):
+            self.latency = ComponentTimer()
+            self.events.subscribe(OrderEvent, self._record_latency)
+        for event_cls, handler in handlers:
+            if self.timer is not None:
+                handler = self.timer.wrap("%s events" % event_cls.type, handler)
+            self.events.subscribe(event_cls, handler)
+
+    def _on_market(self, event):
+        for strategy in self.strategies:
+            strategy.calculate_signals(event)
+        self.portfolio.update_timeindex(event)
+
+    def _on_signal(self, event):
+        self.signals += 1
+        self.signals_by_strategy[event.strategy_id] += 1
+        self.portfolio.update_signal(event)
+
+    def _on_order(self, event):
+        self.orders += 1
+        self.execution_handler.execute_order(event)
+
+    def _record_latency(self, event):
+        """
+        Records the time from the arrival of the latest bar of a
+        live data handler to the dispatch of an order.
+        """
+        arrival_time = self.data_handler.arrival_time
+        if arrival_time is not None:
+            self.latency.record("bar arrival to order", time.time() - arrival_time)
+
+    def _on_fill(self, event):
+        self.fills += 1
+        self.portfolio.update_fill(event)
+
+    def _count_bars(self):
+        """
+        Returns the number of bars the backtest will run over, or
+        None if the data handler cannot tell in advance.
+        """
+        bar_store = getattr(self.data_handler, "bar_store", None)
+        if bar_store is None:
+            return self.max_iters
+        if self.max_iters is not None:
+            return min(len(bar_store), self.max_iters)
+        return len(bar_store)
+
+    def _get_latest_datetime(self):
+        """
+        Returns the timestamp of the latest bar, for progress reports.
+        """
+        try:
+            return self.data_handler.get_latest_bar_datetime(self.symbol_list[0])
+        except IndexError:
+            return None
 
     def _run_backtest(self):
         """
         Executes the backtest.
         """
+        progress = ProgressReporter(
+            self._count_bars(), self.progress_interval,
+            get_timestamp=self._get_latest_datetime
+        )
         i = 0
         while True:
             i += 1
-            print i
             if self.max_iters is not None and i > self.max_iters:
                 break
             # Update the market bars
@@ -110,31 +291,40 @@ class BacktestEqualWeightPortFromCSV(object):
                 break
 
             # Handle the events
-            while True:
-                try:
-                    event = self.events.get(False)
-                except Queue.Empty:
-                    break
-                else:
-                    if event is not None:
-                        if event.type == 'MARKET':
-                            self.strategy.calculate_signals(event)
-                            self.portfolio.update_timeindex(event)
-
-                        elif event.type == 'SIGNAL':
-                            self.signals += 1                            
-                            self.portfolio.update_signal(event)
-
-                        elif event.type == 'ORDER':
-                            self.orders += 1
-                            self.execution_handler.execute_order(event)
-
-                        elif event.type == 'FILL':
-                            self.fills += 1
-                            self.portfolio.update_fill(event)
+            self.events.dispatch()
+            progress.update(i)
 
             if self.heartbeat > 0.0:
                 time.sleep(self.heartbeat)
+        progress.finish()
+
+    def _run_backtest_profiled(self):
+        """
+        Executes the backtest under cProfile and/or the stack sampler.
+        """
+        sampler = None
+        if self.flame_graph_path is not None:
+            sampler = StackSampler()
+            sampler.start()
+        profiler = cProfile.Profile() if self.profile_path is not None else None
+        try:
+            if profiler is not None:
+                profiler.runcall(self._run_backtest)
+            else:
+                self._run_backtest()
+        finally:
+            if sampler is not None:
+                sampler.stop()
+                sampler.write(self.flame_graph_path)
+                logger.info(
+                    "Wrote %d stack samples to %s",
+                    sum(sampler.samples.values()), self.flame_graph_path
+                )
+            if profiler is not None:
+                profiler.dump_stats(self.profile_path)
+                out = StringIO.StringIO()
+                pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(20)
+                logger.info("Wrote profile to %s\n%s", self.profile_path, out.getvalue())
 
     def _output_performance(self):
         """
@@ -142,24 +332,47 @@ class BacktestEqualWeightPortFromCSV(object):
         """
         self.portfolio.create_equity_curve_dataframe()
         
-        print "Creating summary stats..."
+        logger.info("Creating summary stats...")
         stats = self.portfolio.output_summary_stats()
         
-        print "Creating equity curve..."
-        print self.portfolio.equity_curve.tail(10)
-        pprint.pprint(stats)
+        logger.info("Creating equity curve...\n%s", self.portfolio.equity_curve.tail(10))
+        logger.info("Summary stats:\n%s", pprint.pformat(stats))
 
-        print "Signals: %s" % self.signals
-        print "Orders: %s" % self.orders
-        print "Fills: %s" % self.fills
+        logger.info("Signals: %s", self.signals)
+        logger.info("Orders: %s", self.orders)
+        logger.info("Fills: %s", self.fills)
+        if self.num_strats > 1:
+            logger.info("Signals by strategy: %s", dict(self.signals_by_strategy))
+            logger.info(
+                "P&L by strategy:\n%s",
+                self.portfolio.create_strategy_pnl_dataframe().iloc[-1].to_string()
+            )
+        if self.timer is not None:
+            logger.info("Component times:\n%s", self.timer.get_summary().to_string())
+        if self.latency is not None:
+            logger.info(
+                "Bar arrival to order latency:\n%s", self.latency.get_summary().to_string()
+            )
 
+        self._write_output(stats)
         return stats
 
+    def _write_output(self, stats):
+        """
+        Writes the equity curve and statistics to the output sink.
+        """
+        if self.output_writer is not None:
+            self.output_writer.submit(self.output_sink, self.portfolio.equity_curve, stats)
+        else:
+            self.output_sink.write(self.portfolio.equity_curve, stats)
+
     def simulate_trading(self):
         """
-        Simulates the backtest and outputs portfolio performance.
+        Simulates the backtest and returns the portfolio performance.
         """
         self._generate_trading_instances()
-        self._run_backtest()
-        stats = self._output_performance()
-        pprint.pprint(stats)
+        if self.profile_path is not None or self.flame_graph_path is not None:
+            self._run_backtest_profiled()
+        else:
+            self._run_backtest()
+        return self._output_performance()
@@ -0,0 +1,235 @@
+import argparse
+import collections
+import datetime
+import functools
+import itertools
+import multiprocessing
+import os
+import os.path
+import shutil
+import tempfile
+
+import pandas as pd
+
+from .. import data_handler as data
+from .. import strategy as strategies
+from ..execution_handler import SimulatedExecutionHandler
+from ..monitor import configure_logging
+from ..output import NullOutputSink
+from ..portfolio import EqualWeightedPortfolio
+from backtest_eq_from_csv import BacktestEqualWeightPortFromCSV, header_names
+from vectorized_backtest import VectorizedBacktest
+
+
+# Settings shared by every backtest of a worker process
+_worker_settings = None
+
+
+class ParameterSweep(object):
+    """
+    Runs one strategy over every combination of a grid of its
+    parameters, fanning the backtests out over a process pool.
+
+    The market data is parsed once into a memory-mapped store
+    (see convert_csv_to_memmap) which every worker opens read-only,
+    so the bars are shared through the OS page cache rather than
+    being parsed or pickled per backtest. The summary statistics of
+    all the backtests are collected into a single DataFrame.
+    """
+
+    def __init__(
+        self, csv_dir, symbol_list, initial_capital, start_date,
+        strategy, param_grid, periods="D", header_format="iqfeed",
+        processes=None, engine="event", store_dir=None
+    ):
+        """
+        Initialises the sweep.
+
+        Parameters:
+        csv_dir - The hard root to the CSV data directory.
+        symbol_list - The list of symbol strings.
+        initial_capital - The starting capital of every backtest.
+        start_date - The start datetime of the strategy.
+        strategy - (Class) Generates signals based on market data.
+        param_grid - Dictionary of strategy parameter name to the
+            list of values to try, e.g. {'short_window': [50, 100]}.
+        periods - D, H, M or S depending on daily, hourly, minutely or secondly.
+        header_format - String describing format of CSV data file headers.
+        processes - The number of worker processes, defaulting to
+            the number of CPUs.
+        engine - 'event' to run BacktestEqualWeightPortFromCSV or
+            'vectorized' to run the much faster VectorizedBacktest.
+        store_dir - Optional directory to keep the memory-mapped store
+            in. A temporary one, removed after the sweep, is used if None.
+        """
+        if engine not in ("event", "vectorized"):
+            raise ValueError("Unknown engine '%s'" % engine)
+        self.csv_dir = csv_dir
+        self.symbol_list = symbol_list
+        self.initial_capital = initial_capital
+        self.start_date = start_date
+        self.strategy_cls = strategy
+        self.param_grid = param_grid
+        self.periods = periods
+        self.header_format = header_format
+        self.processes = processes
+        self.engine = engine
+        self.store_dir = store_dir
+
+    def _generate_combinations(self):
+        """
+        Returns the list of parameter dictionaries of the grid.
+        """
+        names = sorted(self.param_grid.keys())
+        return [
+            dict(zip(names, values)) for values in
+            itertools.product(*[self.param_grid[n] for n in names])
+        ]
+
+    def _prepare_store(self, store_dir):
+        """
+        Parses the CSV files once into the memory-mapped store.
+        """
+        # The CSV directory is relative to the data handlers, as
+        # it is for HistoricCSVDataHandler
+        csv_dir = os.path.join(os.path.dirname(data.__file__), self.csv_dir)
+        data.convert_csv_to_memmap(
+            csv_dir, self.symbol_list, header_names(self.header_format), store_dir
+        )
+
+    def run(self):
+        """
+        Runs every combination and returns a DataFrame with a row
+        per combination, holding its parameters, summary statistics
+        (percentages in percent) and number of signals.
+        """
+        combinations = self._generate_combinations()
+        scratch_dir = tempfile.mkdtemp(prefix="sweep_")
+        try:
+            store_dir = self.store_dir or os.path.join(scratch_dir, "store")
+            self._prepare_store(store_dir)
+            settings = {
+                "store_dir": os.path.abspath(store_dir),
+                "symbol_list": self.symbol_list,
+                "initial_capital": self.initial_capital,
+                "start_date": self.start_date,
+                "strategy": self.strategy_cls,
+                "periods": self.periods,
+                "engine": self.engine,
+            }
+            pool = multiprocessing.Pool(
+                self.processes, initializer=_init_worker, initargs=(settings,)
+            )
+            try:
+                rows = pool.map(_run_combination, combinations)
+            finally:
+                pool.close()
+                pool.join()
+        finally:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+        columns = rows[0].keys() if rows else sorted(self.param_grid.keys())
+        return pd.DataFrame(rows, columns=columns)
+
+
+def _init_worker(settings):
+    """
+    Stores the sweep settings in a worker process and quietens
+    its logging.
+    """
+    global _worker_settings
+    _worker_settings = settings
+    configure_logging(quiet=True)
+
+def _run_combination(params):
+    """
+    Runs the backtest of one parameter combination in a worker and
+    returns its row of the results.
+    """
+    settings = _worker_settings
+    args = (
+        settings["store_dir"], settings["symbol_list"],
+        settings["initial_capital"], settings["start_date"]
+    )
+    if settings["engine"] == "vectorized":
+        backtest = VectorizedBacktest(
+            *args, data_handler=data.MemmapDataHandler,
+            strategy=settings["strategy"], periods=settings["periods"],
+            strategy_params=params
+        )
+        stats = backtest.simulate_trading()
+    else:
+        backtest = BacktestEqualWeightPortFromCSV(
+            *args, data_handler=data.MemmapDataHandler,
+            execution_handler=SimulatedExecutionHandler,
+            portfolio=EqualWeightedPortfolio,
+            strategy=functools.partial(settings["strategy"], **params),
+            periods=settings["periods"], output_sink=NullOutputSink()
+        )
+        stats = backtest.simulate_trading()
+
+    row = collections.OrderedDict(sorted(params.items()))
+    for name, value in stats:
+        row[name] = float(value.rstrip("%"))
+    row["Signals"] = backtest.signals
+    return row
+
+def _parse_value(value):
+    """
+    Converts a value given on the command line to an int, float
+    or bool where it looks like one.
+    """
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    if value in ("True", "False"):
+        return value == "True"
+    return value
+
+def main(argv=None):
+    """
+    Command line entry point, e.g.
+
+    python run_sweep.py --strategy SimpleMovingAverageCrossStrategy
+        --symbols BBL,KBANK --param short_window=20,50,100
+        --param long_window=200,400 --output sweep.csv
+    """
+    parser = argparse.ArgumentParser(description="Runs a parameter sweep of a strategy.")
+    parser.add_argument("--strategy", required=True, help="Strategy class name.")
+    parser.add_argument("--symbols", required=True, help="Comma separated symbols.")
+    parser.add_argument(
+        "--param", action="append", default=[],
+        help="name=value1,value2,... may be repeated."
+    )
+    parser.add_argument("--csv-dir", default=os.path.join("..", "..", "data", ""))
+    parser.add_argument("--header-format", default="mine")
+    parser.add_argument("--start-date", default="1992-01-02")
+    parser.add_argument("--initial-capital", type=float, default=100000.0)
+    parser.add_argument("--periods", default="D")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--engine", default="event", choices=["event", "vectorized"])
+    parser.add_argument("--store-dir", default=None)
+    parser.add_argument("--output", default="sweep.csv")
+    parser.add_argument("--quiet", action="store_true", help="Only log warnings.")
+    args = parser.parse_args(argv)
+
+    param_grid = {}
+    for param in args.param:
+        name, values = param.split("=", 1)
+        param_grid[name] = [_parse_value(v) for v in values.split(",")]
+
+    sweep = ParameterSweep(
+        args.csv_dir, args.symbols.split(","), args.initial_capital,
+        datetime.datetime.strptime(args.start_date, "%Y-%m-%d"),
+        getattr(strategies, args.strategy), param_grid,
+        periods=args.periods, header_format=args.header_format,
+        processes=args.processes, engine=args.engine,
+        store_dir=args.store_dir
+    )
+    configure_logging(quiet=args.quiet)
+    results = sweep.run()
+    results.to_csv(args.output, index=False)
+    print results.to_string(index=False)
+    return results
@@ -0,0 +1,278 @@
+import logging
+import pprint
+
+import numpy as np
+import pandas as pd
+
+from backtest_eq_from_csv import header_names
+from ..event import DequeEventBus
+from ..output import NullOutputSink
+from ..portfolio.performance import create_periods, create_summary_stats
+
+logger = logging.getLogger(__name__)
+
+
+class VectorizedBacktest(object):
+    """
+    Runs a strategy over the whole history at once with array
+    operations instead of stepping an event queue bar by bar.
+
+    The strategy supplies its entry and exit conditions through
+    calculate_vectorized_signals. The fills then follow the same
+    rules as BacktestEqualWeightPortFromCSV with an
+    EqualWeightedPortfolio and a SimulatedExecutionHandler: 100
+    units bought or sold at the close of the signal bar, commission
+    charged on the traded value and holdings marked to the close
+    of every bar. The equity curve, and so the summary statistics,
+    are the same as those of the event-driven backtest.
+    """
+
+    def __init__(
+        self, csv_dir, symbol_list, initial_capital,
+        start_date, data_handler, strategy, periods="D",
+        header_format="iqfeed", data_handler_params=None,
+        strategy_params=None, quantity=100, commission=0.001578 * 1.07,
+        output_sink=None, output_writer=None
+    ):
+        """
+        Initialises the vectorised backtest.
+
+        Parameters:
+        csv_dir - The hard root to the CSV data directory.
+        symbol_list - The list of symbol strings.
+        intial_capital - The starting capital for the portfolio.
+        start_date - The start datetime of the strategy.
+        data_handler - (Class) A BarStoreDataHandler providing the bars.
+        strategy - (Class) Generates signals based on market data.
+        periods - D, H, M or S depending on daily, hourly, minutely or secondly.
+        header_format - String describing format of CSV data file headers.
+        data_handler_params - Optional dictionary of extra keyword
+            arguments for the data handler.
+        strategy_params - Optional dictionary of extra keyword
+            arguments for the strategy, e.g. {'short_window': 50}.
+        quantity - The number of units bought on a LONG signal.
+        commission - The commission rate charged on the traded value.
+        output_sink - The OutputSink the results are written to, by
+            default a NullOutputSink.
+        output_writer - Optional BackgroundWriter to write the
+            results on, rather than waiting for them to be written.
+        """
+        self.csv_dir = csv_dir
+        self.symbol_list = symbol_list
+        self.initial_capital = initial_capital
+        self.start_date = start_date
+        self.periods = periods
+        self.header_format = header_format
+        self.data_handler_cls = data_handler
+        self.strategy_cls = strategy
+        self.data_handler_params = data_handler_params or {}
+        self.strategy_params = strategy_params or {}
+        self.quantity = quantity
+        self.commission = commission
+        self.output_sink = output_sink if output_sink is not None else NullOutputSink()
+        self.output_writer = output_writer
+
+        self.events = DequeEventBus()
+        self.signals = 0
+        self.orders = 0
+        self.fills = 0
+
+    def _assign_header_names(self):
+        return header_names(self.header_format)
+
+    def _generate_trading_instances(self):
+        """
+        Generates the data handler and the strategy from their
+        class types.
+        """
+        self.data_handler = self.data_handler_cls(
+            self.events, self.csv_dir, self.symbol_list,
+            self._assign_header_names(), **self.data_handler_params
+        )
+        self.strategy = self.strategy_cls(
+            self.data_handler, self.events, **self.strategy_params
+        )
+
+    def _run_backtest(self):
+        """
+        Computes the positions and holdings of every bar.
+        """
+        bar_store = self.data_handler.bar_store
+        entry, exit = self.strategy.calculate_vectorized_signals(bar_store)
+        state = positions_from_signals(entry, exit)
+
+        # Trades happen where the state changes, at the bar close
+        prev_state = np.zeros(state.shape, dtype=np.int8)
+        prev_state[:, 1:] = state[:, :-1]
+        trades = state - prev_state
+        self.signals = self.orders = self.fills = int(np.count_nonzero(trades))
+
+        close = bar_store.values[bar_store.field_index["close"]]
+        cost = np.where(trades != 0, trades * close * float(self.quantity), 0.0)
+        commission = self.commission * np.abs(cost)
+
+        # The fills of each bar are applied symbol by symbol, so the
+        # cash flows are accumulated in that order
+        flows = np.empty(cost.size + 1)
+        flows[0] = self.initial_capital
+        flows[1:] = -(cost + commission).T.ravel()
+        cash = np.cumsum(flows)[::len(self.symbol_list)]
+        charges = np.empty(cost.size + 1)
+        charges[0] = 0.0
+        charges[1:] = commission.T.ravel()
+        charges = np.cumsum(charges)[::len(self.symbol_list)]
+
+        self.equity_curve = self._create_equity_curve_dataframe(
+            bar_store, close, prev_state, state, cash, charges
+        )
+
+    def _create_equity_curve_dataframe(
+        self, bar_store, close, prev_state, state, cash, charges
+    ):
+        """
+        Lays the holdings out as the Portfolio does: a row for the
+        start date, a row per bar marked before that bar's fills
+        and a final row after the last fills.
+        """
+        bars = len(bar_store)
+        positions = np.empty((len(self.symbol_list), bars + 1))
+        positions[:, :bars] = prev_state
+        positions[:, bars] = state[:, -1]
+        positions *= float(self.quantity)
+
+        marks = np.empty(positions.shape)
+        marks[:, :bars] = close
+        marks[:, bars] = close[:, -1]
+        market_value = positions * marks
+
+        curve = {}
+        curve['cash'] = np.concatenate(([self.initial_capital], cash))
+        curve['commission'] = np.concatenate(([0.0], charges))
+        total = cash.copy()
+        for i, s in enumerate(self.symbol_list):
+            curve[s] = np.concatenate(([0.0], market_value[i]))
+            total += market_value[i]
+        curve['total'] = np.concatenate(([self.initial_capital], total))
+
+        index = [self.start_date] + [
+            bar_store.get_datetime(i) for i in xrange(bars)
+        ] + [bar_store.get_datetime(bars - 1)]
+        index = pd.Index(index, name='datetime')
+
+        # Positions held and prices marked at, as in the Portfolio ledgers
+        self.positions = pd.DataFrame(
+            np.vstack((np.zeros(len(self.symbol_list)), positions.T)),
+            index=index, columns=self.symbol_list
+        ).sort_index(axis=1)
+        self.prices = pd.DataFrame(
+            np.vstack((np.zeros(len(self.symbol_list)), marks.T)),
+            index=index, columns=self.symbol_list
+        ).sort_index(axis=1)
+
+        curve = pd.DataFrame(curve, index=index)
+        curve['returns'] = curve['total'].pct_change()
+        curve['equity_curve'] = (1.0+curve['returns']).cumprod()
+        return curve
+
+    def _output_performance(self):
+        """
+        Outputs the strategy performance from the backtest.
+        """
+        stats, drawdown = create_summary_stats(
+            self.equity_curve, periods=create_periods(self.periods),
+            positions=self.positions, prices=self.prices
+        )
+        self.equity_curve["drawdown"] = drawdown
+        if self.output_writer is not None:
+            self.output_writer.submit(self.output_sink, self.equity_curve, stats)
+        else:
+            self.output_sink.write(self.equity_curve, stats)
+        return stats
+
+    def simulate_trading(self):
+        """
+        Simulates the backtest and returns the summary statistics.
+        """
+        self._generate_trading_instances()
+        self._run_backtest()
+        stats = self._output_performance()
+        logger.info("Summary stats:\n%s", pprint.pformat(stats))
+        logger.info("Signals: %s", self.signals)
+        return stats
+
+
+def positions_from_signals(entry, exit):
+    """
+    Turns the entry and exit conditions of every bar into the
+    market state after each bar, 1 if in the market and 0 if not.
+
+    A bar with only an entry (exit) condition leaves the symbol in
+    (out of) the market whatever its previous state, and a bar with
+    both flips the state. The state after a bar is therefore the
+    state set by the last one-sided bar, flipped once for every
+    two-sided bar since.
+
+    Parameters:
+    entry - Boolean array shaped (symbols, bars).
+    exit - Boolean array shaped (symbols, bars).
+    """
+    entry = np.asarray(entry, dtype=bool)
+    exit = np.asarray(exit, dtype=bool)
+    bars = np.arange(entry.shape[1])
+
+    # Bar and state of the last one-sided bar, -1 if none yet
+    sets = entry ^ exit
+    last_set = np.maximum.accumulate(np.where(sets, bars, -1), axis=1)
+    rows = np.arange(entry.shape[0])[:, None]
+    set_state = np.where(last_set >= 0, entry[rows, last_set], False)
+
+    # Number of two-sided bars since the last one-sided bar
+    flips = np.cumsum(entry & exit, axis=1)
+    flips_at_set = np.where(last_set >= 0, flips[rows, last_set], 0)
+    return ((set_state + flips - flips_at_set) % 2).astype(np.int8)
+
+
+def check_equivalence(event_backtest, vectorized_backtest):
+    """
+    Checks that an event-driven and a vectorised backtest that have
+    both been run produce the same equity curve and summary stats.
+
+    Parameters:
+    event_backtest - A BacktestEqualWeightPortFromCSV after simulate_trading.
+    vectorized_backtest - A VectorizedBacktest after simulate_trading.
+
+    Returns:
+    A list of the differences found, empty if they agree.
+    """
+    differences = []
+    event_curve = event_backtest.portfolio.equity_curve
+    vector_curve = vectorized_backtest.equity_curve
+    if len(event_curve) != len(vector_curve):
+        return ["Equity curves have %d and %d rows" % (len(event_curve), len(vector_curve))]
+
+    if not (event_curve.index == vector_curve.index).all():
+        differences.append("Equity curve dates differ")
+    for column in event_curve.columns:
+        expected = event_curve[column].values.astype(np.float64)
+        actual = vector_curve[column].values.astype(np.float64)
+        if not np.allclose(expected, actual, rtol=1e-9, atol=1e-6, equal_nan=True):
+            differences.append("Column %s differs" % column)
+
+    portfolio = event_backtest.portfolio
+    event_stats = create_summary_stats(
+        event_curve, periods=create_periods(event_backtest.periods),
+        positions=portfolio.all_positions.to_frame(),
+        prices=portfolio.all_prices.to_frame()
+    )[0]
+    vector_stats = create_summary_stats(
+        vector_curve, periods=create_periods(vectorized_backtest.periods),
+        positions=vectorized_backtest.positions,
+        prices=vectorized_backtest.prices
+    )[0]
+    if event_stats != vector_stats:
+        differences.append("Stats differ: %s != %s" % (event_stats, vector_stats))
+    if event_backtest.signals != vectorized_backtest.signals:
+        differences.append(
+            "Signals differ: %d != %d" % (event_backtest.signals, vectorized_backtest.signals)
+        )
+    return differences
@@ -1,2 +1,16 @@
 #
+from bar_store import BarStore
+from calendar_bar_store import CalendarBarStore
+from bar_ring_buffer import BarRingBuffer
+from csv_cache import load_csv_columns
+from memmap_store import (
+    write_memmap_store, convert_csv_to_memmap, load_memmap_store
+)
+from bar_store_data_handler import BarStoreDataHandler
 from historic_csv_data_handler import HistoricCSVDataHandler
+from memmap_data_handler import MemmapDataHandler
+from buffered_data_handler import BufferedDataHandler
+from streaming_csv_data_handler import StreamingCSVDataHandler
+from calendar_csv_data_handler import CalendarCSVDataHandler
+from replay_feed_server import ReplayFeedServer
+from socket_data_handler import SocketDataHandler
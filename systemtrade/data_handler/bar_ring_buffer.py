@@ -0,0 +1,121 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+
+class BarRingBuffer(object):
+    """
+    BarRingBuffer keeps the most recent bars of a universe of
+    symbols in fixed-size primitive arrays, laid out like a
+    BarStore: values is shaped (fields, symbols, slots) and the
+    timestamps are int64 nanoseconds since the epoch.
+
+    Every bar is written twice, capacity slots apart, so that the
+    latest N <= capacity bars are always a contiguous slice ending
+    at self.end and can be returned as a view without copying.
+
+    If capacity is None the buffer keeps the full history instead,
+    growing its arrays in chunks as bars are appended.
+    """
+
+    def __init__(self, symbol_list, fields, capacity=None, chunk_size=4096):
+        """
+        Initialises the buffer.
+
+        Parameters:
+        symbol_list - The list of symbol strings.
+        fields - The names of the bar fields, in column order.
+        capacity - The number of bars to keep per symbol, or None
+            to keep every bar.
+        chunk_size - Initial number of slots of an unbounded buffer.
+        """
+        self.symbol_list = list(symbol_list)
+        self.fields = tuple(fields)
+        self.symbol_index = dict((s, i) for i, s in enumerate(self.symbol_list))
+        self.field_index = dict((f, i) for i, f in enumerate(self.fields))
+        self.bar_type = namedtuple('Bar', self.fields)
+
+        if capacity is not None:
+            capacity = max(int(capacity), 1)
+            slots = 2 * capacity
+        else:
+            slots = chunk_size
+        self.capacity = capacity
+        self.values = np.empty(
+            (len(self.fields), len(self.symbol_list), slots), dtype=np.float64
+        )
+        self.timestamps = np.empty(slots, dtype=np.int64)
+        self.count = 0
+        self.end = 0
+
+    def __len__(self):
+        if self.capacity is None:
+            return self.count
+        return min(self.count, self.capacity)
+
+    def _grow(self):
+        """
+        Doubles the number of slots of an unbounded buffer.
+        """
+        slots = 2 * self.values.shape[2]
+        values = np.empty(self.values.shape[:2] + (slots,), dtype=np.float64)
+        values[:, :, :self.end] = self.values[:, :, :self.end]
+        timestamps = np.empty(slots, dtype=np.int64)
+        timestamps[:self.end] = self.timestamps[:self.end]
+        self.values = values
+        self.timestamps = timestamps
+
+    def append(self, timestamp, row):
+        """
+        Appends one bar for every symbol.
+
+        Parameters:
+        timestamp - The bar timestamp in nanoseconds since the epoch.
+        row - Array-like shaped (fields, symbols) of bar values.
+        """
+        if self.capacity is None:
+            if self.end == self.values.shape[2]:
+                self._grow()
+            self.values[:, :, self.end] = row
+            self.timestamps[self.end] = timestamp
+            self.end += 1
+        else:
+            pos = self.count % self.capacity
+            self.values[:, :, pos] = row
+            self.values[:, :, pos + self.capacity] = row
+            self.timestamps[pos] = timestamp
+            self.timestamps[pos + self.capacity] = timestamp
+            self.end = pos + self.capacity + 1
+        self.count += 1
+
+    def window(self, symbol, field, N=1):
+        """
+        Returns a read-only view of the last N values of a field
+        for a symbol, or N-k if less available. The view is only
+        valid until the next append.
+        """
+        n = min(N, len(self))
+        values = self.values[
+            self.field_index[field], self.symbol_index[symbol],
+            self.end - n:self.end
+        ]
+        values.flags.writeable = False
+        return values
+
+    def get_datetime(self, i):
+        """
+        Returns the pandas Timestamp of the bar in slot i.
+        """
+        return pd.Timestamp(self.timestamps[i])
+
+    def get_bar(self, symbol, i):
+        """
+        Returns the bar of a symbol in slot i as a tuple of
+        (Timestamp, Bar) where Bar is a namedtuple of the fields.
+        """
+        s = self.symbol_index[symbol]
+        return (
+            pd.Timestamp(self.timestamps[i]),
+            self.bar_type._make(self.values[:, s, i].tolist())
+        )
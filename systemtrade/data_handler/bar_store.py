@@ -0,0 +1,133 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+
+class BarStore(object):
+    """
+    BarStore holds the aligned bars of a universe of symbols as
+    contiguous primitive arrays rather than as pandas objects.
+
+    Every field (open, high, low, close, volume, returns, ...) is
+    stored in a single float64 array shaped (fields, symbols, bars),
+    so that values[f, s] is a contiguous column for one symbol. The
+    bar timestamps are shared by all symbols and are kept as an
+    int64 array of nanoseconds since the epoch.
+
+    The arrays are read-only once the store is built, so any slice
+    of them can be handed out as a view without risk of a caller
+    corrupting the history.
+    """
+
+    def __init__(self, symbol_list, fields, timestamps, values):
+        """
+        Initialises the store from already aligned arrays.
+
+        Parameters:
+        symbol_list - The list of symbol strings.
+        fields - The names of the bar fields, in column order.
+        timestamps - int64 array of bar timestamps in nanoseconds.
+        values - float64 array shaped (fields, symbols, bars).
+        """
+        self.symbol_list = list(symbol_list)
+        self.fields = tuple(fields)
+        self.timestamps = np.ascontiguousarray(timestamps, dtype=np.int64)
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+        self.timestamps.flags.writeable = False
+        self.values.flags.writeable = False
+
+        self.symbol_index = dict((s, i) for i, s in enumerate(self.symbol_list))
+        self.field_index = dict((f, i) for i, f in enumerate(self.fields))
+        self.bar_type = namedtuple('Bar', self.fields)
+
+    @classmethod
+    def from_columns(cls, symbol_list, symbol_columns):
+        """
+        Creates a store from the parsed columns of each symbol,
+        aligning them onto the union of their timestamps. Values
+        are padded forward from the last known bar, NaN before a
+        symbol's first bar, and a 'returns' field holding the
+        close-to-close percentage change is appended.
+
+        Parameters:
+        symbol_list - The list of symbol strings.
+        symbol_columns - Dictionary of symbol to a tuple of
+            (timestamps, fields, values) as returned by
+            load_csv_columns.
+        """
+        fields = list(symbol_columns[symbol_list[0]][1])
+        timestamps = symbol_columns[symbol_list[0]][0]
+        for s in symbol_list[1:]:
+            timestamps = np.union1d(timestamps, symbol_columns[s][0])
+
+        values = np.empty(
+            (len(fields) + 1, len(symbol_list), len(timestamps)),
+            dtype=np.float64
+        )
+        for i, s in enumerate(symbol_list):
+            sym_timestamps, sym_fields, sym_values = symbol_columns[s]
+            if list(sym_fields) != fields:
+                raise ValueError("Symbol %s has fields %s, expected %s" % (s, sym_fields, fields))
+            align_columns(timestamps, sym_timestamps, fields, sym_values, values[:, i, :])
+        return cls(symbol_list, fields + ["returns"], timestamps, values)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def column(self, symbol, field):
+        """
+        Returns the full contiguous column of one field for a symbol.
+        """
+        return self.values[self.field_index[field], self.symbol_index[symbol]]
+
+    def get_datetime(self, i):
+        """
+        Returns the pandas Timestamp of the i-th bar.
+        """
+        return pd.Timestamp(self.timestamps[i])
+
+    def get_bar(self, symbol, i):
+        """
+        Returns the i-th bar of a symbol as a tuple of
+        (Timestamp, Bar) where Bar is a namedtuple of the fields.
+        """
+        s = self.symbol_index[symbol]
+        return (
+            pd.Timestamp(self.timestamps[i]),
+            self.bar_type._make(self.values[:, s, i].tolist())
+        )
+
+
+def align_columns(timestamps, sym_timestamps, fields, sym_values, out):
+    """
+    Aligns the parsed columns of one symbol onto the combined
+    timestamps, padding forward from the last known bar and
+    leaving NaN before the first, and appends the 'returns'.
+
+    Parameters:
+    timestamps - The combined int64 timestamps of the universe.
+    sym_timestamps - The sorted int64 timestamps of the symbol.
+    fields - The names of the symbol's fields.
+    sym_values - float64 array shaped (fields, symbol bars).
+    out - Output array shaped (fields + 1, len(timestamps)).
+    """
+    # Index of the last bar at or before each timestamp
+    pad = np.searchsorted(sym_timestamps, timestamps, side="right") - 1
+    out[:-1] = sym_values[:, np.maximum(pad, 0)]
+    out[:-1, pad < 0] = np.nan
+    out[-1] = _pct_change(out[list(fields).index("close")])
+
+def _pct_change(values):
+    """
+    Returns the period percentage change of a 1-D array in the
+    manner of pandas' pct_change, i.e. padding forward over
+    missing values first and leaving them missing in the result.
+    """
+    valid = np.where(np.isnan(values), 0, np.arange(len(values)))
+    padded = values[np.maximum.accumulate(valid)]
+    returns = np.empty_like(padded)
+    returns[0] = np.nan
+    returns[1:] = padded[1:] / padded[:-1] - 1.0
+    returns[np.isnan(values)] = np.nan
+    return returns
@@ -0,0 +1,117 @@
+import logging
+
+from data_handler import DataHandler
+from ..event import MarketEvent
+
+logger = logging.getLogger(__name__)
+
+class BarStoreDataHandler(DataHandler):
+    """
+    BarStoreDataHandler is a base class for handlers whose full
+    history is available up front as a BarStore, whether parsed
+    from CSV files or memory-mapped from disk.
+
+    The "latest" bars are those before an integer cursor, which
+    update_bars advances by one for every call. Subclasses set
+    self.bar_store, self.cursor, self.zero_copy and
+    self.max_lookback in their initialiser.
+    """
+
+    def _get_symbol_index(self, symbol):
+        """
+        Returns the row of the symbol within the BarStore.
+        """
+        try:
+            return self.bar_store.symbol_index[symbol]
+        except KeyError:
+            logger.error("That symbol is not available in the historical data set: %s", symbol)
+            raise
+
+    def _get_field_index(self, val_type):
+        """
+        Returns the field position of val_type within the BarStore.
+        """
+        try:
+            return self.bar_store.field_index[val_type]
+        except KeyError:
+            raise AttributeError("Bar has no field '%s'" % val_type)
+
+    def get_latest_bar(self, symbol):
+        """
+        Returns the last bar as a tuple of (datetime, bar).
+        """
+        self._get_symbol_index(symbol)
+        if self.cursor == 0:
+            raise IndexError("No bars have been updated yet.")
+        return self.bar_store.get_bar(symbol, self.cursor - 1)
+
+    def _get_window_start(self, N):
+        """
+        Returns the cursor position of the first of the last N bars.
+        The full history is held, so max_lookback does not bound N.
+        """
+        return max(self.cursor - N, 0)
+
+    def get_latest_bars(self, symbol, N=1):
+        """
+        Returns the last N bars updated, or N-k if less available.
+        """
+        self._get_symbol_index(symbol)
+        start = self._get_window_start(N)
+        return [
+            self.bar_store.get_bar(symbol, i)
+            for i in xrange(start, self.cursor)
+        ]
+
+    def get_latest_bar_datetime(self, symbol):
+        """
+        Returns a Python datetime object for the last bar.
+        """
+        self._get_symbol_index(symbol)
+        if self.cursor == 0:
+            raise IndexError("No bars have been updated yet.")
+        return self.bar_store.get_datetime(self.cursor - 1)
+
+    def get_latest_bar_value(self, symbol, val_type):
+        """
+        Returns one of the Open, High, Low, Close, Volume or OI
+        values from the last bar.
+        """
+        s = self._get_symbol_index(symbol)
+        f = self._get_field_index(val_type)
+        if self.cursor == 0:
+            raise IndexError("No bars have been updated yet.")
+        return self.bar_store.values[f, s, self.cursor - 1]
+
+    def get_latest_bars_values(self, symbol, val_type, N=1):
+        """
+        Returns the last N bar values from the 
+        BarStore column, or N-k if less available.
+
+        In zero_copy mode the result is a read-only view into the
+        BarStore rather than a copy.
+        """
+        s = self._get_symbol_index(symbol)
+        f = self._get_field_index(val_type)
+        start = self._get_window_start(N)
+        values = self.bar_store.values[f, s, start:self.cursor]
+        if self.zero_copy:
+            return values
+        return values.copy()
+
+    def update_bars(self):
+        """
+        Advances the cursor so that the next bar becomes the
+        latest bar for all symbols in the symbol list, and puts a
+        MarketEvent carrying the latest bar.
+        """
+        if self.cursor < len(self.bar_store):
+            self.cursor += 1
+        else:
+            self.continue_backtest = False
+
+        i = self.cursor - 1
+        if i < 0:
+            self.events.put(MarketEvent())
+        else:
+            self.events.put(MarketEvent(self.bar_store.get_datetime(i), i, self.bar_store))
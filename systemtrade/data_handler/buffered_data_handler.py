@@ -0,0 +1,162 @@
+import logging
+from abc import abstractmethod
+
+import numpy as np
+
+from data_handler import DataHandler
+from bar_ring_buffer import BarRingBuffer
+from ..event import MarketEvent
+
+logger = logging.getLogger(__name__)
+
+class BufferedDataHandler(DataHandler):
+    """
+    BufferedDataHandler is a base class for handlers whose bars
+    arrive one at a time, e.g. streamed from disk or from a live
+    feed, rather than being resident in memory.
+
+    The latest bars are kept in a BarRingBuffer. Once the largest
+    lookback of the consumers is known through set_max_lookback,
+    only that many bars are kept per symbol, so memory does not
+    grow with the length of the run.
+
+    Subclasses implement _get_new_bar().
+    """
+
+    def __init__(self, events, symbol_list, fields, zero_copy=False):
+        """
+        Initialises the buffered data handler.
+
+        Parameters:
+        events - The Event Queue.
+        symbol_list - A list of symbol strings.
+        fields - The names of the bar fields, in column order.
+        zero_copy - If True, get_latest_bars_values returns read-only
+            views into the buffer, valid until the next update_bars.
+        """
+        self.events = events
+        self.symbol_list = symbol_list
+        self.fields = tuple(fields)
+        self.zero_copy = zero_copy
+        self.max_lookback = None
+        self.continue_backtest = True
+        self.buffer = BarRingBuffer(self.symbol_list, self.fields)
+
+    @abstractmethod
+    def _get_new_bar(self):
+        """
+        Returns the next bar for all symbols as a tuple of
+        (timestamp, row), where timestamp is in nanoseconds since
+        the epoch and row is shaped (fields, symbols), or None
+        when the feed is exhausted.
+        """
+        raise NotImplementedError("Should implement _get_new_bar()")
+
+    def _init_padded_row(self):
+        """
+        Creates the padded bar of every symbol, NaN until a symbol's
+        first bar, and its last valid close, for subclasses that
+        receive only the symbols with a new bar at each timestamp.
+        """
+        self._close = self.fields.index("close")
+        self._row = np.empty((len(self.fields), len(self.symbol_list)))
+        self._row.fill(np.nan)
+        self._filled_close = np.empty(len(self.symbol_list))
+        self._filled_close.fill(np.nan)
+
+    def _update_returns(self):
+        """
+        Sets the 'returns' of the padded bar, the last field, to the
+        close-to-close change, padding over missing closes.
+        """
+        close = self._row[self._close]
+        prev_close = self._filled_close.copy()
+        valid = ~np.isnan(close)
+        self._filled_close[valid] = close[valid]
+        self._row[-1] = self._filled_close / prev_close - 1.0
+        self._row[-1, ~valid] = np.nan
+
+    def set_max_lookback(self, max_lookback):
+        """
+        Bounds the buffer to max_lookback bars per symbol. Must be
+        called before the first update_bars.
+        """
+        if self.buffer.count > 0:
+            raise ValueError("Cannot change the lookback once bars are buffered.")
+        self.max_lookback = max_lookback
+        self.buffer = BarRingBuffer(self.symbol_list, self.fields, max_lookback)
+
+    def _check_symbol(self, symbol):
+        """
+        Raises a KeyError for a symbol outside the universe.
+        """
+        if symbol not in self.buffer.symbol_index:
+            logger.error("That symbol is not available in the data set: %s", symbol)
+            raise KeyError(symbol)
+
+    def get_latest_bar(self, symbol):
+        """
+        Returns the last bar as a tuple of (datetime, bar).
+        """
+        self._check_symbol(symbol)
+        if len(self.buffer) == 0:
+            raise IndexError("No bars have been updated yet.")
+        return self.buffer.get_bar(symbol, self.buffer.end - 1)
+
+    def get_latest_bars(self, symbol, N=1):
+        """
+        Returns the last N bars updated, or N-k if less available.
+        """
+        self._check_symbol(symbol)
+        n = min(N, len(self.buffer))
+        return [
+            self.buffer.get_bar(symbol, i)
+            for i in xrange(self.buffer.end - n, self.buffer.end)
+        ]
+
+    def get_latest_bar_datetime(self, symbol):
+        """
+        Returns a Python datetime object for the last bar.
+        """
+        self._check_symbol(symbol)
+        if len(self.buffer) == 0:
+            raise IndexError("No bars have been updated yet.")
+        return self.buffer.get_datetime(self.buffer.end - 1)
+
+    def get_latest_bar_value(self, symbol, val_type):
+        """
+        Returns one of the Open, High, Low, Close, Volume or OI
+        values from the last bar.
+        """
+        self._check_symbol(symbol)
+        if len(self.buffer) == 0:
+            raise IndexError("No bars have been updated yet.")
+        return self.buffer.window(symbol, val_type)[0]
+
+    def get_latest_bars_values(self, symbol, val_type, N=1):
+        """
+        Returns the last N bar values from the buffer,
+        or N-k if less available.
+        """
+        self._check_symbol(symbol)
+        values = self.buffer.window(symbol, val_type, N)
+        if self.zero_copy:
+            return values
+        return values.copy()
+
+    def update_bars(self):
+        """
+        Appends the next bar of every symbol to the buffer, and puts
+        a MarketEvent carrying the latest bar.
+        """
+        bar = self._get_new_bar()
+        if bar is None:
+            self.continue_backtest = False
+        else:
+            self.buffer.append(bar[0], bar[1])
+
+        i = self.buffer.end - 1
+        if len(self.buffer) == 0:
+            self.events.put(MarketEvent())
+        else:
+            self.events.put(MarketEvent(self.buffer.get_datetime(i), i, self.buffer))
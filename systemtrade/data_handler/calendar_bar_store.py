@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+
+from bar_store import BarStore, align_columns
+
+
+class CalendarBarStore(object):
+    """
+    CalendarBarStore holds the bars of a universe of symbols whose
+    histories start, stop and have gaps at different dates, without
+    padding every symbol out to the full calendar.
+
+    The master calendar, the sorted union of every symbol's
+    timestamps, is built once. Each symbol's own observations are
+    then stored densely, one after another, in a float64 array
+    shaped (fields, observations), with symbol i occupying
+    offsets[i]:offsets[i + 1]. The calendar index of every
+    observation is kept in positions, so memory grows with the
+    number of observations rather than with symbols x dates.
+
+    The listing start and end of a symbol are the calendar indices
+    of its first and last observation, or -1 if it has none.
+    """
+
+    def __init__(self, symbol_list, fields, timestamps, values, positions, offsets):
+        """
+        Initialises the store from already indexed arrays.
+
+        Parameters:
+        symbol_list - The list of symbol strings.
+        fields - The names of the bar fields, in column order.
+        timestamps - int64 array of the calendar in nanoseconds.
+        values - float64 array shaped (fields, observations).
+        positions - int64 array of the calendar index of every
+            observation, ascending within each symbol.
+        offsets - int64 array of len(symbol_list) + 1 offsets of
+            each symbol's first observation.
+        """
+        self.symbol_list = list(symbol_list)
+        self.fields = tuple(fields)
+        self.timestamps = np.ascontiguousarray(timestamps, dtype=np.int64)
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+        self.positions = np.ascontiguousarray(positions, dtype=np.int64)
+        self.offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+        for array in (self.timestamps, self.values, self.positions, self.offsets):
+            array.flags.writeable = False
+
+        self.symbol_index = dict((s, i) for i, s in enumerate(self.symbol_list))
+        self.field_index = dict((f, i) for i, f in enumerate(self.fields))
+
+        counts = np.diff(self.offsets)
+        listed = counts > 0
+        self.listing_start = np.full(len(self.symbol_list), -1, dtype=np.int64)
+        self.listing_end = np.full(len(self.symbol_list), -1, dtype=np.int64)
+        self.listing_start[listed] = self.positions[self.offsets[:-1][listed]]
+        self.listing_end[listed] = self.positions[self.offsets[1:][listed] - 1]
+
+        # Observations grouped by bar, in symbol order within a bar
+        self.observation_symbols = np.repeat(np.arange(len(self.symbol_list)), counts)
+        self._bar_order = np.argsort(self.positions, kind="mergesort")
+        self._bar_offsets = np.searchsorted(
+            self.positions[self._bar_order], np.arange(len(self.timestamps) + 1)
+        )
+
+    @classmethod
+    def from_columns(cls, symbol_list, symbol_columns):
+        """
+        Creates a store from the parsed columns of each symbol,
+        building the master calendar in one pass over them.
+
+        Parameters:
+        symbol_list - The list of symbol strings.
+        symbol_columns - Dictionary of symbol to a tuple of
+            (timestamps, fields, values) as returned by
+            load_csv_columns.
+        """
+        fields = list(symbol_columns[symbol_list[0]][1])
+        for s in symbol_list:
+            if list(symbol_columns[s][1]) != fields:
+                raise ValueError(
+                    "Symbol %s has fields %s, expected %s" % (s, symbol_columns[s][1], fields)
+                )
+        timestamps = np.unique(np.concatenate(
+            [np.asarray(symbol_columns[s][0], dtype=np.int64) for s in symbol_list]
+        ))
+
+        offsets = np.zeros(len(symbol_list) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(symbol_columns[s][0]) for s in symbol_list])
+        values = np.empty((len(fields), offsets[-1]), dtype=np.float64)
+        positions = np.empty(offsets[-1], dtype=np.int64)
+        for i, s in enumerate(symbol_list):
+            sym_timestamps, _, sym_values = symbol_columns[s]
+            values[:, offsets[i]:offsets[i + 1]] = sym_values
+            positions[offsets[i]:offsets[i + 1]] = np.searchsorted(timestamps, sym_timestamps)
+        return cls(symbol_list, fields, timestamps, values, positions, offsets)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def _slice(self, symbol):
+        s = self.symbol_index[symbol]
+        return slice(self.offsets[s], self.offsets[s + 1])
+
+    def column(self, symbol, field):
+        """
+        Returns the observed values of one field for a symbol,
+        without padding.
+        """
+        return self.values[self.field_index[field], self._slice(symbol)]
+
+    def calendar_index(self, symbol):
+        """
+        Returns the calendar index of each observation of a symbol.
+        """
+        return self.positions[self._slice(symbol)]
+
+    def pad_index(self, symbol, i):
+        """
+        Returns the index into column(symbol, field) of the last
+        observation at or before the i-th bar, or -1 if the symbol
+        had not been observed by then.
+        """
+        return int(np.searchsorted(self.calendar_index(symbol), i, side="right")) - 1
+
+    def get_datetime(self, i):
+        """
+        Returns the pandas Timestamp of the i-th bar.
+        """
+        return pd.Timestamp(self.timestamps[i])
+
+    def observations(self, i):
+        """
+        Returns the observations of the i-th bar as a tuple of
+        (symbols, values), where symbols are the indices of the
+        symbols observed and values is shaped (fields, symbols).
+        """
+        ids = self._bar_order[self._bar_offsets[i]:self._bar_offsets[i + 1]]
+        return self.observation_symbols[ids], self.values[:, ids]
+
+    def valid_mask(self, i):
+        """
+        Returns a boolean array of the symbols observed at the i-th bar.
+        """
+        mask = np.zeros(len(self.symbol_list), dtype=bool)
+        mask[self.observations(i)[0]] = True
+        return mask
+
+    def listed_mask(self, i):
+        """
+        Returns a boolean array of the symbols listed at the i-th
+        bar, i.e. between their first and last observation.
+        """
+        return (self.listing_start <= i) & (i <= self.listing_end)
+
+    def to_bar_store(self):
+        """
+        Returns the equivalent padded BarStore, shaped (fields,
+        symbols, bars), e.g. for a VectorizedBacktest.
+        """
+        values = np.empty(
+            (len(self.fields) + 1, len(self.symbol_list), len(self.timestamps)),
+            dtype=np.float64
+        )
+        for i, s in enumerate(self.symbol_list):
+            sym = self._slice(s)
+            align_columns(
+                self.timestamps, self.timestamps[self.positions[sym]],
+                self.fields, self.values[:, sym], values[:, i, :]
+            )
+        return BarStore(self.symbol_list, list(self.fields) + ["returns"], self.timestamps, values)
@@ -0,0 +1,102 @@
+import os.path
+
+from buffered_data_handler import BufferedDataHandler
+from calendar_bar_store import CalendarBarStore
+from csv_cache import load_csv_columns
+
+
+class CalendarCSVDataHandler(BufferedDataHandler):
+    """
+    CalendarCSVDataHandler reads the CSV file of each symbol into a
+    CalendarBarStore, which keeps only the bars each symbol actually
+    has, and pads them forward onto the master calendar one bar at
+    a time as update_bars steps through it.
+
+    A symbol without a bar at a timestamp is padded forward from its
+    last bar, or NaN before its first, which gives the same bars as
+    HistoricCSVDataHandler. Only the latest bars are kept padded, in
+    the BarRingBuffer, so a universe of symbols listed over short,
+    different periods does not cost symbols x dates of memory.
+
+    Strategies can ask is_listed or get_listed_symbols to skip the
+    symbols that are not yet listed, or no longer are, at the
+    current bar.
+    """
+
+    def __init__(
+        self, events, csv_dir, symbol_list, header_names,
+        zero_copy=False, use_cache=False
+    ):
+        """
+        Initialises the calendar data handler and loads the CSV
+        file of every symbol.
+
+        Parameters:
+        events - The Event Queue.
+        csv_dir - Absolute directory path to the CSV files.
+        symbol_list - A list of symbol strings.
+        header_names - The list of headers for the CSV file.
+        zero_copy - If True, get_latest_bars_values returns read-only
+            views into the buffer, valid until the next update_bars.
+        use_cache - If True, parsed CSV files are cached in a binary
+            file next to each CSV and reloaded from it while valid.
+        """
+        self.csv_dir = csv_dir
+        self.header_names = header_names
+        self.use_cache = use_cache
+
+        fields = list(header_names[1:]) + ["returns"]
+        super(CalendarCSVDataHandler, self).__init__(
+            events, symbol_list, fields, zero_copy=zero_copy
+        )
+        self._open_convert_csv_files()
+
+    def _open_convert_csv_files(self):
+        """
+        Opens the CSV files from the data directory and indexes
+        their bars against the master calendar.
+        """
+        symbol_columns = {}
+        for s in self.symbol_list:
+            symbol_columns[s] = load_csv_columns(
+                os.path.join(os.path.dirname(__file__), self.csv_dir + '%s.csv' % s),
+                self.header_names, use_cache=self.use_cache
+            )
+        self.calendar_store = CalendarBarStore.from_columns(self.symbol_list, symbol_columns)
+        self.cursor = 0
+        self._init_padded_row()
+
+    def _get_new_bar(self):
+        """
+        Returns the next calendar bar for all symbols, or None at
+        the end of the calendar.
+        """
+        if self.cursor >= len(self.calendar_store):
+            return None
+
+        symbols, values = self.calendar_store.observations(self.cursor)
+        self._row[:-1, symbols] = values
+        timestamp = self.calendar_store.timestamps[self.cursor]
+        self.cursor += 1
+
+        self._update_returns()
+        return timestamp, self._row
+
+    def is_listed(self, symbol):
+        """
+        Returns True if the symbol is listed at the latest bar,
+        i.e. the bar is between its first and last bar.
+        """
+        self._check_symbol(symbol)
+        s = self.buffer.symbol_index[symbol]
+        i = self.cursor - 1
+        return bool(
+            self.calendar_store.listing_start[s] <= i <= self.calendar_store.listing_end[s]
+        )
+
+    def get_listed_symbols(self):
+        """
+        Returns the symbols listed at the latest bar.
+        """
+        mask = self.calendar_store.listed_mask(self.cursor - 1)
+        return [s for s, listed in zip(self.symbol_list, mask) if listed]
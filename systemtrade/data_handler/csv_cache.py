@@ -0,0 +1,106 @@
+import json
+import logging
+import os
+import os.path
+
+import numpy as np
+import pandas as pd
+
+
+CACHE_VERSION = 1
+CACHE_SUFFIX = ".cache.npz"
+
+logger = logging.getLogger(__name__)
+
+
+def _cache_key(csv_path, header_names):
+    """
+    Returns the string identifying one parse of a CSV file. It
+    changes whenever the file is rewritten or read with different
+    header names.
+    """
+    stat = os.stat(csv_path)
+    return json.dumps([
+        CACHE_VERSION, os.path.abspath(csv_path),
+        stat.st_size, stat.st_mtime, list(header_names)
+    ])
+
+def parse_csv_columns(csv_path, header_names):
+    """
+    Parses a CSV file of bars into typed columns.
+
+    Parameters:
+    csv_path - Path to the CSV file.
+    header_names - The list of headers for the CSV file, the first
+        being the datetime column.
+
+    Returns:
+    timestamps, fields, values - int64 nanosecond timestamps sorted
+        ascending, the list of field names and a float64 array
+        shaped (fields, bars).
+    """
+    frame = pd.io.parsers.read_csv(
+        csv_path, header=0, index_col=0, parse_dates=True,
+        names=header_names
+    ).sort_index()
+    timestamps = frame.index.values.astype(np.int64)
+    values = np.ascontiguousarray(frame.values.T, dtype=np.float64)
+    return timestamps, list(frame.columns), values
+
+def load_csv_columns(csv_path, header_names, use_cache=True):
+    """
+    Returns the typed columns of a CSV file as parse_csv_columns
+    does, but reads them from a binary cache file stored next to
+    the CSV when it is still valid. The cache is keyed by the file
+    path, size, modification time and header names, and is
+    rewritten whenever any of them change.
+
+    Parameters:
+    csv_path - Path to the CSV file.
+    header_names - The list of headers for the CSV file.
+    use_cache - If False, always parse the CSV and leave the cache alone.
+    """
+    if not use_cache:
+        return parse_csv_columns(csv_path, header_names)
+
+    key = _cache_key(csv_path, header_names)
+    cache_path = csv_path + CACHE_SUFFIX
+    if os.path.exists(cache_path):
+        try:
+            cached = np.load(cache_path)
+            try:
+                if str(cached["key"]) == key:
+                    return (
+                        cached["timestamps"],
+                        [str(f) for f in cached["fields"]],
+                        cached["values"]
+                    )
+            finally:
+                cached.close()
+        except (IOError, ValueError, KeyError):
+            pass
+
+    timestamps, fields, values = parse_csv_columns(csv_path, header_names)
+    write_csv_cache(cache_path, key, timestamps, fields, values)
+    return timestamps, fields, values
+
+def write_csv_cache(cache_path, key, timestamps, fields, values):
+    """
+    Writes the typed columns to cache_path, replacing any existing
+    cache only once the new file is complete. Failing to write the
+    cache, e.g. on a read-only data directory, is not an error.
+    """
+    tmp_path = "%s.%d.tmp" % (cache_path, os.getpid())
+    try:
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f, key=np.array(key), timestamps=timestamps,
+                fields=np.array(fields), values=values
+            )
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        os.rename(tmp_path, cache_path)
+    except (IOError, OSError):
+        logger.warning("Could not write the market data cache %s", cache_path)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
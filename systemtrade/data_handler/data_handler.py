@@ -15,6 +15,15 @@ class DataHandler(object):
 
     __metaclass__ = ABCMeta
 
+    def set_max_lookback(self, max_lookback):
+        """
+        Informs the handler of the largest number of bars any
+        consumer will request per symbol, or None if the full
+        history is needed. Handlers may use this to bound the
+        memory they keep.
+        """
+        self.max_lookback = max_lookback
+
     @abstractmethod
     def get_latest_bar(self, symbol):
         """
@@ -49,6 +58,11 @@ class DataHandler(object):
         """
         Returns the last N bar values from the 
         latest_symbol list, or N-k if less available.
+
+        Handlers may return a read-only NumPy view rather than a
+        copy. Such a view is only valid until the next call to
+        update_bars, so callers that keep values across bars
+        must copy them.
         """
         raise NotImplementedError("Should implement get_latest_bars_values()")
 
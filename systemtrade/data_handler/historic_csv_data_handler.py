@@ -1,20 +1,26 @@
 import os
 import os.path
-import numpy as np
-import pandas as pd
 
-from data_handler import DataHandler
-from ..event import MarketEvent
+from bar_store import BarStore
+from bar_store_data_handler import BarStoreDataHandler
+from csv_cache import load_csv_columns
 
-class HistoricCSVDataHandler(DataHandler):
+class HistoricCSVDataHandler(BarStoreDataHandler):
     """
     HistoricCSVDataHandler is designed to read CSV files for
     each requested symbol from disk and provide an interface
     to obtain the "latest" bar in a manner identical to a live
     trading interface. 
+
+    The bars are held in a columnar BarStore and the "latest"
+    bars are those before an integer cursor, which update_bars
+    advances by one for every call.
     """
 
-    def __init__(self, events, csv_dir, symbol_list, header_names):
+    def __init__(
+        self, events, csv_dir, symbol_list, header_names,
+        zero_copy=False, use_cache=False
+    ):
         """
         Initialises the historic data handler by requesting
         the location of the CSV files and a list of symbols.
@@ -27,132 +33,36 @@ class HistoricCSVDataHandler(DataHandler):
         csv_dir - Absolute directory path to the CSV files.
         symbol_list - A list of symbol strings.
         header_names - The list of headers for the CSV file.
+        zero_copy - If True, get_latest_bars_values returns read-only
+            views into the BarStore, valid until the next update_bars.
+        use_cache - If True, parsed CSV files are cached in a binary
+            file next to each CSV and reloaded from it while valid.
         """
         self.events = events
         self.csv_dir = csv_dir
         self.symbol_list = symbol_list
         self.header_names = header_names
-        self.symbol_data = {}
-        self.latest_symbol_data = {}
+        self.zero_copy = zero_copy
+        self.use_cache = use_cache
+        self.bar_store = None
+        self.cursor = 0
+        self.max_lookback = None
         self.continue_backtest = True       
         self._open_convert_csv_files()
 
     def _open_convert_csv_files(self):
         """
         Opens the CSV files from the data directory, converting
-        them into pandas DataFrames within a symbol dictionary.
+        them into typed columns and aligning them into the
+        columnar BarStore.
 
         For this handler it will be assumed that the data is
         taken from DTN IQFeed. Thus its format will be respected.
         """
-        comb_index = None
+        symbol_columns = {}
         for s in self.symbol_list:
-            # Load the CSV file with no header information, indexed on date
-            self.symbol_data[s] = pd.io.parsers.read_csv(
-                                      os.path.join(os.path.dirname(__file__), self.csv_dir + '%s.csv' % s),
-                                      header=0, index_col=0, parse_dates=True,
-                                      names=self.header_names
-                                  ).sort()
-
-            # Combine the index to pad forward values
-            if comb_index is None:
-                comb_index = self.symbol_data[s].index
-            else:
-                comb_index = comb_index.union(self.symbol_data[s].index)
-
-            # Set the latest symbol_data to empty
-            self.latest_symbol_data[s] = []
-
-        # Reindex the dataframes
-        for s in self.symbol_list:
-            self.symbol_data[s] = self.symbol_data[s].reindex(
-                index=comb_index, method='pad'
+            symbol_columns[s] = load_csv_columns(
+                os.path.join(os.path.dirname(__file__), self.csv_dir + '%s.csv' % s),
+                self.header_names, use_cache=self.use_cache
             )
-            self.symbol_data[s]["returns"] = self.symbol_data[s]["close"].pct_change()
-            self.symbol_data[s] = self.symbol_data[s].iterrows()
-
-    def _get_new_bar(self, symbol):
-        """
-        Returns the latest bar from the data feed as a tuple of 
-        (datetime, open, high, low, close, volume).
-        """
-        for b in self.symbol_data[symbol]:
-            yield b
-
-    def get_latest_bar(self, symbol):
-        """
-        Returns the last bar from the latest_symbol list.
-        """
-        try:
-            bars_list = self.latest_symbol_data[symbol]
-        except KeyError:
-            print "That symbol is not available in the historical data set."
-            raise
-        else:
-            return bars_list[-1]
-
-    def get_latest_bars(self, symbol, N=1):
-        """
-        Returns the last N bars from the latest_symbol list,
-        or N-k if less available.
-        """
-        try:
-            bars_list = self.latest_symbol_data[symbol]
-        except KeyError:
-            print "That symbol is not available in the historical data set."
-            raise
-        else:
-            return bars_list[-N:]
-
-    def get_latest_bar_datetime(self, symbol):
-        """
-        Returns a Python datetime object for the last bar.
-        """
-        try:
-            bars_list = self.latest_symbol_data[symbol]
-        except KeyError:
-            print "That symbol is not available in the historical data set."
-            raise
-        else:
-            return bars_list[-1][0]
-
-    def get_latest_bar_value(self, symbol, val_type):
-        """
-        Returns one of the Open, High, Low, Close, Volume or OI
-        values from the pandas Bar series object.
-        """
-        try:
-            bars_list = self.latest_symbol_data[symbol]
-        except KeyError:
-            print "That symbol is not available in the historical data set."
-            raise
-        else:
-            return getattr(bars_list[-1][1], val_type)
-
-    def get_latest_bars_values(self, symbol, val_type, N=1):
-        """
-        Returns the last N bar values from the 
-        latest_symbol list, or N-k if less available.
-        """
-        try:
-            bars_list = self.get_latest_bars(symbol, N)
-        except KeyError:
-            print "That symbol is not available in the historical data set."
-            raise
-        else:
-            return np.array([getattr(b[1], val_type) for b in bars_list])
-
-    def update_bars(self):
-        """
-        Pushes the latest bar to the latest_symbol_data structure
-        for all symbols in the symbol list.
-        """
-        for s in self.symbol_list:
-            try:
-                bar = self._get_new_bar(s).next()
-            except StopIteration:
-                self.continue_backtest = False
-            else:
-                if bar is not None:
-                    self.latest_symbol_data[s].append(bar)
-        self.events.put(MarketEvent())
+        self.bar_store = BarStore.from_columns(self.symbol_list, symbol_columns)
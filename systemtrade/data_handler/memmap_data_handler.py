@@ -0,0 +1,50 @@
+import os.path
+
+from bar_store_data_handler import BarStoreDataHandler
+from memmap_store import load_memmap_store
+
+class MemmapDataHandler(BarStoreDataHandler):
+    """
+    MemmapDataHandler reads the bars of a universe from a store
+    of memory-mapped files, as written by convert_csv_to_memmap,
+    rather than parsing CSV files into memory.
+
+    Pages of the store are only faulted in as the backtest cursor
+    advances, and concurrent backtests on the same machine share
+    them through the OS page cache. This allows universes of
+    thousands of symbols with years of minute bars to be tested.
+
+    The bars are aligned on the calendar of the whole store, so a
+    subset of its symbols still steps through every timestamp of
+    the universe it was converted with.
+    """
+
+    def __init__(
+        self, events, store_dir, symbol_list, header_names=None,
+        zero_copy=False
+    ):
+        """
+        Initialises the memory-mapped data handler.
+
+        Parameters:
+        events - The Event Queue.
+        store_dir - Directory path to the memory-mapped store.
+        symbol_list - A list of symbol strings, which may be a
+            subset of the symbols in the store.
+        header_names - Unused, the fields are read from the store.
+        zero_copy - If True, get_latest_bars_values returns read-only
+            views into the store, valid until the next update_bars.
+        """
+        self.events = events
+        self.store_dir = store_dir
+        self.symbol_list = symbol_list
+        self.header_names = header_names
+        self.zero_copy = zero_copy
+        self.cursor = 0
+        self.max_lookback = None
+        self.continue_backtest = True
+        self.bar_store = load_memmap_store(
+            os.path.join(os.path.dirname(__file__), store_dir)
+        )
+        for s in self.symbol_list:
+            self._get_symbol_index(s)
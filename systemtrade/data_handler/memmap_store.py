@@ -0,0 +1,99 @@
+import json
+import os
+import os.path
+
+import numpy as np
+
+from bar_store import BarStore, align_columns
+from csv_cache import load_csv_columns
+
+
+META_FILE = "meta.json"
+TIMESTAMPS_FILE = "timestamps.npy"
+VALUES_FILE = "values.npy"
+
+
+def _write_meta(store_dir, symbol_list, fields):
+    """
+    Writes the symbol and field names of a memory-mapped store.
+    """
+    with open(os.path.join(store_dir, META_FILE), "w") as f:
+        json.dump({"symbols": list(symbol_list), "fields": list(fields)}, f)
+
+def write_memmap_store(store_dir, bar_store):
+    """
+    Writes an in-memory BarStore to store_dir in the layout read
+    by load_memmap_store.
+
+    Parameters:
+    store_dir - The directory to write, created if missing.
+    bar_store - The BarStore to write.
+    """
+    if not os.path.isdir(store_dir):
+        os.makedirs(store_dir)
+    np.save(os.path.join(store_dir, TIMESTAMPS_FILE), bar_store.timestamps)
+    np.save(os.path.join(store_dir, VALUES_FILE), bar_store.values)
+    _write_meta(store_dir, bar_store.symbol_list, bar_store.fields)
+
+def convert_csv_to_memmap(csv_dir, symbol_list, header_names, store_dir, use_cache=False):
+    """
+    Converts per-symbol CSV files into a memory-mapped store,
+    aligning them exactly as HistoricCSVDataHandler does. Only one
+    symbol is held in memory at a time, so universes larger than
+    RAM can be converted.
+
+    Parameters:
+    csv_dir - Directory path to the 'symbol.csv' files.
+    symbol_list - A list of symbol strings.
+    header_names - The list of headers for the CSV files.
+    store_dir - The directory to write, created if missing.
+    use_cache - If True, use the binary CSV cache while converting.
+    """
+    def load(s):
+        return load_csv_columns(
+            os.path.join(csv_dir, "%s.csv" % s), header_names, use_cache=use_cache
+        )
+
+    # First pass builds the combined calendar
+    timestamps = None
+    fields = None
+    for s in symbol_list:
+        sym_timestamps, sym_fields, _ = load(s)
+        if timestamps is None:
+            timestamps, fields = sym_timestamps, sym_fields
+        else:
+            timestamps = np.union1d(timestamps, sym_timestamps)
+
+    if not os.path.isdir(store_dir):
+        os.makedirs(store_dir)
+    np.save(os.path.join(store_dir, TIMESTAMPS_FILE), timestamps)
+    values = np.lib.format.open_memmap(
+        os.path.join(store_dir, VALUES_FILE), mode="w+", dtype=np.float64,
+        shape=(len(fields) + 1, len(symbol_list), len(timestamps))
+    )
+
+    # Second pass aligns one symbol at a time into the file
+    for i, s in enumerate(symbol_list):
+        sym_timestamps, sym_fields, sym_values = load(s)
+        if list(sym_fields) != list(fields):
+            raise ValueError("Symbol %s has fields %s, expected %s" % (s, sym_fields, fields))
+        align_columns(timestamps, sym_timestamps, fields, sym_values, values[:, i, :])
+    values.flush()
+    del values
+    _write_meta(store_dir, symbol_list, list(fields) + ["returns"])
+
+def load_memmap_store(store_dir):
+    """
+    Opens a store written by write_memmap_store or
+    convert_csv_to_memmap as a BarStore whose arrays are read-only
+    memory maps, so bars are only read from disk when accessed and
+    the pages are shared between processes through the OS cache.
+    """
+    with open(os.path.join(store_dir, META_FILE)) as f:
+        meta = json.load(f)
+    timestamps = np.load(os.path.join(store_dir, TIMESTAMPS_FILE), mmap_mode="r")
+    values = np.load(os.path.join(store_dir, VALUES_FILE), mmap_mode="r")
+    return BarStore(
+        [str(s) for s in meta["symbols"]], [str(f) for f in meta["fields"]],
+        timestamps, values
+    )
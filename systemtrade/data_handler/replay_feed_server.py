@@ -0,0 +1,166 @@
+import json
+import logging
+import os
+import os.path
+import socket
+import threading
+import time
+
+from calendar_bar_store import CalendarBarStore
+from csv_cache import load_csv_columns
+
+logger = logging.getLogger(__name__)
+
+
+def create_feed_socket(address):
+    """
+    Returns a stream socket for a feed address, a Unix socket for a
+    path string and a TCP socket, with Nagle's algorithm disabled
+    so bars are not held back, for a (host, port) pair.
+    """
+    if isinstance(address, basestring):
+        return socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+class ReplayFeedServer(object):
+    """
+    ReplayFeedServer streams the CSV bars of a universe of symbols
+    over a TCP or Unix socket, as a live feed would, so that a
+    SocketDataHandler can be run and timed against it locally.
+
+    Every connection is sent the whole history, one line of JSON
+    per bar of the master calendar: first {"fields": [...]}, then
+    {"timestamp": ns, "symbols": [...], "values": [[...], ...]}
+    holding only the symbols with a bar at that timestamp, whose
+    values are given per symbol in field order. The connection is
+    closed at the end of the history.
+
+    Connections are served one at a time on a background thread.
+    """
+
+    def __init__(
+        self, csv_dir, symbol_list, header_names, address=("127.0.0.1", 0),
+        speed=None, bar_interval=None, use_cache=False
+    ):
+        """
+        Initialises the server and loads the CSV file of every symbol.
+
+        Parameters:
+        csv_dir - Absolute directory path to the CSV files.
+        symbol_list - A list of symbol strings.
+        header_names - The list of headers for the CSV file.
+        address - The (host, port) to listen on, port 0 picking a
+            free one, or the path of a Unix socket.
+        speed - If given, bars are sent at this multiple of the
+            time between their timestamps, e.g. 86400.0 sends daily
+            bars one a second.
+        bar_interval - If given, and speed is not, bars are sent
+            this many seconds apart. Otherwise they are sent as fast
+            as the client reads them.
+        use_cache - If True, parsed CSV files are cached in a binary
+            file next to each CSV and reloaded from it while valid.
+        """
+        self.address = address
+        self.speed = speed
+        self.bar_interval = bar_interval
+        self.fields = list(header_names[1:])
+
+        symbol_columns = {}
+        for s in symbol_list:
+            symbol_columns[s] = load_csv_columns(
+                os.path.join(os.path.dirname(__file__), csv_dir + '%s.csv' % s),
+                header_names, use_cache=use_cache
+            )
+        self.calendar_store = CalendarBarStore.from_columns(symbol_list, symbol_columns)
+
+        self._sock = None
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """
+        Starts listening and serving on a background thread. The
+        address actually bound is then available as self.address.
+        """
+        self._sock = create_feed_socket(self.address)
+        if isinstance(self.address, basestring):
+            if os.path.exists(self.address):
+                os.remove(self.address)
+        else:
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(self.address)
+        self._sock.listen(1)
+        self._sock.settimeout(0.1)
+        self.address = self._sock.getsockname()
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._serve, name="ReplayFeedServer")
+        self._thread.daemon = True
+        self._thread.start()
+        logger.info("Replaying %d bars on %s", len(self.calendar_store), self.address)
+
+    def stop(self):
+        """
+        Stops serving, ending any replay in progress.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+            if isinstance(self.address, basestring) and os.path.exists(self.address):
+                os.remove(self.address)
+
+    def _serve(self):
+        while not self._stopped.is_set():
+            try:
+                conn = self._sock.accept()[0]
+            except socket.timeout:
+                continue
+            try:
+                conn.settimeout(None)
+                self._replay(conn)
+            except socket.error as e:
+                logger.warning("Replay to a client ended early: %s", e)
+            finally:
+                conn.close()
+
+    def _get_send_times(self):
+        """
+        Returns the time each bar is due to be sent, relative to the
+        start of the replay, or None to send them without pausing.
+        """
+        timestamps = self.calendar_store.timestamps
+        if self.speed is not None:
+            return (timestamps - timestamps[0]) / 1e9 / self.speed
+        if self.bar_interval is not None:
+            return [i * self.bar_interval for i in xrange(len(timestamps))]
+        return None
+
+    def _replay(self, conn):
+        """
+        Sends the history to one client.
+        """
+        store = self.calendar_store
+        conn.sendall(json.dumps({"fields": self.fields}) + "\n")
+        send_times = self._get_send_times()
+        start = time.time()
+        for i in xrange(len(store)):
+            if self._stopped.is_set():
+                return
+            if send_times is not None:
+                delay = start + send_times[i] - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+            symbols, values = store.observations(i)
+            message = {
+                "timestamp": int(store.timestamps[i]),
+                "symbols": [store.symbol_list[s] for s in symbols],
+                "values": values.T.tolist()
+            }
+            conn.sendall(json.dumps(message) + "\n")
@@ -0,0 +1,100 @@
+import json
+import logging
+import time
+
+from buffered_data_handler import BufferedDataHandler
+from replay_feed_server import create_feed_socket
+
+logger = logging.getLogger(__name__)
+
+
+class SocketDataHandler(BufferedDataHandler):
+    """
+    SocketDataHandler receives bars from a live or paper-trading
+    feed over a TCP or Unix socket, in the line protocol of
+    ReplayFeedServer, and drives the strategies and portfolio with
+    them exactly as the historic handlers do.
+
+    update_bars blocks until the next bar arrives and the feed
+    ending stops the run. A symbol without a bar at a timestamp is
+    padded forward from its last bar, or NaN before its first.
+
+    The time the latest bar arrived is kept in self.arrival_time,
+    from which a backtest measures the latency of its orders.
+    """
+
+    def __init__(
+        self, events, csv_dir, symbol_list, header_names, address,
+        zero_copy=False, timeout=None
+    ):
+        """
+        Initialises the handler and connects to the feed.
+
+        Parameters:
+        events - The Event Queue.
+        csv_dir - Unused, the bars come from the feed.
+        symbol_list - A list of symbol strings.
+        header_names - The list of headers of the bar data.
+        address - The (host, port) of the feed or the path of its
+            Unix socket.
+        zero_copy - If True, get_latest_bars_values returns read-only
+            views into the buffer, valid until the next update_bars.
+        timeout - Seconds to wait for a bar before giving up with a
+            socket.timeout, or None to wait indefinitely.
+        """
+        self.address = address
+        fields = list(header_names[1:]) + ["returns"]
+        super(SocketDataHandler, self).__init__(
+            events, symbol_list, fields, zero_copy=zero_copy
+        )
+        self._init_padded_row()
+        self.symbol_index = dict((s, i) for i, s in enumerate(self.symbol_list))
+
+        self.arrival_time = None
+        self._connect(timeout)
+
+    def _connect(self, timeout):
+        """
+        Connects to the feed and checks that it sends the fields
+        expected.
+        """
+        self._sock = create_feed_socket(self.address)
+        self._sock.settimeout(timeout)
+        self._sock.connect(self.address)
+        self._feed = self._sock.makefile("rb")
+
+        header = json.loads(self._feed.readline() or "{}")
+        if header.get("fields") != list(self.fields[:-1]):
+            self.close()
+            raise ValueError(
+                "Feed at %s sends fields %s, expected %s"
+                % (self.address, header.get("fields"), list(self.fields[:-1]))
+            )
+        logger.info("Connected to the feed at %s", self.address)
+
+    def close(self):
+        """
+        Closes the connection to the feed.
+        """
+        self._feed.close()
+        self._sock.close()
+
+    def _get_new_bar(self):
+        """
+        Waits for the next bar from the feed, or returns None once
+        the feed has closed.
+        """
+        line = self._feed.readline()
+        self.arrival_time = time.time()
+        if not line:
+            logger.info("The feed at %s has ended", self.address)
+            self.close()
+            return None
+
+        message = json.loads(line)
+        for symbol, values in zip(message["symbols"], message["values"]):
+            s = self.symbol_index.get(symbol)
+            if s is not None:
+                self._row[:-1, s] = values
+        self._update_returns()
+        return message["timestamp"], self._row
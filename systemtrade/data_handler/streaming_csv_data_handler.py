@@ -0,0 +1,136 @@
+import heapq
+import os.path
+
+import numpy as np
+import pandas as pd
+
+from buffered_data_handler import BufferedDataHandler
+
+
+class _CSVChunkReader(object):
+    """
+    Steps through the rows of one symbol's CSV file, reading it
+    from disk a chunk at a time.
+    """
+
+    def __init__(self, csv_path, header_names, chunk_size):
+        self.csv_path = csv_path
+        self.chunks = pd.io.parsers.read_csv(
+            csv_path, header=0, index_col=0, parse_dates=True,
+            names=header_names, chunksize=chunk_size
+        )
+        self.timestamp = None
+        self.exhausted = False
+        self._timestamps = np.empty(0, dtype=np.int64)
+        self._values = None
+        self._pos = 0
+        self.advance()
+
+    def advance(self):
+        """
+        Moves to the next row, setting exhausted at the end of file.
+        """
+        self._pos += 1
+        while self._pos >= len(self._timestamps):
+            try:
+                chunk = next(self.chunks)
+            except StopIteration:
+                self.exhausted = True
+                return
+            self._timestamps = chunk.index.values.astype(np.int64)
+            self._values = np.ascontiguousarray(chunk.values.T, dtype=np.float64)
+            self._pos = 0
+
+        timestamp = self._timestamps[self._pos]
+        if self.timestamp is not None and timestamp < self.timestamp:
+            raise ValueError("%s is not sorted by date." % self.csv_path)
+        self.timestamp = timestamp
+
+    def current(self):
+        """
+        Returns the values of the current row as an array of fields.
+        """
+        return self._values[:, self._pos]
+
+
+class StreamingCSVDataHandler(BufferedDataHandler):
+    """
+    StreamingCSVDataHandler reads the CSV file of each symbol in
+    chunks and merges them by timestamp on the fly, rather than
+    loading whole files into memory and reindexing them.
+
+    The merge is a k-way merge over the symbols' next timestamps.
+    A symbol without a bar at a timestamp is padded forward from
+    its last bar, or NaN before its first, which gives the same
+    bars as HistoricCSVDataHandler. Each file must already be
+    sorted by date.
+
+    Together with the bounded BarRingBuffer, memory stays constant
+    however long the history is.
+    """
+
+    def __init__(
+        self, events, csv_dir, symbol_list, header_names,
+        chunk_size=10000, zero_copy=False
+    ):
+        """
+        Initialises the streaming data handler and opens the CSV
+        file of every symbol.
+
+        Parameters:
+        events - The Event Queue.
+        csv_dir - Absolute directory path to the CSV files.
+        symbol_list - A list of symbol strings.
+        header_names - The list of headers for the CSV file.
+        chunk_size - The number of rows read from a file at a time.
+        zero_copy - If True, get_latest_bars_values returns read-only
+            views into the buffer, valid until the next update_bars.
+        """
+        self.csv_dir = csv_dir
+        self.header_names = header_names
+        self.chunk_size = chunk_size
+
+        fields = list(header_names[1:]) + ["returns"]
+        super(StreamingCSVDataHandler, self).__init__(
+            events, symbol_list, fields, zero_copy=zero_copy
+        )
+        self._open_csv_readers()
+
+    def _open_csv_readers(self):
+        """
+        Opens a chunked reader per symbol and seeds the merge heap
+        with the first timestamp of each file.
+        """
+        self._readers = []
+        self._heap = []
+        for i, s in enumerate(self.symbol_list):
+            reader = _CSVChunkReader(
+                os.path.join(os.path.dirname(__file__), self.csv_dir + '%s.csv' % s),
+                self.header_names, self.chunk_size
+            )
+            self._readers.append(reader)
+            if not reader.exhausted:
+                self._heap.append((reader.timestamp, i))
+        heapq.heapify(self._heap)
+
+        self._init_padded_row()
+
+    def _get_new_bar(self):
+        """
+        Returns the next merged bar for all symbols, or None once
+        every file is exhausted.
+        """
+        if not self._heap:
+            return None
+
+        timestamp = self._heap[0][0]
+        while self._heap and self._heap[0][0] == timestamp:
+            i = heapq.heappop(self._heap)[1]
+            reader = self._readers[i]
+            self._row[:-1, i] = reader.current()
+            reader.advance()
+            if not reader.exhausted:
+                heapq.heappush(self._heap, (reader.timestamp, i))
+
+        self._update_returns()
+        return timestamp, self._row
@@ -3,3 +3,6 @@ from market_event import MarketEvent
 from signal_event import SignalEvent
 from order_event import OrderEvent
 from fill_event import FillEvent
+from event_bus import EventBus
+from deque_event_bus import DequeEventBus
+from thread_safe_event_bus import ThreadSafeEventBus
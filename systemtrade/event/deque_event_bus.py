@@ -0,0 +1,42 @@
+from collections import deque
+
+from event_bus import EventBus
+
+class DequeEventBus(EventBus):
+    """
+    DequeEventBus is the event bus of a single-threaded backtest.
+    Events are kept in a deque, so putting and taking one is a
+    plain append and popleft without any locking, and running out
+    of events ends the dispatch loop without raising an exception.
+    """
+
+    def __init__(self):
+        """
+        Initialises the empty bus.
+        """
+        super(DequeEventBus, self).__init__()
+        self.events = deque()
+
+    def __len__(self):
+        return len(self.events)
+
+    def put(self, event):
+        """
+        Adds an event to the bus.
+        """
+        if event is not None:
+            self.events.append(event)
+
+    def dispatch(self):
+        """
+        Delivers the pending events until the bus is empty.
+        """
+        events = self.events
+        get_handlers = self._get_handlers
+        count = 0
+        while events:
+            event = events.popleft()
+            for handler in get_handlers(event.__class__):
+                handler(event)
+            count += 1
+        return count
@@ -3,5 +3,11 @@ class Event(object):
     Event is base class providing an interface for all subsequent 
     (inherited) events, that will trigger further events in the 
     trading infrastructure.   
+
+    Events are created for every bar, so they declare __slots__ to
+    avoid a per-instance __dict__, and their type is a class
+    attribute rather than being stored on each instance.
     """
-    pass
+    __slots__ = ()
+
+    type = None
@@ -0,0 +1,68 @@
+from abc import ABCMeta, abstractmethod
+
+class EventBus(object):
+    """
+    EventBus is an abstract base class providing an interface for
+    the event queue shared by the components of a backtest or of
+    live trading.
+
+    Components put events on the bus as they would on a Queue, and
+    the loop driving them calls dispatch() to deliver every pending
+    event to the handlers subscribed to its class. Handlers are
+    looked up in a table keyed by the event class rather than by
+    comparing event.type strings.
+    """
+
+    __metaclass__ = ABCMeta
+
+    def __init__(self):
+        """
+        Initialises the table of handlers.
+        """
+        self.handlers = {}
+        self._dispatch_table = {}
+
+    def subscribe(self, event_cls, handler):
+        """
+        Registers handler to be called with every event of
+        event_cls, or of a subclass of it, in subscription order.
+
+        Parameters:
+        event_cls - The Event class handled.
+        handler - Callable taking the event.
+        """
+        self.handlers.setdefault(event_cls, []).append(handler)
+        self._dispatch_table = {}
+
+    def _get_handlers(self, event_cls):
+        """
+        Returns the handlers of an event class, building and caching
+        the list from the handlers of its base classes.
+        """
+        try:
+            return self._dispatch_table[event_cls]
+        except KeyError:
+            handlers = []
+            for cls in reversed(event_cls.__mro__):
+                handlers.extend(self.handlers.get(cls, []))
+            self._dispatch_table[event_cls] = handlers
+            return handlers
+
+    @abstractmethod
+    def put(self, event):
+        """
+        Adds an event to the bus. None, e.g. an order that was not
+        generated, is ignored.
+        """
+        raise NotImplementedError("Should implement put()")
+
+    @abstractmethod
+    def dispatch(self):
+        """
+        Delivers the pending events, including those put by the
+        handlers while dispatching, until the bus is empty.
+
+        Returns:
+        The number of events delivered.
+        """
+        raise NotImplementedError("Should implement dispatch()")
@@ -7,8 +7,16 @@ class FillEvent(Event):
     actually filled and at what price. In addition, stores
     the commission of the trade from the brokerage.
     """
+    __slots__ = (
+        'timeindex', 'symbol', 'exchange', 'quantity',
+        'direction', 'fill_cost', 'commission', 'strategy_id'
+    )
+
+    type = 'FILL'
+
     def __init__(self, timeindex, symbol, exchange, quantity, 
-                 direction, fill_cost, commission=0.001578 * 1.07):
+                 direction, fill_cost, commission=0.001578 * 1.07,
+                 strategy_id=None):
         """
         Initialises the FillEvent object. Sets the symbol, exchange,
         quantity, direction, cost of fill and an optional 
@@ -26,8 +34,8 @@ class FillEvent(Event):
         direction - The direction of fill ('BUY' or 'SELL')
         fill_cost - The holdings value in dollars.
         commission - An optional commission sent from IB.
+        strategy_id - The ID of the strategy the order was for, if any.
         """
-        self.type = 'FILL'
         self.timeindex = timeindex
         self.symbol = symbol
         self.exchange = exchange
@@ -35,6 +43,7 @@ class FillEvent(Event):
         self.direction = direction
         self.fill_cost = fill_cost
         self.commission = commission
+        self.strategy_id = strategy_id
 
         # Calculate commission
         """
@@ -4,10 +4,37 @@ class MarketEvent(Event):
     """
     Handles the event of receiving a new market update with 
     corresponding bars.
+
+    The event carries the latest bar itself, as its timestamp and
+    its index within a block of bars shaped (fields, symbols, bars),
+    i.e. the BarStore or BarRingBuffer of the data handler, so that
+    consumers can read the bar without calling back into the data
+    handler for every symbol.
     """
+    __slots__ = ('timeindex', 'bar_index', 'bars')
+
+    type = 'MARKET'
 
-    def __init__(self):
+    def __init__(self, timeindex=None, bar_index=None, bars=None):
         """
         Initialises the MarketEvent.
+
+        Parameters:
+        timeindex - The pandas Timestamp of the latest bar.
+        bar_index - The index of the latest bar within bars.
+        bars - The block of bars, with values, symbol_index and
+            field_index attributes.
+        """
+        self.timeindex = timeindex
+        self.bar_index = bar_index
+        self.bars = bars
+
+    def get_latest_bar_value(self, symbol, val_type):
+        """
+        Returns one of the Open, High, Low, Close, Volume or OI
+        values of a symbol from the latest bar.
         """
-        self.type = 'MARKET'
+        bars = self.bars
+        return bars.values[
+            bars.field_index[val_type], bars.symbol_index[symbol], self.bar_index
+        ]
@@ -7,7 +7,11 @@ class OrderEvent(Event):
     quantity and a direction.
     """
 
-    def __init__(self, symbol, order_type, quantity, direction):
+    __slots__ = ('symbol', 'order_type', 'quantity', 'direction', 'strategy_id')
+
+    type = 'ORDER'
+
+    def __init__(self, symbol, order_type, quantity, direction, strategy_id=None):
         """
         Initialises the order type, setting whether it is
         a Market order ('MKT') or Limit order ('LMT'), has
@@ -19,12 +23,14 @@ class OrderEvent(Event):
         order_type - 'MKT' or 'LMT' for Market or Limit.
         quantity - Non-negative integer for quantity.
         direction - 'BUY' or 'SELL' for long or short.
+        strategy_id - The ID of the strategy whose signal led to
+            the order, if any.
         """
-        self.type = 'ORDER'
         self.symbol = symbol
         self.order_type = order_type
         self.quantity = quantity
         self.direction = direction
+        self.strategy_id = strategy_id
 
     def print_order(self):
         """
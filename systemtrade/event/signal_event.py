@@ -6,6 +6,10 @@ class SignalEvent(Event):
     This is received by a Portfolio object and acted upon.
     """
     
+    __slots__ = ('strategy_id', 'symbol', 'datetime', 'signal_type', 'strength')
+
+    type = 'SIGNAL'
+
     def __init__(self, strategy_id, symbol, datetime, signal_type, strength):
         """
         Initialises the SignalEvent.
@@ -19,7 +23,6 @@ class SignalEvent(Event):
             quantity at the portfolio level. Useful for pairs strategies.
         """
         self.strategy_id = strategy_id
-        self.type = 'SIGNAL'
         self.symbol = symbol
         self.datetime = datetime
         self.signal_type = signal_type
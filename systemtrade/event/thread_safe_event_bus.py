@@ -0,0 +1,50 @@
+import Queue
+
+from event_bus import EventBus
+
+class ThreadSafeEventBus(EventBus):
+    """
+    ThreadSafeEventBus is the event bus of live trading, where
+    events may be put from other threads, e.g. by a data feed or
+    a broker connection, while the trading loop dispatches them.
+    """
+
+    def __init__(self):
+        """
+        Initialises the empty bus.
+        """
+        super(ThreadSafeEventBus, self).__init__()
+        self.events = Queue.Queue()
+
+    def __len__(self):
+        return self.events.qsize()
+
+    def put(self, event):
+        """
+        Adds an event to the bus. Safe to call from any thread.
+        """
+        if event is not None:
+            self.events.put(event)
+
+    def dispatch(self, timeout=None):
+        """
+        Delivers the pending events until the bus is empty.
+
+        Parameters:
+        timeout - If not None, first wait up to timeout seconds for
+            an event to arrive when the bus is empty.
+        """
+        count = 0
+        try:
+            if timeout is not None:
+                event = self.events.get(True, timeout)
+            else:
+                event = self.events.get(False)
+            while True:
+                for handler in self._get_handlers(event.__class__):
+                    handler(event)
+                count += 1
+                event = self.events.get(False)
+        except Queue.Empty:
+            pass
+        return count
@@ -34,5 +34,6 @@ class SimulatedExecutionHandler(ExecutionHandler):
         """
         if event.type == 'ORDER':
             fill_event = FillEvent(datetime.datetime.utcnow(), event.symbol,
-                                   'ARCA', event.quantity, event.direction, None)
+                                   'ARCA', event.quantity, event.direction, None,
+                                   strategy_id=event.strategy_id)
             self.events.put(fill_event)
@@ -0,0 +1,7 @@
+#
+from indicator import Indicator
+from sma import SMA
+from ema import EMA
+from rolling_extreme import RollingMax, RollingMin
+from momentum import Momentum
+from macd import MACD
@@ -0,0 +1,90 @@
+from collections import deque
+
+from indicator import Indicator
+
+class EMA(Indicator):
+    """
+    Exponential Moving Average over a finite window, as the
+    strategies have always computed it: seeded with the simple
+    average of the window values before the last window values,
+    then smoothed over the last window values with the factor
+    c = 2 / (window + 1). It therefore depends only on the last
+    2 * window values:
+
+    EMA = (1-c)^window * SMA(x[t-2w+1..t-w]) + sum_j c(1-c)^j x[t-j]
+
+    with j running from 0 to window - 1. Both terms are updated in
+    O(1) per value; the weighted sum by the recursion
+    S[t] = c x[t] + (1-c) S[t-1] - c (1-c)^window x[t-window].
+
+    The average is NaN while the last 2 * window values hold a NaN.
+    """
+
+    def __init__(self, window):
+        """
+        Initialises the EMA.
+
+        Parameters:
+        window - The smoothing window.
+        """
+        self.window = window
+        self.c = 2.0 / float(window + 1)
+        self.decay = (1.0 - self.c) ** window
+        self.value = None
+        self._values = deque()
+        self._seed_sum = 0.0
+        self._smoothed = 0.0
+        self._nans = 0
+        self._stale = False
+        self._updates = 0
+
+    def _recompute(self):
+        """
+        Recomputes both terms from the buffered values.
+        """
+        values = list(self._values)
+        self._seed_sum = sum(values[:-self.window])
+        self._smoothed = 0.0
+        for value in values[-self.window:]:
+            self._smoothed = self.c * value + (1.0 - self.c) * self._smoothed
+        self._stale = False
+        self._updates = 0
+
+    def update(self, value):
+        """
+        Adds the newest value and returns the EMA, or None until
+        2 * window values have been seen.
+        """
+        w = self.window
+        values = self._values
+        values.append(value)
+        if value != value:
+            self._nans += 1
+            self._stale = True
+
+        # The value moving from the smoothed window to the seed window
+        entering = values[-w - 1] if len(values) > w else 0.0
+        # The value dropping out of the seed window
+        leaving = values.popleft() if len(values) > 2 * w else 0.0
+        if leaving != leaving:
+            self._nans -= 1
+
+        if not self._stale:
+            self._smoothed = (
+                self.c * value + (1.0 - self.c) * self._smoothed
+                - self.c * self.decay * entering
+            )
+            self._seed_sum += entering - leaving
+            self._updates += 1
+            if self._updates >= w:
+                self._recompute()
+        elif self._nans == 0:
+            self._recompute()
+
+        if len(values) < 2 * w:
+            self.value = None
+        elif self._nans > 0:
+            self.value = float("nan")
+        else:
+            self.value = self.decay * self._seed_sum / float(w) + self._smoothed
+        return self.value
@@ -0,0 +1,25 @@
+from abc import ABCMeta, abstractmethod
+
+class Indicator(object):
+    """
+    Indicator is an abstract base class providing an interface for
+    all subsequent (inherited) streaming indicators.
+
+    An indicator is fed one value per bar through update() and keeps
+    just enough state to produce its new value in constant (or
+    amortised constant) time, rather than recomputing from the full
+    lookback window on every bar.
+    """
+
+    __metaclass__ = ABCMeta
+
+    # The latest value, or None while warming up
+    value = None
+
+    @abstractmethod
+    def update(self, value):
+        """
+        Adds the newest value and returns the updated indicator
+        value, or None until enough values have been seen.
+        """
+        raise NotImplementedError("Should implement update()")
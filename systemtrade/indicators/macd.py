@@ -0,0 +1,47 @@
+from indicator import Indicator
+from ema import EMA
+
+class MACD(Indicator):
+    """
+    Moving Average Convergence/Divergence. The MACD line is the
+    short EMA less the long EMA of the values and the signal line
+    is the EMA of the MACD line, all using the windowed EMA of this
+    package. Memory is bounded by twice the longest window.
+    """
+
+    def __init__(self, long_window=26, shrt_window=12, sgnl_window=9):
+        """
+        Initialises the MACD.
+
+        Parameters:
+        long_window - MACD long window (default is 26)
+        shrt_window - MACD short window (default is 12)
+        sgnl_window - MACD signal window (default is 9)
+        """
+        self.long_ema = EMA(long_window)
+        self.shrt_ema = EMA(shrt_window)
+        self.sgnl_ema = EMA(sgnl_window)
+        self.macd = None
+        self.signal = None
+        self.value = None
+
+    def update(self, value):
+        """
+        Adds the newest value and returns a tuple of the MACD line
+        and the signal line, or None until both are available.
+        The MACD line alone is available earlier as self.macd.
+        """
+        long_ema = self.long_ema.update(value)
+        shrt_ema = self.shrt_ema.update(value)
+        if long_ema is None or shrt_ema is None:
+            self.macd = None
+            self.signal = None
+        else:
+            self.macd = shrt_ema - long_ema
+            self.signal = self.sgnl_ema.update(self.macd)
+
+        if self.signal is None:
+            self.value = None
+        else:
+            self.value = (self.macd, self.signal)
+        return self.value
@@ -0,0 +1,33 @@
+from collections import deque
+
+from indicator import Indicator
+
+class Momentum(Indicator):
+    """
+    Momentum, the change of a value over the last window periods:
+    x[t] - x[t-window].
+    """
+
+    def __init__(self, window):
+        """
+        Initialises the momentum.
+
+        Parameters:
+        window - The number of periods the change is taken over.
+        """
+        self.window = window
+        self.value = None
+        self._values = deque(maxlen=window + 1)
+
+    def update(self, value):
+        """
+        Adds the newest value and returns the change from the value
+        window periods ago, or None until window + 1 values have
+        been seen.
+        """
+        self._values.append(value)
+        if len(self._values) <= self.window:
+            self.value = None
+        else:
+            self.value = value - self._values[0]
+        return self.value
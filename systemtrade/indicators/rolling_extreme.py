@@ -0,0 +1,76 @@
+from collections import deque
+
+from indicator import Indicator
+
+class _RollingExtreme(Indicator):
+    """
+    Rolling extreme of the last window values, kept in a monotonic
+    deque of (index, value) pairs. Every value is pushed and popped
+    at most once, so an update costs amortised O(1) whatever the
+    window length.
+
+    The extreme is NaN while the window holds a NaN value.
+    """
+
+    def __init__(self, window):
+        """
+        Initialises the rolling extreme.
+
+        Parameters:
+        window - The number of values the extreme is taken over.
+        """
+        self.window = window
+        self.value = None
+        self._deque = deque()
+        self._count = 0
+        self._last_nan = None
+
+    def _dominates(self, new, old):
+        """
+        Returns True if old can never be the extreme again once
+        new is in the window.
+        """
+        raise NotImplementedError("Should implement _dominates()")
+
+    def update(self, value):
+        """
+        Adds the newest value and returns the extreme of the last
+        window values, or None until window values have been seen.
+        """
+        i = self._count
+        self._count += 1
+        if value != value:
+            self._last_nan = i
+        else:
+            dq = self._deque
+            while dq and self._dominates(value, dq[-1][1]):
+                dq.pop()
+            dq.append((i, value))
+            if dq[0][0] <= i - self.window:
+                dq.popleft()
+
+        if self._count < self.window:
+            self.value = None
+        elif self._last_nan is not None and self._last_nan > i - self.window:
+            self.value = float("nan")
+        else:
+            self.value = self._deque[0][1]
+        return self.value
+
+
+class RollingMax(_RollingExtreme):
+    """
+    Rolling maximum of the last window values.
+    """
+
+    def _dominates(self, new, old):
+        return new >= old
+
+
+class RollingMin(_RollingExtreme):
+    """
+    Rolling minimum of the last window values.
+    """
+
+    def _dominates(self, new, old):
+        return new <= old
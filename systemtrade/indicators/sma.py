@@ -0,0 +1,58 @@
+from collections import deque
+
+from indicator import Indicator
+
+class SMA(Indicator):
+    """
+    Simple Moving Average of the last window values, kept as a
+    running sum. The sum is recomputed from the window once every
+    window updates, so rounding errors cannot accumulate while the
+    cost stays amortised O(1) per update.
+
+    The average is NaN while the window holds a NaN value.
+    """
+
+    def __init__(self, window):
+        """
+        Initialises the SMA.
+
+        Parameters:
+        window - The number of values averaged.
+        """
+        self.window = window
+        self.value = None
+        self._values = deque()
+        self._sum = 0.0
+        self._nans = 0
+        self._updates = 0
+
+    def update(self, value):
+        """
+        Adds the newest value and returns the average of the last
+        window values, or None until window values have been seen.
+        """
+        if value != value:
+            self._nans += 1
+        else:
+            self._sum += value
+        self._values.append(value)
+
+        if len(self._values) > self.window:
+            old = self._values.popleft()
+            if old != old:
+                self._nans -= 1
+            else:
+                self._sum -= old
+
+        self._updates += 1
+        if self._updates >= self.window and self._nans == 0:
+            self._sum = sum(self._values)
+            self._updates = 0
+
+        if len(self._values) < self.window:
+            self.value = None
+        elif self._nans > 0:
+            self.value = float("nan")
+        else:
+            self.value = self._sum / float(self.window)
+        return self.value
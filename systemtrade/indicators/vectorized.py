@@ -0,0 +1,199 @@
+"""
+Vectorised counterparts of the streaming indicators, computed over
+a whole history at once. Every function takes an array shaped
+(symbols, bars) and returns an array of the same shape holding the
+value the streaming indicator would have after each bar, with NaN
+while it is still warming up.
+
+The values are bit for bit those of the streaming indicators, so
+that a vectorised backtest takes the same decisions on exact ties.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _rolling(values, window):
+    """
+    Returns a pandas Rolling object over the bars of each symbol.
+    """
+    return pd.DataFrame(np.atleast_2d(values).T).rolling(window)
+
+def _window_clean(nans, window):
+    """
+    Returns True where the last window values hold no NaN.
+    """
+    count = np.cumsum(nans, axis=1)
+    lagged = np.zeros(count.shape, dtype=count.dtype)
+    lagged[:, window:] = count[:, :-window]
+    return count == lagged
+
+def _block_offsets(clean, window):
+    """
+    Returns the number of bars since the streaming indicator last
+    recomputed its running sums from the buffered values, or -1
+    where its window holds a NaN.
+
+    The streaming indicators recompute every window updates, and
+    straight away once a NaN has left their window. An indicator
+    that has seen no NaN behaves as if it had recomputed, from no
+    values at all, the bar before the first.
+    """
+    bars = np.arange(clean.shape[1])
+    prev_clean = np.zeros(clean.shape, dtype=bool)
+    prev_clean[:, 1:] = clean[:, :-1]
+    run_start = np.maximum.accumulate(
+        np.where(clean & ~prev_clean, bars, -1), axis=1
+    )
+    run_start[run_start == 0] = -1
+    return np.where(clean, (bars - run_start) % window, -1)
+
+def _blocks(offsets, window):
+    """
+    Yields the (symbol, bar) indices of each offset in turn, so the
+    running sums can be advanced for every block at once.
+    """
+    rows, cols = np.nonzero(offsets >= 0)
+    order = np.argsort(offsets[rows, cols], kind="mergesort")
+    rows, cols = rows[order], cols[order]
+    bounds = np.cumsum(np.bincount(offsets[rows, cols], minlength=window))
+    for k in range(window):
+        lo = bounds[k - 1] if k > 0 else 0
+        yield k, rows[lo:bounds[k]], cols[lo:bounds[k]]
+
+def _lagged(values, rows, cols, lag):
+    """
+    Returns values[rows, cols - lag], or 0.0 before the first bar.
+    """
+    return np.where(cols >= lag, values[rows, cols - lag], 0.0)
+
+def available(values, warmup):
+    """
+    Returns a boolean array that is True from the bar at which an
+    indicator needing warmup values first has a value (whether or
+    not that value is NaN).
+    """
+    return np.arange(values.shape[-1]) >= warmup - 1
+
+def sma(values, window):
+    """
+    Simple Moving Average of the last window values, rounded
+    exactly as the streaming SMA rounds it.
+    """
+    values = np.atleast_2d(values).astype(np.float64)
+    nans = np.isnan(values)
+    clean = _window_clean(nans, window)
+    filled = np.where(nans, 0.0, values)
+
+    total = np.zeros(values.shape)
+    for k, rows, cols in _blocks(_block_offsets(clean, window), window):
+        if k == 0:
+            current = np.zeros(len(rows))
+            for j in range(window):
+                current = current + filled[rows, cols - window + 1 + j]
+        else:
+            current = np.where(cols > 0, total[rows, cols - 1], 0.0)
+            current = current + values[rows, cols]
+            current = np.where(
+                cols >= window, current - _lagged(filled, rows, cols, window), current
+            )
+        total[rows, cols] = current
+
+    result = total / float(window)
+    result[~clean | ~available(values, window)] = np.nan
+    return result
+
+def ema(values, window):
+    """
+    The windowed Exponential Moving Average of the EMA indicator,
+    rounded exactly as the streaming EMA rounds it.
+    """
+    values = np.atleast_2d(values).astype(np.float64)
+    nans = np.isnan(values)
+    clean = _window_clean(nans, 2 * window)
+    filled = np.where(nans, 0.0, values)
+    c = 2.0 / float(window + 1)
+    decay = (1.0 - c) ** window
+
+    seed = np.zeros(values.shape)
+    smoothed = np.zeros(values.shape)
+    for k, rows, cols in _blocks(_block_offsets(clean, window), window):
+        if k == 0:
+            current_seed = np.zeros(len(rows))
+            current = np.zeros(len(rows))
+            for j in range(window):
+                current_seed = current_seed + _lagged(filled, rows, cols, 2 * window - 1 - j)
+                current = c * filled[rows, cols - window + 1 + j] + (1.0 - c) * current
+        else:
+            current_seed = np.where(cols > 0, seed[rows, cols - 1], 0.0)
+            current = np.where(cols > 0, smoothed[rows, cols - 1], 0.0)
+            entering = _lagged(filled, rows, cols, window)
+            leaving = _lagged(filled, rows, cols, 2 * window)
+            current = c * values[rows, cols] + (1.0 - c) * current - c * decay * entering
+            current_seed = current_seed + (entering - leaving)
+        seed[rows, cols] = current_seed
+        smoothed[rows, cols] = current
+
+    result = decay * seed / float(window) + smoothed
+    result[~clean | ~available(values, 2 * window)] = np.nan
+    return result
+
+def rolling_max(values, window):
+    """
+    Rolling maximum of the last window values.
+    """
+    return _rolling(values, window).max().values.T
+
+def rolling_min(values, window):
+    """
+    Rolling minimum of the last window values.
+    """
+    return _rolling(values, window).min().values.T
+
+def momentum(values, window):
+    """
+    Change of the values over the last window periods.
+    """
+    values = np.atleast_2d(values)
+    result = np.empty(values.shape)
+    result.fill(np.nan)
+    result[:, window:] = values[:, window:] - values[:, :-window]
+    return result
+
+def macd(values, long_window=26, shrt_window=12, sgnl_window=9):
+    """
+    MACD line and signal line of the MACD indicator. The signal
+    EMA only starts once the MACD line is available.
+
+    Returns:
+    macd_line, signal_line - Arrays shaped like values.
+    """
+    values = np.atleast_2d(values)
+    macd_line = ema(values, shrt_window) - ema(values, long_window)
+    start = 2 * max(long_window, shrt_window) - 1
+    signal_line = np.empty(values.shape)
+    signal_line.fill(np.nan)
+    if start < values.shape[1]:
+        signal_line[:, start:] = ema(macd_line[:, start:], sgnl_window)
+    return macd_line, signal_line
+
+def previous_max(values):
+    """
+    Highest value before each bar, ignoring NaN values, i.e. the
+    running all time high excluding the current bar.
+    """
+    values = np.atleast_2d(values)
+    result = np.empty(values.shape)
+    result[:, 0] = np.nan
+    result[:, 1:] = np.fmax.accumulate(values, axis=1)[:, :-1]
+    return result
+
+def shift(values, periods=1):
+    """
+    Shifts the values forward by periods bars, filling with NaN.
+    """
+    values = np.atleast_2d(values)
+    result = np.empty(values.shape)
+    result[:, :periods] = np.nan
+    result[:, periods:] = values[:, :-periods]
+    return result
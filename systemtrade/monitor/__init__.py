@@ -0,0 +1,5 @@
+#
+from logging_config import configure_logging
+from progress_reporter import ProgressReporter
+from component_timer import ComponentTimer
+from stack_sampler import StackSampler
@@ -0,0 +1,101 @@
+import array
+import time
+
+import numpy as np
+import pandas as pd
+
+
+class _ComponentTimes(object):
+    """
+    The call count, wall times and CPU time of one component.
+    """
+
+    __slots__ = ('wall', 'cpu')
+
+    def __init__(self):
+        self.wall = array.array('d')
+        self.cpu = 0.0
+
+
+class ComponentTimer(object):
+    """
+    ComponentTimer accumulates the wall and CPU time spent in each
+    named component of a run, e.g. a data handler's update_bars or
+    a strategy's calculate_signals, along with the number of calls.
+
+    Components are timed by replacing them with the wrapper
+    returned by wrap, so a run that is not instrumented does not
+    pay for any of it. The wall time of every call is kept, in a
+    compact array, to give percentiles at the end.
+    """
+
+    def __init__(self):
+        self.components = {}
+        self.order = []
+
+    def _get_times(self, name):
+        if name not in self.components:
+            self.components[name] = _ComponentTimes()
+            self.order.append(name)
+        return self.components[name]
+
+    def wrap(self, name, func):
+        """
+        Returns a function calling func and recording its times
+        under name.
+
+        Parameters:
+        name - The name of the component.
+        func - The callable to time.
+        """
+        times = self._get_times(name)
+        wall = times.wall
+        wall_clock = time.time
+        cpu_clock = time.clock
+
+        def timed(*args, **kwargs):
+            cpu_start = cpu_clock()
+            start = wall_clock()
+            result = func(*args, **kwargs)
+            wall.append(wall_clock() - start)
+            times.cpu += cpu_clock() - cpu_start
+            return result
+        return timed
+
+    def record(self, name, seconds):
+        """
+        Records a wall time measured by the caller under name, e.g.
+        a latency spanning several components.
+
+        Parameters:
+        name - The name of the component.
+        seconds - The wall time in seconds.
+        """
+        self._get_times(name).wall.append(seconds)
+
+    def get_summary(self, percentiles=(50, 90, 99)):
+        """
+        Returns a DataFrame with a row per component, in the order
+        they were wrapped, of the call count, the total wall and CPU
+        seconds and the wall time percentiles of a call in
+        microseconds.
+
+        Parameters:
+        percentiles - The percentiles of the call times to give.
+        """
+        rows = []
+        for name in self.order:
+            times = self.components[name]
+            wall = np.frombuffer(times.wall, dtype=np.float64) if times.wall else np.empty(0)
+            row = [name, len(wall), wall.sum(), times.cpu]
+            if len(wall):
+                row += list(np.percentile(wall, percentiles) * 1e6)
+                row.append(wall.max() * 1e6)
+            else:
+                row += [np.nan] * (len(percentiles) + 1)
+            rows.append(row)
+        columns = (
+            ["component", "calls", "wall_sec", "cpu_sec"] +
+            ["p%g_us" % p for p in percentiles] + ["max_us"]
+        )
+        return pd.DataFrame(rows, columns=columns).set_index("component")
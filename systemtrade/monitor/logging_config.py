@@ -0,0 +1,39 @@
+import logging
+import sys
+
+
+LOGGER_NAME = "systemtrade"
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# The library only logs; an application configures the output with
+# configure_logging. Without it, nothing is printed.
+logging.getLogger(LOGGER_NAME).addHandler(logging.NullHandler())
+
+
+def configure_logging(level=logging.INFO, quiet=False, stream=None, fmt=LOG_FORMAT):
+    """
+    Sends the log records of the systemtrade package to a stream,
+    replacing any handler set up by an earlier call.
+
+    Levels are used as follows: DEBUG for every signal generated by
+    a strategy, INFO for the progress of a backtest and its results
+    and WARNING for recoverable problems.
+
+    Parameters:
+    level - The lowest level logged, e.g. logging.DEBUG.
+    quiet - If True, only log warnings and errors, e.g. in the
+        workers of a parameter sweep.
+    stream - The stream written to, sys.stdout by default.
+    fmt - The logging format string of the records.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in list(logger.handlers):
+        if getattr(handler, "_systemtrade_handler", False):
+            logger.removeHandler(handler)
+
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(logging.Formatter(fmt))
+    handler._systemtrade_handler = True
+    logger.addHandler(handler)
+    logger.setLevel(logging.WARNING if quiet else level)
+    return logger
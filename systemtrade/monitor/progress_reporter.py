@@ -0,0 +1,85 @@
+import datetime
+import logging
+import time
+
+
+class ProgressReporter(object):
+    """
+    ProgressReporter logs the progress of a run through its bars,
+    as the bar count, bars per second, the estimated time left and
+    the timestamp of the current bar.
+
+    It is called on every bar but logs at most once per interval
+    seconds. When its logger does not log INFO records, e.g. in
+    quiet mode, every update returns straight away.
+    """
+
+    def __init__(self, total=None, interval=5.0, logger=None, get_timestamp=None):
+        """
+        Initialises the reporter.
+
+        Parameters:
+        total - The number of bars of the run, if known, to give
+            the percentage done and the estimated time left.
+        interval - The least number of seconds between two reports.
+        logger - The logging.Logger to report to.
+        get_timestamp - Optional callable returning the timestamp of
+            the current bar, only called when a report is logged.
+        """
+        self.total = total
+        self.interval = interval
+        self.logger = logger or logging.getLogger("systemtrade.progress")
+        self.get_timestamp = get_timestamp
+        self.enabled = self.logger.isEnabledFor(logging.INFO)
+        self.count = 0
+        self.start_time = time.time()
+        self._next_report = self.start_time + interval
+
+    def update(self, count):
+        """
+        Records that count bars have been processed and logs the
+        progress if it is time to.
+        """
+        self.count = count
+        if not self.enabled:
+            return
+        now = time.time()
+        if now < self._next_report:
+            return
+        self._next_report = now + self.interval
+        self._report(now)
+
+    def _report(self, now):
+        """
+        Logs the progress so far.
+        """
+        timestamp = self.get_timestamp() if self.get_timestamp else None
+        elapsed = now - self.start_time
+        rate = self.count / elapsed if elapsed > 0 else 0.0
+        if self.total:
+            eta = "?"
+            if rate > 0:
+                remaining = max(self.total - self.count, 0) / rate
+                eta = str(datetime.timedelta(seconds=int(remaining)))
+            self.logger.info(
+                "Bar %d/%d (%.1f%%), %.0f bars/sec, ETA %s, at %s",
+                self.count, self.total, 100.0 * self.count / self.total,
+                rate, eta, timestamp
+            )
+        else:
+            self.logger.info(
+                "Bar %d, %.0f bars/sec, at %s", self.count, rate, timestamp
+            )
+
+    def finish(self):
+        """
+        Logs the number of bars processed and the overall rate.
+        """
+        if not self.enabled:
+            return
+        elapsed = time.time() - self.start_time
+        rate = self.count / elapsed if elapsed > 0 else 0.0
+        self.logger.info(
+            "Processed %d bars in %.2f seconds, %.0f bars/sec",
+            self.count, elapsed, rate
+        )
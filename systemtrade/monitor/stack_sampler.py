@@ -0,0 +1,62 @@
+import collections
+import os.path
+import signal
+
+
+class StackSampler(object):
+    """
+    StackSampler is a statistical profiler which records the call
+    stack of the main thread at a fixed interval of CPU time,
+    using the SIGPROF timer, and writes the samples in the folded
+    stack format read by flame graph tools such as flamegraph.pl
+    and speedscope: one line per distinct stack, its frames from
+    the root down separated by semicolons, then the sample count.
+
+    It only works in the main thread of a Unix process.
+    """
+
+    def __init__(self, interval=0.001):
+        """
+        Initialises the sampler.
+
+        Parameters:
+        interval - The seconds of CPU time between two samples.
+        """
+        self.interval = interval
+        self.samples = collections.Counter()
+        self._previous_handler = None
+
+    def _sample(self, signum, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append("%s (%s:%d)" % (
+                code.co_name, os.path.basename(code.co_filename), code.co_firstlineno
+            ))
+            frame = frame.f_back
+        self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        """
+        Starts taking samples.
+        """
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        """
+        Stops taking samples.
+        """
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+
+    def write(self, path):
+        """
+        Writes the samples to a file in the folded stack format.
+
+        Parameters:
+        path - The path of the file.
+        """
+        with open(path, "w") as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write("%s %d\n" % (stack, count))
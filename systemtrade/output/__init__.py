@@ -0,0 +1,6 @@
+#
+from output_sink import OutputSink
+from null_output_sink import NullOutputSink
+from csv_output_sink import CSVOutputSink
+from compressed_output_sink import CompressedOutputSink
+from background_writer import BackgroundWriter
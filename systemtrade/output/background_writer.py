@@ -0,0 +1,87 @@
+import logging
+import Queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundWriter(object):
+    """
+    BackgroundWriter writes the results of backtests to their
+    OutputSinks on a separate thread, so the next backtest can
+    start while the last one's reports are still being written.
+
+    One writer may be shared by any number of backtests. Call
+    close once they are done to wait for the pending writes.
+    """
+
+    def __init__(self, max_pending=0):
+        """
+        Initialises the writer and starts its thread.
+
+        Parameters:
+        max_pending - The most writes that may wait at a time,
+            after which submit blocks. Unbounded if 0.
+        """
+        self._jobs = Queue.Queue(max_pending)
+        self._errors = []
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="BackgroundWriter")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def submit(self, sink, equity_curve, stats):
+        """
+        Queues the results of a backtest to be written to a sink.
+        The equity curve must not be changed afterwards.
+
+        Parameters:
+        sink - The OutputSink to write to.
+        equity_curve - The equity curve DataFrame of the Portfolio.
+        stats - The list of (name, value) summary statistics.
+        """
+        if self._closed:
+            raise ValueError("BackgroundWriter is closed.")
+        self._jobs.put((sink, equity_curve, stats))
+
+    def _run(self):
+        """
+        Writes the queued results until the writer is closed.
+        """
+        while True:
+            job = self._jobs.get()
+            try:
+                if job is None:
+                    return
+                sink, equity_curve, stats = job
+                try:
+                    sink.write(equity_curve, stats)
+                except Exception as e:
+                    logger.exception("Could not write results to %s", sink)
+                    self._errors.append(e)
+            finally:
+                self._jobs.task_done()
+
+    def flush(self):
+        """
+        Waits until every queued write is done.
+        """
+        self._jobs.join()
+        self._raise_errors()
+
+    def close(self):
+        """
+        Waits for the queued writes and stops the thread. Raises
+        the first error of any write that failed.
+        """
+        if not self._closed:
+            self._closed = True
+            self._jobs.put(None)
+            self._thread.join()
+        self._raise_errors()
+
+    def _raise_errors(self):
+        if self._errors:
+            error = self._errors[0]
+            del self._errors[:]
+            raise error
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from output_sink import OutputSink, _make_parent_dir
+
+class CompressedOutputSink(OutputSink):
+    """
+    CompressedOutputSink writes the equity curve and summary
+    statistics to a single compressed NumPy .npz file, storing
+    each column as its own array, so it is smaller and much
+    quicker to write and read back than CSV.
+
+    The timestamps are stored as int64 nanoseconds under the
+    'datetime' key, each column under 'column:<name>' and the
+    statistics as (name, value) string pairs under 'stats'. Use
+    read to load a file back.
+    """
+
+    def __init__(self, path="equity.npz"):
+        """
+        Initialises the sink.
+
+        Parameters:
+        path - The path of the .npz file.
+        """
+        self.path = path
+
+    def write(self, equity_curve, stats):
+        """
+        Writes the compressed results file.
+        """
+        arrays = {
+            'datetime': pd.DatetimeIndex(equity_curve.index).asi8,
+            'columns': np.array(list(equity_curve.columns)),
+            'stats': np.array(stats, dtype=str).reshape(len(stats), 2),
+        }
+        for column in equity_curve.columns:
+            arrays['column:%s' % column] = equity_curve[column].values
+        _make_parent_dir(self.path)
+        with open(self.path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+
+    @staticmethod
+    def read(path):
+        """
+        Reads a file written by CompressedOutputSink.
+
+        Parameters:
+        path - The path of the .npz file.
+
+        Returns:
+        equity_curve, stats - The equity curve DataFrame and the
+            list of (name, value) summary statistics.
+        """
+        arrays = np.load(path)
+        try:
+            columns = list(arrays['columns'])
+            index = pd.DatetimeIndex(arrays['datetime'], name='datetime')
+            equity_curve = pd.DataFrame(
+                dict((c, arrays['column:%s' % c]) for c in columns),
+                index=index, columns=columns
+            )
+            stats = [tuple(pair) for pair in arrays['stats'].tolist()]
+        finally:
+            arrays.close()
+        return equity_curve, stats
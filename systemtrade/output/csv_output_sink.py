@@ -0,0 +1,34 @@
+import csv
+
+from output_sink import OutputSink, _make_parent_dir
+
+class CSVOutputSink(OutputSink):
+    """
+    CSVOutputSink writes the equity curve to a CSV file and,
+    optionally, the summary statistics to another.
+    """
+
+    def __init__(self, path="equity.csv", stats_path=None):
+        """
+        Initialises the sink.
+
+        Parameters:
+        path - The path of the equity curve CSV file.
+        stats_path - Optional path of a CSV file of the summary
+            statistics, as name,value rows.
+        """
+        self.path = path
+        self.stats_path = stats_path
+
+    def write(self, equity_curve, stats):
+        """
+        Writes the equity curve and statistics CSV files.
+        """
+        _make_parent_dir(self.path)
+        equity_curve.to_csv(self.path)
+        if self.stats_path is not None:
+            _make_parent_dir(self.stats_path)
+            with open(self.stats_path, "wb") as f:
+                writer = csv.writer(f)
+                writer.writerow(["name", "value"])
+                writer.writerows(stats)
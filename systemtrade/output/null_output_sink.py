@@ -0,0 +1,14 @@
+from output_sink import OutputSink
+
+class NullOutputSink(OutputSink):
+    """
+    NullOutputSink discards the results, for runs such as
+    parameter sweeps where only the returned statistics are
+    wanted.
+    """
+
+    def write(self, equity_curve, stats):
+        """
+        Does nothing.
+        """
+        pass
@@ -0,0 +1,42 @@
+import os
+import os.path
+
+from abc import ABCMeta, abstractmethod
+
+class OutputSink(object):
+    """
+    OutputSink is an abstract base class for the destinations of
+    the results of a backtest, i.e. its equity curve and summary
+    statistics.
+
+    Each sink is given the paths to write to when created, so
+    backtests run side by side do not overwrite each other's
+    results.
+    """
+
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def write(self, equity_curve, stats):
+        """
+        Writes the results of a backtest.
+
+        Parameters:
+        equity_curve - The equity curve DataFrame of the Portfolio.
+        stats - The list of (name, value) summary statistics.
+        """
+        raise NotImplementedError("Should implement write()")
+
+
+def _make_parent_dir(path):
+    """
+    Creates the directory a file is to be written to if missing.
+    """
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError:
+            # Created by another process in the meantime
+            if not os.path.isdir(directory):
+                raise
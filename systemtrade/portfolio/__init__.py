@@ -1,3 +1,5 @@
 #
+from ledger import Ledger
+from online_statistics import OnlineStatistics
 from portfolio import Portfolio
 from equal_portfolio import EqualWeightedPortfolio
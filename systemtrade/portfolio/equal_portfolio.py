@@ -31,7 +31,8 @@ class EqualWeightedPortfolio(Portfolio):
         initial_capital - The starting capital in USD.
         """
         super(EqualWeightedPortfolio, self).__init__(
-            bars, events, start_date, periods, initial_capital
+            bars, events, start_date, periods, initial_capital,
+            strategy_ids=range(1, num_strats + 1)
         )
         self.num_strats = num_strats
         self.port_split = 1.0/num_strats
@@ -54,20 +55,22 @@ class EqualWeightedPortfolio(Portfolio):
         cash = self.current_holdings['cash']
         mkt_price = self.bars.get_latest_bar_value(symbol, "close")
         allocation = 100
+        strategy_id = signal.strategy_id
 
-        mkt_quantity = floor(allocation * strength)
-        cur_quantity = self.current_positions[symbol]
+        # Each strategy trades its equal share of the allocation
+        mkt_quantity = floor(allocation * strength * self.port_split)
+        cur_quantity = self.get_strategy_position(strategy_id, symbol)
         order_type = 'MKT'
 
         if direction == 'LONG' and cur_quantity == 0:
-            order = OrderEvent(symbol, order_type, mkt_quantity, 'BUY')
+            order = OrderEvent(symbol, order_type, mkt_quantity, 'BUY', strategy_id)
         if direction == 'SHORT' and cur_quantity == 0:
-            order = OrderEvent(symbol, order_type, mkt_quantity, 'SELL')   
+            order = OrderEvent(symbol, order_type, mkt_quantity, 'SELL', strategy_id)
     
         if direction == 'EXIT' and cur_quantity > 0:
-            order = OrderEvent(symbol, order_type, abs(cur_quantity), 'SELL')
+            order = OrderEvent(symbol, order_type, abs(cur_quantity), 'SELL', strategy_id)
         if direction == 'EXIT' and cur_quantity < 0:
-            order = OrderEvent(symbol, order_type, abs(cur_quantity), 'BUY')
+            order = OrderEvent(symbol, order_type, abs(cur_quantity), 'BUY', strategy_id)
         return order
   
     def update_signal(self, event):
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+
+class Ledger(object):
+    """
+    Ledger records one row of float64 values per bar, e.g. the
+    positions or holdings of a portfolio, in a 2-D NumPy array
+    indexed by row number, along with the int64 timestamp of
+    each row in nanoseconds since the epoch.
+
+    The array is allocated up front when the number of rows is
+    known, and otherwise grown in chunks, so recording a row does
+    not allocate any Python objects. The DataFrame is only built
+    once, by to_frame.
+    """
+
+    def __init__(self, columns, capacity=None, chunk_size=4096):
+        """
+        Initialises the empty ledger.
+
+        Parameters:
+        columns - The names of the columns, in order.
+        capacity - The expected number of rows, if known.
+        chunk_size - The number of rows allocated at a time when
+            the capacity is not known or turns out too small.
+        """
+        self.columns = list(columns)
+        self.column_index = dict((c, i) for i, c in enumerate(self.columns))
+        self.chunk_size = chunk_size
+        rows = capacity if capacity is not None else chunk_size
+        self.values = np.zeros((max(rows, 1), len(self.columns)), dtype=np.float64)
+        self.timestamps = np.zeros(max(rows, 1), dtype=np.int64)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        """
+        Enlarges the arrays by at least one chunk of rows.
+        """
+        rows = len(self.timestamps) + max(self.chunk_size, len(self.timestamps) // 2)
+        values = np.zeros((rows, len(self.columns)), dtype=np.float64)
+        values[:self.count] = self.values[:self.count]
+        timestamps = np.zeros(rows, dtype=np.int64)
+        timestamps[:self.count] = self.timestamps[:self.count]
+        self.values = values
+        self.timestamps = timestamps
+
+    def append(self, timestamp):
+        """
+        Adds a row and returns it as a writable view for the caller
+        to fill in.
+
+        Parameters:
+        timestamp - The row timestamp in nanoseconds since the epoch.
+        """
+        if self.count == len(self.timestamps):
+            self._grow()
+        self.timestamps[self.count] = timestamp
+        self.count += 1
+        return self.values[self.count - 1]
+
+    def to_frame(self):
+        """
+        Returns the recorded rows as a DataFrame indexed by datetime.
+        """
+        index = pd.DatetimeIndex(self.timestamps[:self.count], name='datetime')
+        return pd.DataFrame(
+            self.values[:self.count].copy(), index=index, columns=self.columns
+        )
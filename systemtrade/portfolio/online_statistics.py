@@ -0,0 +1,98 @@
+import numpy as np
+
+
+class OnlineStatistics(object):
+    """
+    OnlineStatistics keeps the performance statistics of an
+    equity curve up to date as each bar's total is added, in
+    constant time and memory per bar, so they are available
+    while a backtest is still running.
+
+    The definitions follow create_summary_stats: returns are
+    the percentage change of the total, the equity curve is
+    their cumulative product, the drawdown is measured from a
+    High Water Mark starting at zero and the duration counts
+    the bars since the curve was last at its High Water Mark.
+    The mean and variance of the returns use Welford's method.
+    """
+
+    def __init__(self, initial_capital, periods=252):
+        """
+        Initialises the statistics at the start of the curve.
+
+        Parameters:
+        initial_capital - The total of the portfolio before the first bar.
+        periods - Daily (252), Hourly (252*6.5), Minutely(252*6.5*60) etc.
+        """
+        self.periods = periods
+        self.total = initial_capital
+        self.equity = 1.0
+        self.count = 0
+        self.mean_return = 0.0
+        self._sum_squares = 0.0
+
+        self.high_water_mark = 0.0
+        self.drawdown = 0.0
+        self.max_drawdown = 0.0
+        self.drawdown_duration = None
+        self.max_drawdown_duration = None
+
+    def update(self, total):
+        """
+        Adds the total value of the portfolio at the latest bar.
+        A missing total is treated as unchanged.
+
+        Parameters:
+        total - The total value of the portfolio.
+        """
+        if np.isnan(total):
+            total = self.total
+        ret = total / self.total - 1.0
+        self.total = total
+        self.equity *= (1.0 + ret)
+
+        self.count += 1
+        delta = ret - self.mean_return
+        self.mean_return += delta / self.count
+        self._sum_squares += delta * (ret - self.mean_return)
+
+        self.high_water_mark = max(self.high_water_mark, self.equity)
+        self.drawdown = self.high_water_mark - self.equity
+        self.max_drawdown = max(self.max_drawdown, self.drawdown)
+        if self.drawdown == 0:
+            self.drawdown_duration = 0
+        elif self.drawdown_duration is not None:
+            self.drawdown_duration += 1
+        if self.drawdown_duration is not None:
+            self.max_drawdown_duration = max(
+                self.max_drawdown_duration, self.drawdown_duration
+            )
+
+    @property
+    def variance(self):
+        """
+        The population variance of the returns so far.
+        """
+        if self.count == 0:
+            return np.nan
+        return self._sum_squares / self.count
+
+    @property
+    def sharpe_ratio(self):
+        """
+        The annualised Sharpe ratio of the returns so far.
+        """
+        std = np.sqrt(self.variance)
+        if not std > 0:
+            return np.nan
+        return np.sqrt(self.periods) * self.mean_return / std
+
+    def get_summary_stats(self):
+        """
+        Returns the statistics so far as a list of (name, value)
+        pairs, formatted as by create_summary_stats.
+        """
+        return [("Total Return", "%0.2f%%" % ((self.equity - 1.0) * 100.0)),
+                ("Sharpe Ratio", "%0.2f" % self.sharpe_ratio),
+                ("Max Drawdown", "%0.2f%%" % (self.max_drawdown * 100.0)),
+                ("Drawdown Duration", "%d" % (self.max_drawdown_duration or 0))]
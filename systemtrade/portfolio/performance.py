@@ -2,6 +2,23 @@ import numpy as np
 import pandas as pd
 
 
+def create_periods(periods):
+    """
+    Returns the number of periods in a year for a bar resolution.
+
+    Parameters:
+    periods - D, H, M or S depending on daily, hourly, minutely or secondly.
+    """
+    # Days, hours, minutes or seconds
+    if periods == "D":
+        return 252
+    elif periods == "H":
+        return 252*6.5
+    elif periods == "M":
+        return 252*6.5*60
+    elif periods == "S":
+        return 252*6.5*60*60
+
 def create_cagr(equity, periods=252):
     """
     Calculates the Compound Annual Growth Rate (CAGR)
@@ -27,6 +44,79 @@ def create_sharpe_ratio(returns, periods=252):
     """
     return np.sqrt(periods) * (np.mean(returns)) / np.std(returns)
 
+def create_sortino_ratio(returns, periods=252):
+    """
+    Create the Sortino ratio for the strategy, based on a 
+    benchmark of zero. Only returns below zero count towards
+    the deviation.
+
+    Parameters:
+    returns - A pandas Series representing period percentage returns.
+    periods - Daily (252), Hourly (252*6.5), Minutely(252*6.5*60) etc.
+    """
+    downside = np.sqrt((returns.clip(upper=0.0)**2).mean())
+    if downside == 0:
+        return np.nan
+    return np.sqrt(periods) * (np.mean(returns)) / downside
+
+def create_calmar_ratio(cagr, max_dd):
+    """
+    Create the Calmar ratio, the CAGR over the largest
+    peak-to-trough drawdown.
+
+    Parameters:
+    cagr - The Compound Annual Growth Rate.
+    max_dd - The maximum drawdown of the equity curve.
+    """
+    if max_dd == 0:
+        return np.nan
+    return cagr / max_dd
+
+def create_rolling_sharpe_ratio(returns, window, periods=252):
+    """
+    Create the Sharpe ratio over a rolling window of bars, on
+    the same basis as create_sharpe_ratio.
+
+    Parameters:
+    returns - A pandas Series representing period percentage returns.
+    window - The number of bars in each window.
+    periods - Daily (252), Hourly (252*6.5), Minutely(252*6.5*60) etc.
+
+    Returns:
+    A pandas Series, NaN until the first full window.
+    """
+    rolling = returns.rolling(window)
+    return np.sqrt(periods) * rolling.mean() / rolling.std(ddof=0)
+
+def create_exposure(positions):
+    """
+    Calculates the fraction of bars with a position open in
+    at least one symbol.
+
+    Parameters:
+    positions - A pandas DataFrame of the quantity held of each symbol.
+    """
+    return (positions.values != 0).any(axis=1).mean()
+
+def create_turnover(positions, prices, equity, periods=252):
+    """
+    Calculates the annualised turnover, the value traded per
+    year as a multiple of the average equity. The trades of a
+    bar are the change in positions to the next bar, valued at
+    the bar's price.
+
+    Parameters:
+    positions - A pandas DataFrame of the quantity held of each symbol.
+    prices - A pandas DataFrame of the price of each symbol, in
+        the same layout as positions.
+    equity - A pandas Series of the total value of the portfolio.
+    periods - Daily (252), Hourly (252*6.5), Minutely(252*6.5*60) etc.
+    """
+    quantities = positions.values
+    traded = np.abs(np.diff(quantities, axis=0)) * prices.values[:-1]
+    years = len(equity)/float(periods)
+    return np.nansum(traded) / np.mean(equity) / years
+
 def create_drawdowns(pnl):
     """
     Calculate the largest peak-to-trough drawdown of the PnL curve
@@ -39,19 +129,67 @@ def create_drawdowns(pnl):
     Returns:
     drawdown, duration - Highest peak-to-trough drawdown and duration.
     """
+    values = pnl.values.astype(np.float64)
+    bars = np.arange(len(values))
+
+    # The High Water Mark starts at zero and ignores missing values
+    hwm = values.copy()
+    hwm[:1] = 0.0
+    hwm = np.fmax.accumulate(hwm)
 
-    # Calculate the cumulative returns curve 
-    # and set up the High Water Mark
-    hwm = [0]
+    drawdown = hwm - values
+    drawdown[:1] = np.nan
 
-    # Create the drawdown and duration series
-    idx = pnl.index
-    drawdown = pd.Series(index = idx)
-    duration = pd.Series(index = idx)
+    # The duration counts the bars since the curve was last at its
+    # High Water Mark, and is undefined before it first gets there
+    last_peak = np.maximum.accumulate(np.where(drawdown == 0, bars, -1))
+    duration = np.where(last_peak >= 0, bars - last_peak, np.nan)
 
-    # Loop over the index range
-    for t in range(1, len(idx)):
-        hwm.append(max(hwm[t-1], pnl[t]))
-        drawdown[t]= (hwm[t]-pnl[t])
-        duration[t]= (0 if drawdown[t] == 0 else duration[t-1]+1)
+    drawdown = pd.Series(drawdown, index=pnl.index)
+    duration = pd.Series(duration, index=pnl.index)
     return drawdown, drawdown.max(), duration.max()
+
+def create_summary_stats(equity_curve, periods=252, positions=None, prices=None):
+    """
+    Creates a list of summary statistics from an equity curve.
+    The exposure and turnover are only included if the positions
+    and prices are given.
+
+    Parameters:
+    equity_curve - A pandas DataFrame with 'returns', 'equity_curve'
+        and 'total' columns, as built by the Portfolio.
+    periods - Daily (252), Hourly (252*6.5), Minutely(252*6.5*60) etc.
+    positions - Optional DataFrame of the quantity held of each
+        symbol, row for row with the equity curve.
+    prices - Optional DataFrame of the price of each symbol, in
+        the same layout as positions.
+
+    Returns:
+    stats, drawdown - The list of (name, value) pairs and the
+        drawdown Series.
+    """
+    total_return = equity_curve['equity_curve'][-1]
+    returns = equity_curve['returns']
+    pnl = equity_curve['equity_curve']
+
+    cagr = create_cagr(pnl, periods=periods)
+    sharpe_ratio = create_sharpe_ratio(returns, periods=periods)
+    drawdown, max_dd, dd_duration = create_drawdowns(pnl)
+    sortino_ratio = create_sortino_ratio(returns, periods=periods)
+    calmar_ratio = create_calmar_ratio(cagr, max_dd)
+
+    stats = [("Total Return", "%0.2f%%" % ((total_return - 1.0) * 100.0)),
+             ("CAGR", "%0.2f%%" % (cagr * 100.0)),
+             ("Sharpe Ratio", "%0.2f" % sharpe_ratio),
+             ("Max Drawdown", "%0.2f%%" % (max_dd * 100.0)),
+             ("Drawdown Duration", "%d" % dd_duration),
+             ("Sortino Ratio", "%0.2f" % sortino_ratio),
+             ("Calmar Ratio", "%0.2f" % calmar_ratio)]
+    if positions is not None and prices is not None:
+        exposure = create_exposure(positions)
+        turnover = create_turnover(
+            positions, prices, equity_curve['total'], periods=periods
+        )
+        stats += [("Exposure", "%0.2f%%" % (exposure * 100.0)),
+                  ("Turnover", "%0.2f" % turnover)]
+    return stats, drawdown
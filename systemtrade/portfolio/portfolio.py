@@ -1,11 +1,12 @@
+import numpy as np
 import pandas as pd
 
 from math import floor
 
 from ..event import OrderEvent
-from performance import (
-    create_cagr, create_sharpe_ratio, create_drawdowns
-)
+from ledger import Ledger
+from online_statistics import OnlineStatistics
+from performance import create_periods, create_summary_stats
 
 
 class Portfolio(object):
@@ -21,11 +22,19 @@ class Portfolio(object):
     holdings value of each symbol for a particular 
     time-index, as well as the percentage change in 
     portfolio total across bars.
+
+    Both are recorded bar by bar into NumPy Ledgers and only
+    turned into DataFrames once the backtest is over. The
+    OnlineStatistics of the total are kept up to date every bar.
+
+    When several strategies trade through the portfolio, the
+    positions, cash flows and P&L of each are also kept apart by
+    the strategy_id of their signals, orders and fills.
     """
 
     def __init__(
         self, bars, events, start_date, 
-        periods="D", initial_capital=100000.0
+        periods="D", initial_capital=100000.0, strategy_ids=(1,)
     ):
         """
         Initialises the portfolio with bars and an event queue. 
@@ -38,6 +47,8 @@ class Portfolio(object):
         start_date - The start date (bar) of the portfolio.
         periods - D, H, M or S depending on daily, hourly, minutely or secondly.
         initial_capital - The starting capital in USD.
+        strategy_ids - The IDs of the strategies trading through
+            the portfolio.
         """
         self.bars = bars
         self.events = events
@@ -45,33 +56,93 @@ class Portfolio(object):
         self.start_date = start_date
         self.periods = periods
         self.initial_capital = initial_capital
+        self.strategy_ids = list(strategy_ids)
         
         self.all_positions = self.construct_all_positions()
         self.current_positions = dict( (k,v) for k, v in [(s, 0) for s in self.symbol_list] )
+        self._position_array = np.zeros(len(self.symbol_list))
+        self._symbol_order = dict((s, i) for i, s in enumerate(self.symbol_list))
 
         self.all_holdings = self.construct_all_holdings()
         self.current_holdings = self.construct_current_holdings()
+        self.all_prices = self.construct_all_prices()
+        self.online_stats = OnlineStatistics(
+            initial_capital, periods=create_periods(periods)
+        )
+
+        # Positions and cash flows of each strategy, in the order of
+        # strategy_ids and symbol_list
+        self._strategy_order = dict((k, i) for i, k in enumerate(self.strategy_ids))
+        self.strategy_positions = np.zeros((len(self.strategy_ids), len(self.symbol_list)))
+        self.strategy_cash = np.zeros(len(self.strategy_ids))
+        self.all_strategy_pnl = self.construct_all_strategy_pnl()
+
+        # Ledger columns of the symbols, in symbol_list order
+        self._position_columns = np.array(
+            [self.all_positions.column_index[s] for s in self.symbol_list],
+            dtype=np.intp
+        )
+        self._holding_columns = np.array(
+            [self.all_holdings.column_index[s] for s in self.symbol_list],
+            dtype=np.intp
+        )
+
+        # Layout of the bars block of the last MarketEvent
+        self._bars_block = None
+        self._symbol_rows = None
+        self._close_field = None
+
+    def _get_ledger_capacity(self):
+        """
+        Returns the number of rows the ledgers will need if the
+        data handler knows its number of bars up front, else None.
+        The start date and the repeated last bar add two rows.
+        """
+        bar_store = getattr(self.bars, 'bar_store', None)
+        if bar_store is None:
+            return None
+        return len(bar_store) + 2
 
     def construct_all_positions(self):
         """
-        Constructs the positions list using the start_date
+        Constructs the positions ledger using the start_date
         to determine when the time index will begin.
         """
-        d = dict( (k,v) for k, v in [(s, 0) for s in self.symbol_list] )
-        d['datetime'] = self.start_date
-        return [d]
+        ledger = Ledger(sorted(self.symbol_list), self._get_ledger_capacity())
+        ledger.append(pd.Timestamp(self.start_date).value)
+        return ledger
 
     def construct_all_holdings(self):
         """
-        Constructs the holdings list using the start_date
+        Constructs the holdings ledger using the start_date
         to determine when the time index will begin.
         """
-        d = dict( (k,v) for k, v in [(s, 0.0) for s in self.symbol_list] )
-        d['datetime'] = self.start_date
-        d['cash'] = self.initial_capital
-        d['commission'] = 0.0
-        d['total'] = self.initial_capital
-        return [d]
+        ledger = Ledger(
+            sorted(list(self.symbol_list) + ['cash', 'commission', 'total']),
+            self._get_ledger_capacity()
+        )
+        row = ledger.append(pd.Timestamp(self.start_date).value)
+        row[ledger.column_index['cash']] = self.initial_capital
+        row[ledger.column_index['total']] = self.initial_capital
+        return ledger
+
+    def construct_all_prices(self):
+        """
+        Constructs the ledger of the closing prices each bar is
+        marked at, with no prices on the start_date.
+        """
+        ledger = Ledger(sorted(self.symbol_list), self._get_ledger_capacity())
+        ledger.append(pd.Timestamp(self.start_date).value)
+        return ledger
+
+    def construct_all_strategy_pnl(self):
+        """
+        Constructs the ledger of the P&L of each strategy, with a
+        column per strategy ID, starting from zero on the start_date.
+        """
+        ledger = Ledger(self.strategy_ids, self._get_ledger_capacity())
+        ledger.append(pd.Timestamp(self.start_date).value)
+        return ledger
 
     def construct_current_holdings(self):
         """
@@ -90,39 +161,58 @@ class Portfolio(object):
         market data bar. This reflects the PREVIOUS bar, i.e. all
         current market data at this stage is known (OHLCV).
 
-        Makes use of a MarketEvent from the events queue.
+        Makes use of a MarketEvent from the events queue, which
+        carries the latest bar.
         """
-        bars = {}
-        for sym in self.symbol_list:
-            bars[sym] = self.bars.get_latest_bar(sym)
+        if event.bar_index is None:
+            return
+
+        bars = event.bars
+        if bars is not self._bars_block:
+            self._bars_block = bars
+            self._symbol_rows = np.array(
+                [bars.symbol_index[s] for s in self.symbol_list], dtype=np.intp
+            )
+            self._close_field = bars.field_index["close"]
+        timestamp = bars.timestamps[event.bar_index]
 
         # Update positions
         # ================
-        dp = dict( (k,v) for k, v in [(s, 0) for s in self.symbol_list] )
-        dp['datetime'] = bars[self.symbol_list[0]][0]
-
-        for s in self.symbol_list:
-            dp[s] = self.current_positions[s]
+        dp = self.all_positions.append(timestamp)
+        dp[self._position_columns] = self._position_array
 
-        # Append the current positions
-        self.all_positions.append(dp)
+        # Update prices
+        # =============
+        closes = bars.values[self._close_field, self._symbol_rows, event.bar_index]
+        dc = self.all_prices.append(timestamp)
+        dc[self._position_columns] = closes
 
         # Update holdings
         # ===============
-        dh = dict( (k,v) for k, v in [(s, 0) for s in self.symbol_list] )
-        dh['datetime'] = bars[self.symbol_list[0]][0]
-        dh['cash'] = self.current_holdings['cash']
-        dh['commission'] = self.current_holdings['commission']
-        dh['total'] = self.current_holdings['cash']
-
-        for s in self.symbol_list:
-            # Approximation to the real value
-            market_value = self.current_positions[s] * bars[s][1][3]
-            dh[s] = market_value
-            dh['total'] += market_value
-
-        # Append the current holdings
-        self.all_holdings.append(dh)
+        # Approximation to the real value
+        market_value = self._position_array * closes
+
+        # The total is summed symbol by symbol onto the cash, in order
+        totals = np.empty(len(market_value) + 1)
+        totals[0] = self.current_holdings['cash']
+        totals[1:] = market_value
+
+        columns = self.all_holdings.column_index
+        dh = self.all_holdings.append(timestamp)
+        dh[columns['cash']] = self.current_holdings['cash']
+        dh[columns['commission']] = self.current_holdings['commission']
+        dh[columns['total']] = np.add.accumulate(totals)[-1]
+        dh[self._holding_columns] = market_value
+
+        # Update the running statistics
+        self.online_stats.update(dh[columns['total']])
+
+        # Update the P&L of each strategy
+        # ===============================
+        # Symbols without a price yet cannot be held
+        marks = np.where(np.isnan(closes), 0.0, closes)
+        self.all_strategy_pnl.append(timestamp)[:] = \
+            self.strategy_cash + np.dot(self.strategy_positions, marks)
 
     # ======================
     # FILL/POSITION HANDLING
@@ -145,6 +235,14 @@ class Portfolio(object):
 
         # Update positions list with new quantities
         self.current_positions[fill.symbol] += fill_dir*fill.quantity
+        self._position_array[self._symbol_order[fill.symbol]] = \
+            self.current_positions[fill.symbol]
+
+        # Update the positions of the strategy the fill was for
+        if fill.strategy_id in self._strategy_order:
+            self.strategy_positions[
+                self._strategy_order[fill.strategy_id], self._symbol_order[fill.symbol]
+            ] += fill_dir*fill.quantity
 
     def update_holdings_from_fill(self, fill):
         """
@@ -168,6 +266,9 @@ class Portfolio(object):
         self.current_holdings['commission'] += (fill.commission * abs(cost))
         self.current_holdings['cash'] -= (cost + (fill.commission * abs(cost)))
         self.current_holdings['total'] -= (cost + (fill.commission * abs(cost)))
+        if fill.strategy_id in self._strategy_order:
+            self.strategy_cash[self._strategy_order[fill.strategy_id]] -= \
+                (cost + (fill.commission * abs(cost)))
 
     def update_fill(self, event):
         """
@@ -178,6 +279,22 @@ class Portfolio(object):
             self.update_positions_from_fill(event)
             self.update_holdings_from_fill(event)
 
+    def get_strategy_position(self, strategy_id, symbol):
+        """
+        Returns the quantity of a symbol held for a strategy, or
+        for the whole portfolio if the strategy is not one of its
+        strategy_ids.
+
+        Parameters:
+        strategy_id - The ID of the strategy.
+        symbol - The ticker symbol.
+        """
+        if strategy_id not in self._strategy_order:
+            return self.current_positions[symbol]
+        return self.strategy_positions[
+            self._strategy_order[strategy_id], self._symbol_order[symbol]
+        ]
+
     def generate_naive_order(self, signal):
         """
         Simply files an Order object as a constant quantity
@@ -193,19 +310,21 @@ class Portfolio(object):
         direction = signal.signal_type
         strength = signal.strength
 
+        strategy_id = signal.strategy_id
+
         mkt_quantity = floor(100 * strength)
-        cur_quantity = self.current_positions[symbol]
+        cur_quantity = self.get_strategy_position(strategy_id, symbol)
         order_type = 'MKT'
 
         if direction == 'LONG' and cur_quantity == 0:
-            order = OrderEvent(symbol, order_type, mkt_quantity, 'BUY')
+            order = OrderEvent(symbol, order_type, mkt_quantity, 'BUY', strategy_id)
         if direction == 'SHORT' and cur_quantity == 0:
-            order = OrderEvent(symbol, order_type, mkt_quantity, 'SELL')   
+            order = OrderEvent(symbol, order_type, mkt_quantity, 'SELL', strategy_id)
     
         if direction == 'EXIT' and cur_quantity > 0:
-            order = OrderEvent(symbol, order_type, abs(cur_quantity), 'SELL')
+            order = OrderEvent(symbol, order_type, abs(cur_quantity), 'SELL', strategy_id)
         if direction == 'EXIT' and cur_quantity < 0:
-            order = OrderEvent(symbol, order_type, abs(cur_quantity), 'BUY')
+            order = OrderEvent(symbol, order_type, abs(cur_quantity), 'BUY', strategy_id)
         return order
 
     # ========================
@@ -215,46 +334,29 @@ class Portfolio(object):
     def create_equity_curve_dataframe(self):
         """
         Creates a pandas DataFrame from the all_holdings
-        list of dictionaries.
+        ledger.
         """
-        curve = pd.DataFrame(self.all_holdings)
-        curve.set_index('datetime', inplace=True)
+        curve = self.all_holdings.to_frame()
         curve['returns'] = curve['total'].pct_change()
         curve['equity_curve'] = (1.0+curve['returns']).cumprod()
         self.equity_curve = curve
 
+    def create_strategy_pnl_dataframe(self):
+        """
+        Creates a pandas DataFrame of the P&L of each strategy,
+        with a column per strategy ID, from the all_strategy_pnl
+        ledger. The P&L includes commission.
+        """
+        return self.all_strategy_pnl.to_frame()
+
     def output_summary_stats(self):
         """
         Creates a list of summary statistics for the portfolio.
         """
-        total_return = self.equity_curve['equity_curve'][-1]
-        returns = self.equity_curve['returns']
-        pnl = self.equity_curve['equity_curve']
-
-        # Days, hours, minutes or seconds
-        if self.periods == "D":
-            periods = 252
-        elif self.periods == "H":
-            periods = 252*6.5
-        elif self.periods == "M":
-            periods = 252*6.5*60
-        elif self.periods == "S":
-            periods = 252*6.5*60*60
-
-        cagr = create_cagr(pnl, periods=periods)
-        sharpe_ratio = create_sharpe_ratio(returns, periods=periods)
-        drawdown, max_dd, dd_duration = create_drawdowns(pnl)
-
-        stats = [("Total Return", "%0.2f%%" % ((total_return - 1.0) * 100.0)),
-                 ("CAGR", "%0.2f%%" % (cagr * 100.0)),
-                 ("Sharpe Ratio", "%0.2f" % sharpe_ratio),
-                 ("Max Drawdown", "%0.2f%%" % (max_dd * 100.0)),
-                 ("Drawdown Duration", "%d" % dd_duration)]
-
+        stats, drawdown = create_summary_stats(
+            self.equity_curve, periods=create_periods(self.periods),
+            positions=self.all_positions.to_frame(),
+            prices=self.all_prices.to_frame()
+        )
         self.equity_curve["drawdown"] = drawdown
-
-        # Output equity curve statistics
-        self.equity_curve.to_csv("equity.csv")
-
         return stats
-
@@ -5,4 +5,6 @@ from ema_cross_strategy import ExponentialMovingAverageCrossStrategy
 from channel_breakout_strategy import ChannelBreakoutStrategy
 from momentum_strategy import MomentumStrategy
 from macd_strategy import MACDStrategy
-from new_high_strategy import NewHighStrategy
\ No newline at end of file
+from new_high_strategy import NewHighStrategy
+from batch_strategy import BatchStrategy
+from batch_ma_cross_strategy import BatchMovingAverageCrossStrategy
\ No newline at end of file
@@ -0,0 +1,50 @@
+import numpy as np
+
+from batch_strategy import BatchStrategy
+
+class BatchMovingAverageCrossStrategy(BatchStrategy):
+    """
+    Carries out the Moving Average Crossover strategy of
+    SimpleMovingAverageCrossStrategy for every symbol at once,
+    computing the short and long simple moving averages of each
+    bar from a (symbols, long_window) block of closes.
+
+    A symbol is only traded once it has long_window closes
+    without a gap, and the averages are the exact means of each
+    window rather than running sums, so crossovers can differ
+    from SimpleMovingAverageCrossStrategy while it warms up and
+    on exact ties.
+    """
+
+    def __init__(self, bars, events, short_window=100, long_window=400):
+        """
+        Initialises the batch moving average cross strategy.
+
+        Parameters:
+        bars - The DataHandler object that provides bar information
+        events - The Event Queue object.
+        short_window - The short moving average lookback.
+        long_window - The long moving average lookback.
+        """
+        super(BatchMovingAverageCrossStrategy, self).__init__(
+            bars, events, long_window, field="close"
+        )
+        self.short_window = short_window
+        self.long_window = long_window
+
+    def calculate_batch_signals(self, block):
+        """
+        Enters where the short average is above the long average
+        and exits where it is below.
+
+        Parameters:
+        block - Read-only array shaped (symbols, lookback) of closes.
+        """
+        if block.shape[1] < self.long_window:
+            none = np.zeros(block.shape[0], dtype=bool)
+            return none, none
+        long_sma = block.mean(axis=1)
+        short_sma = block[:, -self.short_window:].mean(axis=1)
+        # Symbols with a missing close in the window have NaN averages
+        with np.errstate(invalid="ignore"):
+            return short_sma > long_sma, short_sma < long_sma
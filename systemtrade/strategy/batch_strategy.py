@@ -0,0 +1,139 @@
+import datetime
+import logging
+
+from abc import abstractmethod
+
+import numpy as np
+
+from ..event import SignalEvent
+from strategy import Strategy
+
+logger = logging.getLogger(__name__)
+
+class BatchStrategy(Strategy):
+    """
+    BatchStrategy is an abstract base class for strategies that
+    work on all symbols at once rather than one symbol at a time.
+
+    On every bar, calculate_batch_signals is handed a block of the
+    latest lookback values of a field, shaped (symbols, lookback),
+    and returns the entry and exit conditions of every symbol as
+    boolean arrays, computed with array operations. The base class
+    keeps the market state of each symbol and only sends signals
+    for the symbols whose state changes: LONG for a symbol out of
+    the market whose entry condition holds and EXIT for one in the
+    market whose exit condition holds.
+
+    The block is a read-only view into the data handler's bars
+    where the symbols are stored in order, so a bar costs a few
+    array operations however many symbols there are.
+    """
+
+    def __init__(self, bars, events, lookback, field="close"):
+        """
+        Initialises the batch strategy.
+
+        Parameters:
+        bars - The DataHandler object that provides bar information
+        events - The Event Queue object.
+        lookback - The number of bars in each block.
+        field - The bar field of the block, e.g. 'close'.
+        """
+        self.bars = bars
+        self.symbol_list = self.bars.symbol_list
+        self.events = events
+        self.lookback = lookback
+        self.field = field
+        self.max_lookback = lookback
+        self.last_bar_date = None
+
+        # Set to True if a symbol is in the market
+        self.bought = np.zeros(len(self.symbol_list), dtype=bool)
+
+        # Layout of the bars block of the last MarketEvent
+        self._bars_block = None
+        self._symbol_rows = None
+        self._field_index = None
+
+    @abstractmethod
+    def calculate_batch_signals(self, block):
+        """
+        Calculates the entry and exit conditions of every symbol
+        at the latest bar.
+
+        Parameters:
+        block - Read-only array shaped (symbols, lookback) of the
+            latest values of the field, oldest first. It has fewer
+            columns until lookback bars are available.
+
+        Returns:
+        entry, exit - Boolean arrays shaped (symbols,).
+        """
+        raise NotImplementedError("Should implement calculate_batch_signals()")
+
+    def _get_block(self, event):
+        """
+        Returns the block of the latest bars carried by a MarketEvent.
+        """
+        bars = event.bars
+        if bars is not self._bars_block:
+            self._bars_block = bars
+            rows = [bars.symbol_index[s] for s in self.symbol_list]
+            if rows == range(bars.values.shape[1]):
+                # A slice keeps the block a view
+                self._symbol_rows = slice(None)
+            else:
+                self._symbol_rows = np.array(rows, dtype=np.intp)
+            self._field_index = bars.field_index[self.field]
+
+        end = event.bar_index + 1
+        n = min(self.lookback, end, len(bars))
+        block = bars.values[self._field_index, self._symbol_rows, end - n:end]
+        block.flags.writeable = False
+        return block
+
+    def calculate_signals(self, event):
+        """
+        Calculates the entry and exit conditions of every symbol
+        from the latest block of bars and sends a signal for each
+        symbol entering or leaving the market.
+
+        Parameters
+        event - A MarketEvent object.
+        """
+        if event.type != 'MARKET' or event.bar_index is None:
+            return
+        bar_date = event.timeindex
+        if bar_date == self.last_bar_date:
+            return
+        self.last_bar_date = bar_date
+
+        entry, exit = self.calculate_batch_signals(self._get_block(event))
+        changed = np.flatnonzero(np.where(self.bought, exit, entry))
+        dt = datetime.datetime.utcnow()
+        for i in changed:
+            s = self.symbol_list[i]
+            if self.bought[i]:
+                logger.debug("SHORT: %s %s", s, bar_date)
+                self.events.put(SignalEvent(self.strategy_id, s, dt, 'EXIT', 1.0))
+            else:
+                logger.debug("LONG: %s %s", s, bar_date)
+                self.events.put(SignalEvent(self.strategy_id, s, dt, 'LONG', 1.0))
+        self.bought[changed] = ~self.bought[changed]
+
+    def calculate_vectorized_signals(self, bar_store):
+        """
+        Calculates the entry and exit conditions of every bar by
+        handing calculate_batch_signals each block in turn, so they
+        are exactly those of calculate_signals.
+
+        Parameters:
+        bar_store - The BarStore holding the full history.
+        """
+        values = bar_store.values[bar_store.field_index[self.field]]
+        entry = np.zeros(values.shape, dtype=bool)
+        exit = np.zeros(values.shape, dtype=bool)
+        for i in xrange(values.shape[1]):
+            block = values[:, max(0, i + 1 - self.lookback):i + 1]
+            entry[:, i], exit[:, i] = self.calculate_batch_signals(block)
+        return entry, exit
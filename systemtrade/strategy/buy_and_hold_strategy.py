@@ -1,3 +1,7 @@
+import datetime
+
+import numpy as np
+
 from ..event import SignalEvent
 from strategy import Strategy
 
@@ -21,6 +25,7 @@ class BuyAndHoldStrategy(Strategy):
         self.bars = bars
         self.symbol_list = self.bars.symbol_list
         self.events = events
+        self.max_lookback = 1
 
         # Once buy & hold signal is given, these are set to True
         self.bought = self._calculate_initial_bought()
@@ -47,10 +52,21 @@ class BuyAndHoldStrategy(Strategy):
         """
         if event.type == 'MARKET':
             for s in self.symbol_list:
-                bars = self.bars.get_latest_bars(s, N=1)
-                if bars is not None and bars != []:
+                if event.bar_index is not None:
                     if self.bought[s] == False:
                         # strategy ID, symbol, datetime, signal_type, strength
-                        signal = SignalEvent(1, s, bars[0][0], 'LONG', 1.0)
+                        signal = SignalEvent(self.strategy_id, s, datetime.datetime.utcnow(), 'LONG', 1.0)
                         self.events.put(signal)
                         self.bought[s] = True
+
+    def calculate_vectorized_signals(self, bar_store):
+        """
+        Enters every symbol on the first bar and never exits.
+
+        Parameters:
+        bar_store - The BarStore holding the full history.
+        """
+        shape = (len(bar_store.symbol_list), len(bar_store))
+        entry = np.zeros(shape, dtype=bool)
+        entry[:, :1] = True
+        return entry, np.zeros(shape, dtype=bool)
@@ -1,9 +1,14 @@
 import datetime
+import logging
 import numpy as np
 
 from ..event import SignalEvent
+from ..indicators import RollingMax, RollingMin
+from ..indicators import vectorized as vz
 from strategy import Strategy
 
+logger = logging.getLogger(__name__)
+
 
 class ChannelBreakoutStrategy(Strategy):
     """
@@ -12,7 +17,7 @@ class ChannelBreakoutStrategy(Strategy):
     are 20/20 periods respectively.
     """
 
-    def __init__(self, bars, events, high_window=20, low_window=20):
+    def __init__(self, bars, events, high_window=20, low_window=20, use_high_low=False):
         """
         Initialises the buy and hold strategy.
 
@@ -21,12 +26,25 @@ class ChannelBreakoutStrategy(Strategy):
         events - The Event Queue object.
         high_window - The high value lookback.
         low_window - The low value lookback.
+        use_high_low - If True, the channel is formed from the bar
+            highs and lows rather than from the closes.
         """
         self.bars = bars
         self.symbol_list = self.bars.symbol_list
         self.events = events
         self.high_window = high_window
         self.low_window = low_window
+        self.use_high_low = use_high_low
+        self.max_lookback = 1
+
+        # Channel of the previous bars, updated once per new bar
+        if self.use_high_low:
+            self.high_field, self.low_field = "high", "low"
+        else:
+            self.high_field, self.low_field = "close", "close"
+        self.high_max = self._calculate_initial_channel(RollingMax, self.high_window)
+        self.low_min = self._calculate_initial_channel(RollingMin, self.low_window)
+        self.last_bar_date = self._calculate_initial_bar_dates()
         
         # Set to True if a symbol is in the market
         self.bought = self._calculate_initial_bought()
@@ -51,6 +69,26 @@ class ChannelBreakoutStrategy(Strategy):
             first_signal[s] = True
         return first_signal
 
+    def _calculate_initial_channel(self, rolling_cls, window):
+        """
+        Creates a rolling extreme of the given class and window
+        for all symbols.
+        """
+        channel = {}
+        for s in self.symbol_list:
+            channel[s] = rolling_cls(window)
+        return channel
+
+    def _calculate_initial_bar_dates(self):
+        """
+        Adds keys to the last_bar_date dictionary for all symbols
+        and sets them to None.
+        """
+        last_bar_date = {}
+        for s in self.symbol_list:
+            last_bar_date[s] = None
+        return last_bar_date
+
     def calculate_signals(self, event):
         """
         Generates a new set of signals based on the Channel Breakout
@@ -62,28 +100,52 @@ class ChannelBreakoutStrategy(Strategy):
         """
         if event.type == 'MARKET':
             for s in self.symbol_list:
-                max_bar = max(self.high_window, self.low_window)
-                bars = self.bars.get_latest_bars_values(s, "close", N=max_bar+1)
-                bar_date = self.bars.get_latest_bar_datetime(s)
-                if bars is not None and bars != [] :
-                    prev_high_max = max(bars[:self.high_window])
-                    prev_low_min = min(bars[:self.low_window])
-                    curr_close = max(bars[-1:])
+                bar_date = event.timeindex
+                if bar_date != self.last_bar_date[s]:
+                    self.last_bar_date[s] = bar_date
+                    curr_close = event.get_latest_bar_value(s, "close")
+
+                    # The channel is formed by the bars before this one
+                    prev_high_max = self.high_max[s].value
+                    prev_low_min = self.low_min[s].value
+                    self.high_max[s].update(event.get_latest_bar_value(s, self.high_field))
+                    self.low_min[s].update(event.get_latest_bar_value(s, self.low_field))
 
                     symbol = s
                     dt = datetime.datetime.utcnow()
                     sig_dir = ""
 
-                    if len(bars) == max_bar+1:
+                    if prev_high_max is not None and prev_low_min is not None:
                         if curr_close > prev_high_max and self.bought[s] == "OUT":
-                            print "LONG: %s" % bar_date
+                            logger.debug("LONG: %s %s", s, bar_date)
                             sig_dir = 'LONG'
-                            signal = SignalEvent(1, symbol, dt, sig_dir, 1.0)
+                            signal = SignalEvent(self.strategy_id, symbol, dt, sig_dir, 1.0)
                             self.events.put(signal)
                             self.bought[s] = 'LONG'
                         elif curr_close < prev_low_min and self.bought[s] == "LONG":
-                            print "SHORT: %s" % bar_date
+                            logger.debug("SHORT: %s %s", s, bar_date)
                             sig_dir = 'EXIT'
-                            signal = SignalEvent(1, symbol, dt, sig_dir, 1.0)
+                            signal = SignalEvent(self.strategy_id, symbol, dt, sig_dir, 1.0)
                             self.events.put(signal)
-                            self.bought[s] = 'OUT'
\ No newline at end of file
+                            self.bought[s] = 'OUT'
+
+    def calculate_vectorized_signals(self, bar_store):
+        """
+        Vectorised form of calculate_signals.
+
+        Parameters:
+        bar_store - The BarStore holding the full history.
+        """
+        close = bar_store.values[bar_store.field_index["close"]]
+        high = bar_store.values[bar_store.field_index[self.high_field]]
+        low = bar_store.values[bar_store.field_index[self.low_field]]
+        prev_high_max = vz.shift(vz.rolling_max(high, self.high_window))
+        prev_low_min = vz.shift(vz.rolling_min(low, self.low_window))
+        ready = (
+            vz.available(close, self.high_window + 1) &
+            vz.available(close, self.low_window + 1)
+        )
+        with np.errstate(invalid="ignore"):
+            entry = ready & (close > prev_high_max)
+            exit = ready & (close < prev_low_min)
+        return entry, exit
@@ -1,9 +1,14 @@
 import datetime
+import logging
 import numpy as np
 
 from ..event import SignalEvent
+from ..indicators import EMA
+from ..indicators import vectorized as vz
 from strategy import Strategy
 
+logger = logging.getLogger(__name__)
+
 class ExponentialMovingAverageCrossStrategy(Strategy):
     """
     Carries out a basic Moving Average Crossover strategy with a
@@ -26,6 +31,12 @@ class ExponentialMovingAverageCrossStrategy(Strategy):
         self.events = events
         self.short_window = short_window
         self.long_window = long_window
+        self.max_lookback = 1
+
+        # Moving averages are updated once per new bar
+        self.short_ema = self._calculate_initial_averages(self.short_window)
+        self.long_ema = self._calculate_initial_averages(self.long_window)
+        self.last_bar_date = self._calculate_initial_bar_dates()
 
         # Set to True if a symbol is in the market
         self.bought = self._calculate_initial_bought()
@@ -40,25 +51,24 @@ class ExponentialMovingAverageCrossStrategy(Strategy):
             bought[s] = 'OUT'
         return bought
 
-    def _calculate_sma(self, data, window):
+    def _calculate_initial_averages(self, window):
         """
-        Calculate Simple Moveing Average
+        Creates a streaming EMA of the given window for all symbols.
         """
-        if len(data) < window:
-            return None
-        return sum(data[-window:]) / float(window)
+        averages = {}
+        for s in self.symbol_list:
+            averages[s] = EMA(window)
+        return averages
 
-    def _calculate_ema(self, data, window):
+    def _calculate_initial_bar_dates(self):
         """
-        Calculate Exponential Moveing Average
+        Adds keys to the last_bar_date dictionary for all symbols
+        and sets them to None.
         """
-        if len(data) < window * 2:
-            return None
-        c = 2.0 / float(window + 1)
-        current_ema = self._calculate_sma(data[-window * 2: -window], window)
-        for value in data[-window:]:
-            current_ema = (c * value) + ((1 - c) * current_ema)
-        return current_ema
+        last_bar_date = {}
+        for s in self.symbol_list:
+            last_bar_date[s] = None
+        return last_bar_date
 
     def calculate_signals(self, event):
         """
@@ -71,25 +81,45 @@ class ExponentialMovingAverageCrossStrategy(Strategy):
         """
         if event.type == 'MARKET':
             for s in self.symbol_list:
-                bars = self.bars.get_latest_bars_values(s, "close", N=self.long_window*2)
-                bar_date = self.bars.get_latest_bar_datetime(s)
-                if bars is not None and bars != []:
-                    short_ema = self._calculate_ema(bars, self.short_window)
-                    long_ema = self._calculate_ema(bars, self.long_window)
+                bar_date = event.timeindex
+                if bar_date != self.last_bar_date[s]:
+                    self.last_bar_date[s] = bar_date
+                    close = event.get_latest_bar_value(s, "close")
+                    short_ema = self.short_ema[s].update(close)
+                    long_ema = self.long_ema[s].update(close)
 
                     symbol = s
                     dt = datetime.datetime.utcnow()
                     sig_dir = ""
 
                     if short_ema > long_ema and self.bought[s] == "OUT":
-                        print "LONG: %s" % bar_date
+                        logger.debug("LONG: %s %s", s, bar_date)
                         sig_dir = 'LONG'
-                        signal = SignalEvent(1, symbol, dt, sig_dir, 1.0)
+                        signal = SignalEvent(self.strategy_id, symbol, dt, sig_dir, 1.0)
                         self.events.put(signal)
                         self.bought[s] = 'LONG'
                     elif short_ema < long_ema and self.bought[s] == "LONG":
-                        print "SHORT: %s" % bar_date
+                        logger.debug("SHORT: %s %s", s, bar_date)
                         sig_dir = 'EXIT'
-                        signal = SignalEvent(1, symbol, dt, sig_dir, 1.0)
+                        signal = SignalEvent(self.strategy_id, symbol, dt, sig_dir, 1.0)
                         self.events.put(signal)
-                        self.bought[s] = 'OUT'
\ No newline at end of file
+                        self.bought[s] = 'OUT'
+
+    def calculate_vectorized_signals(self, bar_store):
+        """
+        Vectorised form of calculate_signals. An average that is
+        still warming up compares below any value, so the strategy
+        enters as soon as the short average is available.
+
+        Parameters:
+        bar_store - The BarStore holding the full history.
+        """
+        close = bar_store.values[bar_store.field_index["close"]]
+        short_ready = vz.available(close, 2 * self.short_window)
+        long_ready = vz.available(close, 2 * self.long_window)
+        with np.errstate(invalid="ignore"):
+            short_ema = vz.ema(close, self.short_window)
+            long_ema = vz.ema(close, self.long_window)
+            entry = short_ready & (~long_ready | (short_ema > long_ema))
+            exit = long_ready & (~short_ready | (short_ema < long_ema))
+        return entry, exit
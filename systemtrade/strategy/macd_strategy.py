@@ -1,9 +1,14 @@
 import datetime
+import logging
 import numpy as np
 
 from ..event import SignalEvent
+from ..indicators import MACD
+from ..indicators import vectorized as vz
 from strategy import Strategy
 
+logger = logging.getLogger(__name__)
+
 
 class MACDStrategy(Strategy):
     """
@@ -30,7 +35,11 @@ class MACDStrategy(Strategy):
         self.long_window = long_window
         self.shrt_window = shrt_window
         self.sgnl_window = sgnl_window
-        self.macd_bars = None
+        self.max_lookback = 1
+
+        # MACD state is kept per symbol and updated once per new bar
+        self.macd = self._calculate_initial_macd()
+        self.last_bar_date = self._calculate_initial_bar_dates()
                 
         # Set to True if a symbol is in the market
         self.bought = self._calculate_initial_bought()
@@ -55,25 +64,24 @@ class MACDStrategy(Strategy):
             first_signal[s] = True
         return first_signal
         
-    def _calculate_sma(self, data, window):
+    def _calculate_initial_macd(self):
         """
-        Calculate Simple Moveing Average
+        Creates a streaming MACD for all symbols.
         """
-        if len(data) < window:
-            return None
-        return sum(data[-window:]) / float(window)
+        macd = {}
+        for s in self.symbol_list:
+            macd[s] = MACD(self.long_window, self.shrt_window, self.sgnl_window)
+        return macd
 
-    def _calculate_ema(self, data, window):
+    def _calculate_initial_bar_dates(self):
         """
-        Calculate Exponential Moveing Average
+        Adds keys to the last_bar_date dictionary for all symbols
+        and sets them to None.
         """
-        if len(data) < window * 2:
-            return None
-        c = 2.0 / float(window + 1)
-        current_ema = self._calculate_sma(data[-window * 2: -window], window)
-        for value in data[-window:]:
-            current_ema = (c * value) + ((1 - c) * current_ema)
-        return current_ema
+        last_bar_date = {}
+        for s in self.symbol_list:
+            last_bar_date[s] = None
+        return last_bar_date
 
     def calculate_signals(self, event):
         """
@@ -86,36 +94,43 @@ class MACDStrategy(Strategy):
         """
         if event.type == 'MARKET':
             for s in self.symbol_list:
-                max_bar = self.long_window * 2 + self.sgnl_window
-                bars = self.bars.get_latest_bars_values(s, "close", N=max_bar)
-                bar_date = self.bars.get_latest_bar_datetime(s)
-                if bars is not None and bars != [] :
-                    long_ema = self._calculate_ema(bars[-(self.long_window * 2):], self.long_window)
-                    shrt_ema = self._calculate_ema(bars[-(self.shrt_window * 2):], self.shrt_window)
-                    sgnl_ema = None                        
-                    
-                    if shrt_ema is not None and long_ema is not None:
-                        if self.macd_bars is None:
-                            self.macd_bars = np.array([shrt_ema - long_ema])
-                        else:
-                            self.macd_bars = np.append(self.macd_bars, [shrt_ema - long_ema])
-                    
-                        sgnl_ema = self._calculate_ema(self.macd_bars[-(self.sgnl_window * 2):], self.sgnl_window)
-                                                
-                        symbol = s
-                        dt = datetime.datetime.utcnow()
-                        sig_dir = ""
+                bar_date = event.timeindex
+                if bar_date != self.last_bar_date[s]:
+                    self.last_bar_date[s] = bar_date
+                    close = event.get_latest_bar_value(s, "close")
+                    macd = self.macd[s].update(close)
+
+                    symbol = s
+                    dt = datetime.datetime.utcnow()
+                    sig_dir = ""
 
-                    if len(bars) == max_bar and sgnl_ema is not None:
-                        if (shrt_ema - long_ema) > sgnl_ema and sgnl_ema > 0 and self.bought[s] == "OUT":
-                            print "LONG: %s" % bar_date
+                    if macd is not None:
+                        macd_line, sgnl_ema = macd
+                        if macd_line > sgnl_ema and sgnl_ema > 0 and self.bought[s] == "OUT":
+                            logger.debug("LONG: %s %s", s, bar_date)
                             sig_dir = 'LONG'
-                            signal = SignalEvent(1, symbol, dt, sig_dir, 1.0)
+                            signal = SignalEvent(self.strategy_id, symbol, dt, sig_dir, 1.0)
                             self.events.put(signal)
                             self.bought[s] = 'LONG'
-                        elif (shrt_ema - long_ema) < sgnl_ema and self.bought[s] == "LONG":
-                            print "SHORT: %s" % bar_date
+                        elif macd_line < sgnl_ema and self.bought[s] == "LONG":
+                            logger.debug("SHORT: %s %s", s, bar_date)
                             sig_dir = 'EXIT'
-                            signal = SignalEvent(1, symbol, dt, sig_dir, 1.0)
+                            signal = SignalEvent(self.strategy_id, symbol, dt, sig_dir, 1.0)
                             self.events.put(signal)
-                            self.bought[s] = 'OUT'
\ No newline at end of file
+                            self.bought[s] = 'OUT'
+
+    def calculate_vectorized_signals(self, bar_store):
+        """
+        Vectorised form of calculate_signals.
+
+        Parameters:
+        bar_store - The BarStore holding the full history.
+        """
+        close = bar_store.values[bar_store.field_index["close"]]
+        with np.errstate(invalid="ignore"):
+            macd_line, sgnl_ema = vz.macd(
+                close, self.long_window, self.shrt_window, self.sgnl_window
+            )
+            entry = (macd_line > sgnl_ema) & (sgnl_ema > 0)
+            exit = macd_line < sgnl_ema
+        return entry, exit
@@ -1,9 +1,14 @@
 import datetime
+import logging
 import numpy as np
 
 from ..event import SignalEvent
+from ..indicators import Momentum
+from ..indicators import vectorized as vz
 from strategy import Strategy
 
+logger = logging.getLogger(__name__)
+
 class MomentumStrategy(Strategy):
     
     def __init__(self, bars, events, window=80):
@@ -12,6 +17,11 @@ class MomentumStrategy(Strategy):
         self.symbol_list = self.bars.symbol_list
         self.events = events
         self.window = window
+        self.max_lookback = 1
+
+        # Momentum is updated once per new bar
+        self.momentum = self._calculate_initial_momentum()
+        self.last_bar_date = self._calculate_initial_bar_dates()
                 
         # Set to True if a symbol is in the market
         self.bought = self._calculate_initial_bought()
@@ -36,6 +46,25 @@ class MomentumStrategy(Strategy):
             first_signal[s] = True
         return first_signal
 
+    def _calculate_initial_momentum(self):
+        """
+        Creates a streaming Momentum over the window for all symbols.
+        """
+        momentum = {}
+        for s in self.symbol_list:
+            momentum[s] = Momentum(self.window)
+        return momentum
+
+    def _calculate_initial_bar_dates(self):
+        """
+        Adds keys to the last_bar_date dictionary for all symbols
+        and sets them to None.
+        """
+        last_bar_date = {}
+        for s in self.symbol_list:
+            last_bar_date[s] = None
+        return last_bar_date
+
     def calculate_signals(self, event):
         """
         Generates a new set of signals based on the MAC
@@ -47,26 +76,38 @@ class MomentumStrategy(Strategy):
         """
         if event.type == 'MARKET':
             for s in self.symbol_list:
-                bars = self.bars.get_latest_bars_values(s, "close", N=self.window+1)
-                bar_date = self.bars.get_latest_bar_datetime(s)
-                if bars  is not None and bars  != [] :
-                    prev_close_price = max(bars[:1])
-                    curr_close_price = max(bars[-1:])
+                bar_date = event.timeindex
+                if bar_date != self.last_bar_date[s]:
+                    self.last_bar_date[s] = bar_date
+                    close = event.get_latest_bar_value(s, "close")
+                    momentum = self.momentum[s].update(close)
 
                     symbol = s
                     dt = datetime.datetime.utcnow()
                     sig_dir = ""
 
-                    if len(bars) == self.window+1:
-                        if curr_close_price > prev_close_price and self.bought[s] == "OUT":
-                            print "LONG: %s" % bar_date
+                    if momentum is not None:
+                        if momentum > 0 and self.bought[s] == "OUT":
+                            logger.debug("LONG: %s %s", s, bar_date)
                             sig_dir = 'LONG'
-                            signal = SignalEvent(1, symbol, dt, sig_dir, 1.0)
+                            signal = SignalEvent(self.strategy_id, symbol, dt, sig_dir, 1.0)
                             self.events.put(signal)
                             self.bought[s] = 'LONG'
-                        elif curr_close_price < prev_close_price and self.bought[s] == "LONG":
-                            print "SHORT: %s" % bar_date
+                        elif momentum < 0 and self.bought[s] == "LONG":
+                            logger.debug("SHORT: %s %s", s, bar_date)
                             sig_dir = 'EXIT'
-                            signal = SignalEvent(1, symbol, dt, sig_dir, 1.0)
+                            signal = SignalEvent(self.strategy_id, symbol, dt, sig_dir, 1.0)
                             self.events.put(signal)
-                            self.bought[s] = 'OUT'
\ No newline at end of file
+                            self.bought[s] = 'OUT'
+
+    def calculate_vectorized_signals(self, bar_store):
+        """
+        Vectorised form of calculate_signals.
+
+        Parameters:
+        bar_store - The BarStore holding the full history.
+        """
+        close = bar_store.values[bar_store.field_index["close"]]
+        with np.errstate(invalid="ignore"):
+            momentum = vz.momentum(close, self.window)
+            return momentum > 0, momentum < 0
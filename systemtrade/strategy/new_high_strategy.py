@@ -1,9 +1,14 @@
 import datetime
+import logging
 import numpy as np
 
 from ..event import SignalEvent
+from ..indicators import EMA
+from ..indicators import vectorized as vz
 from strategy import Strategy
 
+logger = logging.getLogger(__name__)
+
 class NewHighStrategy(Strategy):
     """
     New High means All time high
@@ -23,7 +28,12 @@ class NewHighStrategy(Strategy):
         self.symbol_list = self.bars.symbol_list
         self.events = events
         self.ema_window = ema_window
-        self.max_bar = 0
+        self.max_lookback = 1
+
+        # Running all time high and EMA, updated once per new bar
+        self.hist_max = self._calculate_initial_hist_max()
+        self.sgnl_ema = self._calculate_initial_ema()
+        self.last_bar_date = self._calculate_initial_bar_dates()
                 
         # Set to True if a symbol is in the market
         self.bought = self._calculate_initial_bought()
@@ -48,26 +58,35 @@ class NewHighStrategy(Strategy):
             first_signal[s] = True
         return first_signal
         
-    def _calculate_sma(self, data, window):
+    def _calculate_initial_hist_max(self):
         """
-        Calculate Simple Moveing Average
+        Adds keys to the hist_max dictionary for all symbols
+        and sets them to None.
         """
-        if len(data) < window:
-            return None
-        return sum(data[-window:]) / float(window)
+        hist_max = {}
+        for s in self.symbol_list:
+            hist_max[s] = None
+        return hist_max
 
-    def _calculate_ema(self, data, window):
+    def _calculate_initial_ema(self):
         """
-        Calculate Exponential Moveing Average
+        Creates a streaming EMA of the ema_window for all symbols.
         """
-        if len(data) < window * 2:
-            return None
-        c = 2.0 / float(window + 1)
-        current_ema = self._calculate_sma(data[-window * 2: -window], window)
-        for value in data[-window:]:
-            current_ema = (c * value) + ((1 - c) * current_ema)
-        return current_ema
-        
+        sgnl_ema = {}
+        for s in self.symbol_list:
+            sgnl_ema[s] = EMA(self.ema_window)
+        return sgnl_ema
+
+    def _calculate_initial_bar_dates(self):
+        """
+        Adds keys to the last_bar_date dictionary for all symbols
+        and sets them to None.
+        """
+        last_bar_date = {}
+        for s in self.symbol_list:
+            last_bar_date[s] = None
+        return last_bar_date
+
     def calculate_signals(self, event):
         """
         Generates a new set of signals based on the Channel Breakout
@@ -79,28 +98,48 @@ class NewHighStrategy(Strategy):
         """
         if event.type == 'MARKET':
             for s in self.symbol_list:
-                self.max_bar += 1 
-                bars = self.bars.get_latest_bars_values(s, "close", N=self.max_bar)
-                bar_date = self.bars.get_latest_bar_datetime(s)
-                if bars is not None and bars != [] :
-                    curr_cls = np.max(bars[-1:])
-                    hist_max = np.max(bars[:(self.max_bar-1)])
-                    sgnl_ema = self._calculate_ema(bars[-(self.ema_window * 2):], self.ema_window)
-                    
+                bar_date = event.timeindex
+                if bar_date != self.last_bar_date[s]:
+                    self.last_bar_date[s] = bar_date
+                    curr_cls = event.get_latest_bar_value(s, "close")
+                    hist_max = self.hist_max[s]
+                    sgnl_ema = self.sgnl_ema[s].update(curr_cls)
+
+                    # The all time high excludes the current bar and
+                    # skips missing closes before a symbol is listed
+                    if not np.isnan(curr_cls) and (hist_max is None or curr_cls > hist_max):
+                        self.hist_max[s] = curr_cls
+
                     symbol = s
                     dt = datetime.datetime.utcnow()
                     sig_dir = ""
 
-                    if len(bars) == self.max_bar and curr_cls is not None and hist_max is not None and sgnl_ema is not None:
+                    if hist_max is not None and sgnl_ema is not None:
                         if curr_cls > hist_max and self.bought[s] == "OUT":
-                            print "LONG: %s" % bar_date
+                            logger.debug("LONG: %s %s", s, bar_date)
                             sig_dir = 'LONG'
-                            signal = SignalEvent(1, symbol, dt, sig_dir, 1.0)
+                            signal = SignalEvent(self.strategy_id, symbol, dt, sig_dir, 1.0)
                             self.events.put(signal)
                             self.bought[s] = 'LONG'
                         elif curr_cls < sgnl_ema and self.bought[s] == "LONG":
-                            print "SHORT: %s" % bar_date
+                            logger.debug("SHORT: %s %s", s, bar_date)
                             sig_dir = 'EXIT'
-                            signal = SignalEvent(1, symbol, dt, sig_dir, 1.0)
+                            signal = SignalEvent(self.strategy_id, symbol, dt, sig_dir, 1.0)
                             self.events.put(signal)
-                            self.bought[s] = 'OUT'
\ No newline at end of file
+                            self.bought[s] = 'OUT'
+
+    def calculate_vectorized_signals(self, bar_store):
+        """
+        Vectorised form of calculate_signals.
+
+        Parameters:
+        bar_store - The BarStore holding the full history.
+        """
+        close = bar_store.values[bar_store.field_index["close"]]
+        hist_max = vz.previous_max(close)
+        ready = ~np.isnan(hist_max) & vz.available(close, 2 * self.ema_window)
+        with np.errstate(invalid="ignore"):
+            sgnl_ema = vz.ema(close, self.ema_window)
+            entry = ready & (close > hist_max)
+            exit = ready & (close < sgnl_ema)
+        return entry, exit
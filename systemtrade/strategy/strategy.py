@@ -16,9 +16,33 @@ class Strategy(object):
 
     __metaclass__ = ABCMeta
 
+    # The largest number of bars requested per symbol from the
+    # DataHandler, or None if the full history is needed.
+    max_lookback = None
+
+    # The ID sent with every signal, set by the backtest when
+    # several strategies run side by side.
+    strategy_id = 1
+
     @abstractmethod
     def calculate_signals(self):
         """
         Provides the mechanisms to calculate the list of signals.
         """
         raise NotImplementedError("Should implement calculate_signals()")
+
+    def calculate_vectorized_signals(self, bar_store):
+        """
+        Calculates the entry and exit conditions of every bar at
+        once, for the VectorizedBacktest. A symbol that is out of
+        the market goes LONG on a bar whose entry condition holds
+        and one that is in the market EXITs on a bar whose exit
+        condition holds, exactly as calculate_signals would.
+
+        Parameters:
+        bar_store - The BarStore holding the full history.
+
+        Returns:
+        entry, exit - Boolean arrays shaped (symbols, bars).
+        """
+        raise NotImplementedError("Should implement calculate_vectorized_signals()")
@@ -0,0 +1,76 @@
+import unittest
+
+import numpy as np
+
+from systemtrade import data_handler as data
+from systemtrade.event import DequeEventBus
+
+
+SYMBOL_LIST = ["A", "B"]
+FIELDS = ["close", "volume"]
+
+
+def make_row(i):
+    # close i and volume 10 * i for A, negated for B
+    return np.array([[i, -i], [10 * i, -10 * i]], dtype=np.float64)
+
+
+class _ListDataHandler(data.BufferedDataHandler):
+
+    def __init__(self, events, rows):
+        super(_ListDataHandler, self).__init__(events, SYMBOL_LIST, FIELDS)
+        self.rows = list(rows)
+
+    def _get_new_bar(self):
+        if not self.rows:
+            return None
+        return self.rows.pop(0)
+
+
+class TestBarRingBuffer(unittest.TestCase):
+
+    def test_bounded_window(self):
+        buffer = data.BarRingBuffer(SYMBOL_LIST, FIELDS, capacity=4)
+        for i in range(11):
+            buffer.append(i, make_row(i))
+            n = min(i + 1, 4)
+            self.assertEqual(len(buffer), n)
+
+            window = buffer.window("A", "close", 4)
+            np.testing.assert_array_equal(window, np.arange(i + 1 - n, i + 1))
+            self.assertTrue(np.may_share_memory(window, buffer.values))
+            np.testing.assert_array_equal(
+                buffer.window("B", "volume", 2),
+                -10.0 * np.arange(i + 1 - min(n, 2), i + 1)
+            )
+            self.assertEqual(buffer.timestamps[buffer.end - 1], i)
+        self.assertEqual(len(buffer.window("A", "close", 10)), 4)
+
+    def test_window_is_read_only(self):
+        buffer = data.BarRingBuffer(SYMBOL_LIST, FIELDS, capacity=2)
+        buffer.append(0, make_row(0))
+        window = buffer.window("A", "close")
+        self.assertRaises(ValueError, window.__setitem__, 0, 1.0)
+
+    def test_unbounded_growth(self):
+        buffer = data.BarRingBuffer(SYMBOL_LIST, FIELDS, chunk_size=2)
+        for i in range(9):
+            buffer.append(i, make_row(i))
+        self.assertEqual(len(buffer), 9)
+        self.assertTrue(buffer.values.shape[2] >= 9)
+        np.testing.assert_array_equal(buffer.window("A", "close", 100), np.arange(9))
+        np.testing.assert_array_equal(buffer.timestamps[:buffer.end], np.arange(9))
+
+    def test_lookback_fixed_once_buffered(self):
+        handler = _ListDataHandler(DequeEventBus(), [(i, make_row(i)) for i in range(3)])
+        handler.set_max_lookback(2)
+        handler.update_bars()
+        self.assertRaises(ValueError, handler.set_max_lookback, 5)
+
+        handler.update_bars()
+        handler.update_bars()
+        np.testing.assert_array_equal(handler.get_latest_bars_values("A", "close", 5), [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from systemtrade import data_handler as data
+from systemtrade.data_handler.bar_store import _pct_change
+
+
+nan = np.nan
+
+
+class TestBarStore(unittest.TestCase):
+
+    def setUp(self):
+        # A has a missing close, B starts late and has its own gaps
+        self.store = data.BarStore.from_columns(["A", "B"], {
+            "A": (
+                np.array([1, 2, 3, 5], dtype=np.int64), ["open", "close"],
+                np.array([[1.0, 2.0, 3.0, 5.0], [10.0, nan, 12.0, 15.0]])
+            ),
+            "B": (
+                np.array([3, 4, 6], dtype=np.int64), ["open", "close"],
+                np.array([[3.0, 4.0, 6.0], [20.0, 22.0, 21.0]])
+            ),
+        })
+
+    def test_alignment(self):
+        store = self.store
+        np.testing.assert_array_equal(store.timestamps, [1, 2, 3, 4, 5, 6])
+        self.assertEqual(store.fields, ("open", "close", "returns"))
+        np.testing.assert_array_equal(store.column("A", "open"), [1, 2, 3, 3, 5, 5])
+        np.testing.assert_array_equal(store.column("A", "close"), [10, nan, 12, 12, 15, 15])
+        np.testing.assert_array_equal(store.column("B", "open"), [nan, nan, 3, 4, 4, 6])
+        np.testing.assert_array_equal(store.column("B", "close"), [nan, nan, 20, 22, 22, 21])
+
+    def test_returns(self):
+        np.testing.assert_allclose(
+            self.store.column("A", "returns"), [nan, nan, 0.2, 0.0, 0.25, 0.0]
+        )
+        np.testing.assert_allclose(
+            self.store.column("B", "returns"), [nan, nan, nan, 0.1, 0.0, 21.0 / 22 - 1]
+        )
+        for s in ("A", "B"):
+            np.testing.assert_array_equal(
+                self.store.column(s, "returns"),
+                pd.Series(self.store.column(s, "close")).pct_change().values
+            )
+
+    def test_pct_change(self):
+        values = np.array([nan, 4.0, nan, nan, 5.0, 2.5, nan, 2.5])
+        np.testing.assert_array_equal(
+            _pct_change(values), pd.Series(values).pct_change().values
+        )
+
+    def test_read_only(self):
+        self.assertFalse(self.store.values.flags.writeable)
+        self.assertFalse(self.store.timestamps.flags.writeable)
+        column = self.store.column("A", "close")
+        self.assertRaises(ValueError, column.__setitem__, 0, 1.0)
+
+    def test_mismatched_fields(self):
+        self.assertRaises(ValueError, data.BarStore.from_columns, ["A", "B"], {
+            "A": (np.array([1], dtype=np.int64), ["open", "close"], np.ones((2, 1))),
+            "B": (np.array([1], dtype=np.int64), ["close", "open"], np.ones((2, 1))),
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+
+from systemtrade import data_handler as data
+from systemtrade.backtest.backtest_eq_from_csv import header_names
+from systemtrade.event import DequeEventBus
+
+
+CSV_DIR = "../../data/"
+
+
+class TestBarStoreDataHandler(unittest.TestCase):
+
+    def create_handler(self, **params):
+        handler = data.HistoricCSVDataHandler(
+            DequeEventBus(), CSV_DIR, ["BBL"], header_names("mine"), **params
+        )
+        for _ in range(10):
+            handler.update_bars()
+        return handler
+
+    def test_window_beyond_max_lookback(self):
+        handler = self.create_handler()
+        handler.set_max_lookback(1)
+        close = handler.bar_store.column("BBL", "close")
+        np.testing.assert_array_equal(
+            handler.get_latest_bars_values("BBL", "close", 5), close[5:10]
+        )
+        self.assertEqual(len(handler.get_latest_bars("BBL", 5)), 5)
+        self.assertEqual(len(handler.get_latest_bars_values("BBL", "close", 50)), 10)
+
+    def test_zero_copy_view(self):
+        handler = self.create_handler(zero_copy=True)
+        values = handler.get_latest_bars_values("BBL", "close", 5)
+        self.assertTrue(np.shares_memory(values, handler.bar_store.values))
+        self.assertFalse(values.flags.writeable)
+        self.assertRaises(ValueError, values.__setitem__, 0, 1.0)
+
+    def test_copy(self):
+        handler = self.create_handler()
+        values = handler.get_latest_bars_values("BBL", "close", 5)
+        self.assertFalse(np.shares_memory(values, handler.bar_store.values))
+        self.assertTrue(values.base is None)
+        self.assertTrue(values.flags.writeable)
+        values[0] = -1.0
+        self.assertNotEqual(handler.get_latest_bars_values("BBL", "close", 5)[0], -1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import datetime
+import unittest
+
+import numpy as np
+
+from systemtrade import data_handler as data
+from systemtrade import strategy
+from systemtrade import portfolio as port
+from systemtrade import execution_handler as execute
+from systemtrade import backtest as test
+from systemtrade.data_handler import BarStore
+from systemtrade.event import DequeEventBus, MarketEvent, SignalEvent
+from systemtrade.output import NullOutputSink
+
+
+class _AboveStrategy(strategy.BatchStrategy):
+    # In the market while the close is above the first close of the block
+
+    def __init__(self, bars, events):
+        super(_AboveStrategy, self).__init__(bars, events, 2)
+
+    def calculate_batch_signals(self, block):
+        return block[:, -1] > block[:, 0], block[:, -1] < block[:, 0]
+
+
+class _Bars(object):
+
+    def __init__(self, bar_store):
+        self.bar_store = bar_store
+        self.symbol_list = bar_store.symbol_list
+
+
+class TestBatchStrategy(unittest.TestCase):
+
+    def test_signals_on_changes(self):
+        timestamps = np.arange(5, dtype=np.int64) * 86400 * 10**9
+        close = np.array([[1.0, 2.0, 3.0, 2.0, 2.0], [5.0, 4.0, 5.0, 6.0, 7.0]])
+        bar_store = BarStore(["A", "B"], ["close"], timestamps, close[None])
+
+        events = DequeEventBus()
+        signals = []
+        events.subscribe(SignalEvent, lambda e: signals.append((e.symbol, e.signal_type)))
+        batch = _AboveStrategy(_Bars(bar_store), events)
+        for i in range(5):
+            batch.calculate_signals(MarketEvent(bar_store.get_datetime(i), i, bar_store))
+            events.dispatch()
+        self.assertEqual(
+            signals,
+            [("A", "LONG"), ("B", "LONG"), ("A", "EXIT")]
+        )
+
+    def test_vectorized_equivalence(self):
+        args = ("../../data/", ["BBL", "KBANK", "KTB"], 100000.0, datetime.datetime(1992, 1, 2))
+        params = {"short_window": 20, "long_window": 50}
+        event_backtest = test.BacktestEqualWeightPortFromCSV(
+            *args, data_handler=data.HistoricCSVDataHandler,
+            execution_handler=execute.SimulatedExecutionHandler,
+            portfolio=port.EqualWeightedPortfolio,
+            strategy=(strategy.BatchMovingAverageCrossStrategy, params),
+            header_format="mine", output_sink=NullOutputSink()
+        )
+        event_backtest.simulate_trading()
+        vectorized_backtest = test.VectorizedBacktest(
+            *args, data_handler=data.HistoricCSVDataHandler,
+            strategy=strategy.BatchMovingAverageCrossStrategy,
+            header_format="mine", strategy_params=params
+        )
+        vectorized_backtest.simulate_trading()
+        self.assertTrue(event_backtest.signals > 0)
+        self.assertEqual(test.check_equivalence(event_backtest, vectorized_backtest), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from systemtrade import data_handler as data
+from systemtrade.event import DequeEventBus
+
+
+HEADER_NAMES = ["datetime", "open", "high", "low", "close", "volume"]
+
+
+class TestCalendarBarStore(unittest.TestCase):
+
+    def setUp(self):
+        # A listed from the first day, B listed late with a gap and
+        # a missing close, C delisted early
+        self.csv_dir = tempfile.mkdtemp() + os.sep
+        dates = ["2015-01-%02d" % d for d in range(1, 11)]
+        rows = {
+            "A": [(d, 10.0 + i) for i, d in enumerate(dates)],
+            "B": [(dates[3], 20.0), (dates[4], None), (dates[6], 22.0), (dates[9], 23.0)],
+            "C": [(dates[0], 30.0), (dates[2], 31.0), (dates[5], 29.0)],
+        }
+        for s, bars in rows.items():
+            with open(self.csv_dir + "%s.csv" % s, "w") as f:
+                f.write(",".join(HEADER_NAMES) + "\n")
+                for d, close in bars:
+                    close = "" if close is None else close
+                    f.write("%s,1,2,0.5,%s,100\n" % (d, close))
+        self.symbol_list = ["A", "B", "C"]
+
+    def tearDown(self):
+        shutil.rmtree(self.csv_dir)
+
+    def test_matches_padded_bars(self):
+        historic = data.HistoricCSVDataHandler(
+            DequeEventBus(), self.csv_dir, self.symbol_list, HEADER_NAMES
+        )
+        calendar = data.CalendarCSVDataHandler(
+            DequeEventBus(), self.csv_dir, self.symbol_list, HEADER_NAMES
+        )
+        store = calendar.calendar_store
+        self.assertEqual(store.values.shape, (5, 17))
+        np.testing.assert_array_equal(
+            store.to_bar_store().values, historic.bar_store.values
+        )
+
+        while historic.continue_backtest:
+            historic.update_bars()
+            calendar.update_bars()
+            self.assertEqual(historic.continue_backtest, calendar.continue_backtest)
+            for s in self.symbol_list:
+                for field in ("close", "returns"):
+                    np.testing.assert_array_equal(
+                        calendar.get_latest_bars_values(s, field, 20),
+                        historic.get_latest_bars_values(s, field, 20)
+                    )
+
+    def test_listing(self):
+        calendar = data.CalendarCSVDataHandler(
+            DequeEventBus(), self.csv_dir, self.symbol_list, HEADER_NAMES
+        )
+        store = calendar.calendar_store
+        np.testing.assert_array_equal(store.listing_start, [0, 3, 0])
+        np.testing.assert_array_equal(store.listing_end, [9, 9, 5])
+        np.testing.assert_array_equal(store.valid_mask(5), [True, False, True])
+        self.assertEqual(store.pad_index("B", 5), 1)
+        self.assertEqual(store.pad_index("B", 2), -1)
+
+        listed = []
+        for _ in range(len(store)):
+            calendar.update_bars()
+            listed.append(calendar.get_listed_symbols())
+        self.assertEqual(listed[0], ["A", "C"])
+        self.assertEqual(listed[4], ["A", "B", "C"])
+        self.assertEqual(listed[6], ["A", "B"])
+        self.assertFalse(calendar.is_listed("C"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+
+from systemtrade.monitor import ComponentTimer, StackSampler
+
+
+class TestComponentTimer(unittest.TestCase):
+
+    def test_summary(self):
+        timer = ComponentTimer()
+        double = timer.wrap("double", lambda x: 2 * x)
+        timer.wrap("unused", lambda: None)
+        self.assertEqual([double(i) for i in range(10)], range(0, 20, 2))
+
+        summary = timer.get_summary()
+        self.assertEqual(list(summary.index), ["double", "unused"])
+        self.assertEqual(summary.loc["double", "calls"], 10)
+        self.assertTrue(summary.loc["double", "p50_us"] <= summary.loc["double", "max_us"])
+        self.assertEqual(summary.loc["unused", "calls"], 0)
+
+
+class TestStackSampler(unittest.TestCase):
+
+    def test_folded_stacks(self):
+        sampler = StackSampler(interval=0.0005)
+        sampler.start()
+        try:
+            total = 0
+            while sum(sampler.samples.values()) < 5:
+                total += sum(i * i for i in xrange(1000))
+        finally:
+            sampler.stop()
+
+        fd, path = tempfile.mkstemp(suffix=".folded")
+        os.close(fd)
+        try:
+            sampler.write(path)
+            lines = open(path).read().splitlines()
+        finally:
+            os.remove(path)
+        self.assertTrue(lines)
+        stack, count = lines[0].rsplit(" ", 1)
+        self.assertIn("test_folded_stacks (test_component_timer.py:", stack)
+        self.assertTrue(int(count) >= 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from systemtrade.data_handler import csv_cache
+
+
+HEADER_NAMES = ["datetime", "open", "high", "low", "close", "volume"]
+
+
+class TestCSVCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.tmp_dir, "A.csv")
+        self.cache_path = self.csv_path + csv_cache.CACHE_SUFFIX
+        self.write_csv([10.0, 11.0, 12.0])
+        self.parse = csv_cache.parse_csv_columns
+
+    def tearDown(self):
+        csv_cache.parse_csv_columns = self.parse
+        shutil.rmtree(self.tmp_dir)
+
+    def write_csv(self, closes):
+        with open(self.csv_path, "w") as f:
+            f.write(",".join(HEADER_NAMES) + "\n")
+            for i, close in enumerate(closes):
+                f.write("2015-01-%02d,1,2,0.5,%s,100\n" % (i + 1, close))
+
+    def load(self, header_names=HEADER_NAMES):
+        return csv_cache.load_csv_columns(self.csv_path, header_names)
+
+    def assertColumnsEqual(self, actual, expected):
+        np.testing.assert_array_equal(actual[0], expected[0])
+        self.assertEqual(actual[1], expected[1])
+        np.testing.assert_array_equal(actual[2], expected[2])
+
+    def disable_parsing(self):
+        def parse(*args):
+            raise AssertionError("The CSV was parsed instead of read from the cache")
+        csv_cache.parse_csv_columns = parse
+
+    def test_hit(self):
+        expected = self.parse(self.csv_path, HEADER_NAMES)
+        self.assertColumnsEqual(self.load(), expected)
+        self.assertTrue(os.path.exists(self.cache_path))
+
+        self.disable_parsing()
+        self.assertColumnsEqual(self.load(), expected)
+
+    def test_invalidated_by_csv_change(self):
+        self.load()
+        self.write_csv([10.0, 11.0, 12.0, 13.5])
+        columns = self.load()
+        np.testing.assert_array_equal(columns[2][3], [10.0, 11.0, 12.0, 13.5])
+
+        self.disable_parsing()
+        self.assertColumnsEqual(self.load(), columns)
+
+    def test_invalidated_by_header_change(self):
+        self.load()
+        header_names = ["datetime", "open", "low", "high", "close", "volume"]
+        columns = self.load(header_names)
+        self.assertEqual(columns[1], header_names[1:])
+        self.assertColumnsEqual(columns, self.parse(self.csv_path, header_names))
+
+    def test_failed_write_leaves_no_files(self):
+        # A directory in the way of the cache file makes the write fail
+        os.mkdir(self.cache_path)
+        expected = self.parse(self.csv_path, HEADER_NAMES)
+        self.assertColumnsEqual(self.load(), expected)
+        self.assertEqual(
+            sorted(os.listdir(self.tmp_dir)),
+            ["A.csv", os.path.basename(self.cache_path)]
+        )
+        self.assertTrue(os.path.isdir(self.cache_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
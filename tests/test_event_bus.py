@@ -0,0 +1,74 @@
+import threading
+import unittest
+
+import numpy as np
+
+from systemtrade.data_handler import BarStore
+from systemtrade.event import (
+    MarketEvent, SignalEvent, OrderEvent, FillEvent,
+    DequeEventBus, ThreadSafeEventBus
+)
+
+
+class _TickEvent(MarketEvent):
+    pass
+
+
+class TestEventBus(unittest.TestCase):
+
+    def assertDispatches(self, bus):
+        seen = []
+        bus.subscribe(MarketEvent, lambda event: seen.append(("market", event)))
+        bus.subscribe(MarketEvent, lambda event: bus.put(SignalEvent(1, "BBL", None, "LONG", 1.0)))
+        bus.subscribe(SignalEvent, lambda event: seen.append(("signal", event)))
+
+        tick = _TickEvent()
+        bus.put(MarketEvent())
+        bus.put(None)
+        bus.put(tick)
+        self.assertEqual(bus.dispatch(), 4)
+        self.assertEqual(
+            [kind for kind, event in seen],
+            ["market", "market", "signal", "signal"]
+        )
+        self.assertIs(seen[1][1], tick)
+        self.assertEqual(bus.dispatch(), 0)
+
+    def test_deque_event_bus(self):
+        self.assertDispatches(DequeEventBus())
+
+    def test_thread_safe_event_bus(self):
+        self.assertDispatches(ThreadSafeEventBus())
+
+    def test_put_from_thread(self):
+        bus = ThreadSafeEventBus()
+        seen = []
+        bus.subscribe(MarketEvent, seen.append)
+        thread = threading.Thread(target=lambda: bus.put(MarketEvent()))
+        thread.start()
+        self.assertEqual(bus.dispatch(timeout=5.0), 1)
+        thread.join()
+        self.assertEqual(len(seen), 1)
+
+
+class TestEvents(unittest.TestCase):
+
+    def test_slots(self):
+        events = [
+            MarketEvent(), SignalEvent(1, "BBL", None, "LONG", 1.0),
+            OrderEvent("BBL", "MKT", 100, "BUY"),
+            FillEvent(None, "BBL", "ARCA", 100, "BUY", None)
+        ]
+        for event, event_type in zip(events, ["MARKET", "SIGNAL", "ORDER", "FILL"]):
+            self.assertEqual(event.type, event_type)
+            self.assertFalse(hasattr(event, "__dict__"))
+
+    def test_market_event_payload(self):
+        values = np.arange(12, dtype=np.float64).reshape(2, 2, 3)
+        store = BarStore(["BBL", "KTB"], ["open", "close"], np.arange(3), values)
+        event = MarketEvent(store.get_datetime(1), 1, store)
+        self.assertEqual(event.get_latest_bar_value("KTB", "close"), values[1, 1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import random
+import unittest
+
+import numpy as np
+
+from systemtrade.indicators import SMA, EMA, RollingMax, RollingMin, Momentum, MACD
+from systemtrade.indicators import vectorized
+
+
+def _sma(data, window):
+    if len(data) < window:
+        return None
+    return sum(data[-window:]) / float(window)
+
+def _ema(data, window):
+    if len(data) < window * 2:
+        return None
+    c = 2.0 / float(window + 1)
+    current_ema = _sma(data[-window * 2: -window], window)
+    for value in data[-window:]:
+        current_ema = (c * value) + ((1 - c) * current_ema)
+    return current_ema
+
+
+class TestIndicators(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(1)
+        self.data = [random.uniform(10.0, 100.0) for i in range(1000)]
+        self.data[300] = float("nan")
+
+    def assertStreams(self, indicator, reference):
+        for t, value in enumerate(self.data):
+            result = indicator.update(value)
+            expected = reference(self.data[:t + 1])
+            if expected is None:
+                self.assertIsNone(result)
+            elif np.isnan(expected):
+                self.assertTrue(np.isnan(result))
+            else:
+                self.assertAlmostEqual(result, expected, places=8)
+
+    def test_sma(self):
+        for window in (1, 5, 40):
+            self.assertStreams(SMA(window), lambda d: _sma(d, window))
+
+    def test_ema(self):
+        for window in (1, 5, 40):
+            self.assertStreams(EMA(window), lambda d: _ema(d, window))
+
+    def test_rolling_max_min(self):
+        for window in (1, 5, 40):
+            self.assertStreams(
+                RollingMax(window),
+                lambda d: None if len(d) < window else np.max(d[-window:])
+            )
+            self.assertStreams(
+                RollingMin(window),
+                lambda d: None if len(d) < window else np.min(d[-window:])
+            )
+
+    def test_momentum(self):
+        for window in (1, 5, 40):
+            self.assertStreams(
+                Momentum(window),
+                lambda d: None if len(d) <= window else d[-1] - d[-1 - window]
+            )
+
+    def test_macd(self):
+        macd = MACD(26, 12, 9)
+        line = []
+        for t, value in enumerate(self.data[:200]):
+            result = macd.update(value)
+            data = self.data[:t + 1]
+            if _ema(data, 26) is not None:
+                line.append(_ema(data, 12) - _ema(data, 26))
+            signal = _ema(line, 9)
+            if signal is None:
+                self.assertIsNone(result)
+            else:
+                self.assertAlmostEqual(result[0], line[-1], places=8)
+                self.assertAlmostEqual(result[1], signal, places=8)
+
+
+class TestVectorizedIndicators(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(2)
+        data = [round(random.uniform(10.0, 100.0), 1) for i in range(1000)]
+        data[:5] = [float("nan")] * 5
+        data[300] = float("nan")
+        data[600:700] = [data[599]] * 100
+        self.data = np.array([data, data[::-1]])
+
+    def assertSameAsStreaming(self, values, indicator_cls, *args):
+        for row, symbol_values in zip(values, self.data):
+            indicator = indicator_cls(*args)
+            for t, value in enumerate(symbol_values):
+                expected = indicator.update(value)
+                if expected is None or np.isnan(expected):
+                    self.assertTrue(np.isnan(row[t]))
+                else:
+                    # Exactly equal, not just close
+                    self.assertEqual(row[t], expected)
+
+    def test_indicators(self):
+        for window in (1, 3, 20):
+            self.assertSameAsStreaming(vectorized.sma(self.data, window), SMA, window)
+            self.assertSameAsStreaming(vectorized.ema(self.data, window), EMA, window)
+            self.assertSameAsStreaming(
+                vectorized.rolling_max(self.data, window), RollingMax, window
+            )
+            self.assertSameAsStreaming(
+                vectorized.rolling_min(self.data, window), RollingMin, window
+            )
+            self.assertSameAsStreaming(
+                vectorized.momentum(self.data, window), Momentum, window
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import datetime
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from systemtrade.portfolio import Ledger
+
+
+class TestLedger(unittest.TestCase):
+
+    def test_grows_in_chunks(self):
+        ledger = Ledger(['a', 'b'], chunk_size=2)
+        start = pd.Timestamp(datetime.datetime(1992, 1, 2)).value
+        day = 24 * 3600 * 10**9
+        for i in range(5):
+            row = ledger.append(start + i * day)
+            row[ledger.column_index['a']] = i
+            row[ledger.column_index['b']] = 2.0 * i
+        self.assertEqual(len(ledger), 5)
+
+        frame = ledger.to_frame()
+        self.assertEqual(list(frame.columns), ['a', 'b'])
+        self.assertEqual(frame.index.name, 'datetime')
+        self.assertEqual(frame.index[0], pd.Timestamp(datetime.datetime(1992, 1, 2)))
+        self.assertEqual(frame.index[-1], pd.Timestamp(datetime.datetime(1992, 1, 6)))
+        np.testing.assert_array_equal(frame['a'].values, np.arange(5.0))
+        np.testing.assert_array_equal(frame['b'].values, 2.0 * np.arange(5.0))
+
+    def test_preallocated(self):
+        ledger = Ledger(['a'], capacity=3)
+        for i in range(3):
+            ledger.append(i)[0] = i
+        values = ledger.values
+        self.assertEqual(len(ledger.to_frame()), 3)
+        self.assertIs(ledger.values, values)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from systemtrade import data_handler as data
+from systemtrade.event import DequeEventBus
+
+
+HEADER_NAMES = ["datetime", "open", "high", "low", "close", "volume"]
+
+
+class TestMemmapStore(unittest.TestCase):
+
+    def setUp(self):
+        # A listed throughout, B listed late with a gap, C delisted early
+        self.tmp_dir = tempfile.mkdtemp()
+        self.csv_dir = os.path.join(self.tmp_dir, "csv") + os.sep
+        self.store_dir = os.path.join(self.tmp_dir, "store")
+        os.mkdir(self.csv_dir)
+        dates = ["2015-01-%02d" % d for d in range(1, 11)]
+        rows = {
+            "A": [(d, 10.0 + i) for i, d in enumerate(dates)],
+            "B": [(d, 20.0 + i) for i, d in enumerate(dates) if i >= 3 and i != 6],
+            "C": [(d, 30.0 - i) for i, d in enumerate(dates[:5])],
+        }
+        for s, bars in rows.items():
+            with open(self.csv_dir + "%s.csv" % s, "w") as f:
+                f.write(",".join(HEADER_NAMES) + "\n")
+                for d, close in bars:
+                    f.write("%s,1,2,0.5,%s,100\n" % (d, close))
+        self.symbol_list = ["A", "B", "C"]
+        data.convert_csv_to_memmap(
+            self.csv_dir, self.symbol_list, HEADER_NAMES, self.store_dir
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_read_only_memmaps(self):
+        store = data.load_memmap_store(self.store_dir)
+        for array in (store.values, store.timestamps):
+            self.assertTrue(isinstance(array.base, np.memmap))
+            self.assertFalse(array.flags.writeable)
+        self.assertEqual(store.symbol_list, self.symbol_list)
+        self.assertEqual(store.values.shape, (6, 3, 10))
+
+    def test_replays_historic_bars(self):
+        historic = data.HistoricCSVDataHandler(
+            DequeEventBus(), self.csv_dir, self.symbol_list, HEADER_NAMES
+        )
+        memmap = data.MemmapDataHandler(
+            DequeEventBus(), self.store_dir, self.symbol_list
+        )
+        np.testing.assert_array_equal(memmap.bar_store.values, historic.bar_store.values)
+
+        while historic.continue_backtest:
+            historic.update_bars()
+            memmap.update_bars()
+            self.assertEqual(memmap.continue_backtest, historic.continue_backtest)
+            if not historic.continue_backtest:
+                break
+            for s in self.symbol_list:
+                self.assertEqual(
+                    memmap.get_latest_bar_datetime(s),
+                    historic.get_latest_bar_datetime(s)
+                )
+                for field in ("close", "returns"):
+                    np.testing.assert_array_equal(
+                        memmap.get_latest_bars_values(s, field, 20),
+                        historic.get_latest_bars_values(s, field, 20)
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
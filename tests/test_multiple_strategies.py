@@ -0,0 +1,54 @@
+import datetime
+import unittest
+
+import numpy as np
+
+from systemtrade import data_handler as data
+from systemtrade import strategy
+from systemtrade import portfolio as port
+from systemtrade import execution_handler as execute
+from systemtrade import backtest as test
+from systemtrade.output import NullOutputSink
+
+
+class TestMultipleStrategies(unittest.TestCase):
+
+    def run_backtest(self, strategies):
+        backtest = test.BacktestEqualWeightPortFromCSV(
+            "../../data/", ["BBL", "KBANK"], 100000.0, datetime.datetime(1992, 1, 2),
+            data_handler=data.HistoricCSVDataHandler,
+            execution_handler=execute.SimulatedExecutionHandler,
+            portfolio=port.EqualWeightedPortfolio,
+            strategy=strategies, header_format="mine",
+            output_sink=NullOutputSink()
+        )
+        backtest.simulate_trading()
+        return backtest
+
+    def test_attribution(self):
+        sma = (strategy.SimpleMovingAverageCrossStrategy, {"short_window": 20, "long_window": 50})
+        ema = (strategy.ExponentialMovingAverageCrossStrategy, {"short_window": 20, "long_window": 50})
+        combined = self.run_backtest([sma, ema])
+        alone = [self.run_backtest([sma]), self.run_backtest([ema])]
+
+        self.assertEqual(combined.num_strats, 2)
+        self.assertEqual(combined.portfolio.strategy_ids, [1, 2])
+        for strategy_id, single in zip([1, 2], alone):
+            self.assertEqual(combined.signals_by_strategy[strategy_id], single.signals)
+
+        # Each strategy trades half the quantity it trades alone
+        pnl = combined.portfolio.create_strategy_pnl_dataframe()
+        self.assertEqual(list(pnl.columns), [1, 2])
+        for strategy_id, single in zip([1, 2], alone):
+            single_pnl = single.portfolio.create_strategy_pnl_dataframe()[1]
+            np.testing.assert_allclose(pnl[strategy_id].values, 0.5 * single_pnl.values, atol=1e-6)
+
+        # The P&L of the strategies adds up to that of the portfolio
+        total = combined.portfolio.equity_curve["total"]
+        np.testing.assert_allclose(
+            pnl.sum(axis=1).values[1:], total.values[1:] - 100000.0, atol=1e-6
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
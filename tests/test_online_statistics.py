@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from systemtrade.portfolio import OnlineStatistics
+from systemtrade.portfolio import performance
+
+
+class TestOnlineStatistics(unittest.TestCase):
+
+    def test_matches_summary_stats(self):
+        np.random.seed(2)
+        index = pd.date_range("1992-01-02", periods=501)
+        total = 100000.0 * np.cumprod(1.0 + np.random.normal(0.0002, 0.01, 501))
+        total[0] = 100000.0
+        curve = pd.DataFrame({'total': total}, index=index)
+        curve['returns'] = curve['total'].pct_change()
+        curve['equity_curve'] = (1.0+curve['returns']).cumprod()
+
+        stats = OnlineStatistics(100000.0)
+        for value in total[1:]:
+            stats.update(value)
+
+        drawdown, max_dd, duration = performance.create_drawdowns(curve['equity_curve'])
+        self.assertEqual(stats.count, 500)
+        self.assertEqual(stats.equity, curve['equity_curve'][-1])
+        self.assertEqual(stats.max_drawdown, max_dd)
+        self.assertEqual(stats.drawdown, drawdown[-1])
+        self.assertEqual(stats.max_drawdown_duration, duration)
+        self.assertAlmostEqual(stats.mean_return, curve['returns'].mean())
+        self.assertAlmostEqual(
+            stats.sharpe_ratio,
+            performance.create_sharpe_ratio(curve['returns'])
+        )
+        summary = performance.create_summary_stats(curve)[0]
+        self.assertEqual(stats.get_summary_stats()[0], summary[0])
+
+    def test_missing_total(self):
+        stats = OnlineStatistics(100.0)
+        stats.update(110.0)
+        stats.update(np.nan)
+        self.assertEqual(stats.total, 110.0)
+        self.assertEqual(stats.drawdown_duration, 0)
+        stats.update(99.0)
+        self.assertAlmostEqual(stats.drawdown, 0.11)
+        self.assertEqual(stats.drawdown_duration, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
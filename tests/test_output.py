@@ -0,0 +1,71 @@
+import os.path
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from systemtrade.output import (
+    BackgroundWriter, CompressedOutputSink, CSVOutputSink, NullOutputSink,
+    OutputSink
+)
+
+
+class _FailingOutputSink(OutputSink):
+
+    def write(self, equity_curve, stats):
+        raise IOError("disk full")
+
+
+class TestOutputSinks(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        index = pd.DatetimeIndex(
+            pd.date_range("1992-01-02", periods=3), name='datetime'
+        )
+        self.equity_curve = pd.DataFrame(
+            {'total': [100.0, 101.0, 99.5], 'returns': [np.nan, 0.01, -0.0149]},
+            index=index, columns=['total', 'returns']
+        )
+        self.stats = [("Total Return", "-0.50%"), ("Sharpe Ratio", "0.10")]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_csv(self):
+        path = os.path.join(self.tmp_dir, "run", "equity.csv")
+        stats_path = os.path.join(self.tmp_dir, "run", "stats.csv")
+        CSVOutputSink(path, stats_path).write(self.equity_curve, self.stats)
+        curve = pd.read_csv(path, index_col=0, parse_dates=True)
+        self.assertEqual(list(curve.columns), ['total', 'returns'])
+        self.assertEqual(list(curve['total']), [100.0, 101.0, 99.5])
+        self.assertIn("Total Return,-0.50%", open(stats_path).read())
+
+    def test_compressed(self):
+        path = os.path.join(self.tmp_dir, "equity.npz")
+        CompressedOutputSink(path).write(self.equity_curve, self.stats)
+        curve, stats = CompressedOutputSink.read(path)
+        self.assertTrue(curve.equals(self.equity_curve))
+        self.assertEqual(stats, self.stats)
+
+    def test_background_writer(self):
+        writer = BackgroundWriter()
+        paths = [os.path.join(self.tmp_dir, "equity_%d.csv" % i) for i in range(3)]
+        for path in paths:
+            writer.submit(CSVOutputSink(path), self.equity_curve, self.stats)
+        writer.submit(NullOutputSink(), self.equity_curve, self.stats)
+        writer.close()
+        self.assertTrue(all(os.path.exists(path) for path in paths))
+        self.assertRaises(ValueError, writer.submit, NullOutputSink(), None, None)
+
+    def test_background_writer_errors(self):
+        writer = BackgroundWriter()
+        writer.submit(_FailingOutputSink(), self.equity_curve, self.stats)
+        self.assertRaises(IOError, writer.flush)
+        writer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
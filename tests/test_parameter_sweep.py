@@ -0,0 +1,27 @@
+import datetime
+import unittest
+
+from systemtrade import strategy
+from systemtrade.backtest import ParameterSweep
+
+
+class TestParameterSweep(unittest.TestCase):
+
+    def test_engines_agree(self):
+        results = {}
+        for engine in ("event", "vectorized"):
+            sweep = ParameterSweep(
+                "../../data/", ["BBL"], 100000.0, datetime.datetime(1992, 1, 2),
+                strategy.SimpleMovingAverageCrossStrategy,
+                {"short_window": [10, 20], "long_window": [50]},
+                header_format="mine", processes=2, engine=engine
+            )
+            results[engine] = sweep.run()
+
+        self.assertEqual(len(results["event"]), 2)
+        self.assertEqual(list(results["event"]["short_window"]), [10, 20])
+        self.assertTrue(results["event"].equals(results["vectorized"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
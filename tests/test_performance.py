@@ -0,0 +1,78 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from systemtrade.portfolio import performance
+
+
+def _loop_drawdowns(pnl):
+    # The bar by bar calculation create_drawdowns replaced
+    hwm = [0]
+    drawdown = pd.Series(index=pnl.index)
+    duration = pd.Series(index=pnl.index)
+    for t in range(1, len(pnl.index)):
+        hwm.append(max(hwm[t-1], pnl[t]))
+        drawdown[t] = (hwm[t]-pnl[t])
+        duration[t] = (0 if drawdown[t] == 0 else duration[t-1]+1)
+    return drawdown, drawdown.max(), duration.max()
+
+
+class TestPerformance(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(1)
+        index = pd.date_range("1992-01-02", periods=500)
+        total = 100000.0 * np.cumprod(1.0 + np.random.normal(0.0005, 0.01, 500))
+        total[100:110] = total[99]
+        self.curve = pd.DataFrame({'total': total}, index=index)
+        self.curve['returns'] = self.curve['total'].pct_change()
+        self.curve['equity_curve'] = (1.0+self.curve['returns']).cumprod()
+
+    def test_drawdowns_match_loop(self):
+        pnl = self.curve['equity_curve']
+        drawdown, max_dd, duration = performance.create_drawdowns(pnl)
+        expected, expected_max_dd, expected_duration = _loop_drawdowns(pnl)
+        np.testing.assert_array_equal(drawdown.values, expected.values)
+        self.assertEqual(max_dd, expected_max_dd)
+        self.assertEqual(duration, expected_duration)
+
+    def test_ratios(self):
+        returns = self.curve['returns']
+        downside = np.sqrt(np.nanmean(np.minimum(returns.values, 0.0)**2))
+        self.assertAlmostEqual(
+            performance.create_sortino_ratio(returns),
+            np.sqrt(252) * returns.mean() / downside
+        )
+        self.assertAlmostEqual(performance.create_calmar_ratio(0.1, 0.2), 0.5)
+        self.assertTrue(np.isnan(performance.create_calmar_ratio(0.1, 0.0)))
+
+        rolling = performance.create_rolling_sharpe_ratio(returns, 50)
+        self.assertTrue(np.isnan(rolling[49]))
+        self.assertAlmostEqual(
+            rolling[-1], performance.create_sharpe_ratio(returns[-50:])
+        )
+
+    def test_exposure_and_turnover(self):
+        index = pd.date_range("1992-01-02", periods=4)
+        positions = pd.DataFrame({'A': [0.0, 0.0, 100.0, 0.0]}, index=index)
+        prices = pd.DataFrame({'A': [0.0, 10.0, 12.0, 11.0]}, index=index)
+        equity = pd.Series([1000.0] * 4, index=index)
+        self.assertEqual(performance.create_exposure(positions), 0.25)
+        # 100 bought at 10 and sold at 12 over 4/252 years
+        self.assertAlmostEqual(
+            performance.create_turnover(positions, prices, equity),
+            2200.0 / 1000.0 / (4 / 252.0)
+        )
+
+    def test_summary_stats(self):
+        stats = performance.create_summary_stats(self.curve)[0]
+        self.assertEqual(
+            [name for name, value in stats],
+            ["Total Return", "CAGR", "Sharpe Ratio", "Max Drawdown",
+             "Drawdown Duration", "Sortino Ratio", "Calmar Ratio"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
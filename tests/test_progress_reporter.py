@@ -0,0 +1,56 @@
+import logging
+import unittest
+
+from systemtrade.monitor import ProgressReporter
+
+
+class _ListHandler(logging.Handler):
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class TestProgressReporter(unittest.TestCase):
+
+    def setUp(self):
+        self.logger = logging.getLogger("systemtrade.test_progress")
+        self.logger.propagate = False
+        self.handler = _ListHandler()
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+
+    def test_reports(self):
+        self.logger.setLevel(logging.INFO)
+        progress = ProgressReporter(
+            10, interval=0.0, logger=self.logger, get_timestamp=lambda: "1992-01-02"
+        )
+        progress.update(5)
+        progress.finish()
+        self.assertEqual(len(self.handler.messages), 2)
+        self.assertIn("Bar 5/10 (50.0%)", self.handler.messages[0])
+        self.assertIn("at 1992-01-02", self.handler.messages[0])
+        self.assertIn("Processed 5 bars", self.handler.messages[1])
+
+    def test_rate_limited(self):
+        self.logger.setLevel(logging.INFO)
+        progress = ProgressReporter(interval=3600.0, logger=self.logger)
+        for i in range(1000):
+            progress.update(i)
+        self.assertEqual(self.handler.messages, [])
+
+    def test_quiet(self):
+        self.logger.setLevel(logging.WARNING)
+        progress = ProgressReporter(10, interval=0.0, logger=self.logger)
+        progress.update(5)
+        progress.finish()
+        self.assertEqual(self.handler.messages, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
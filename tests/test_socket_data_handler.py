@@ -0,0 +1,107 @@
+import datetime
+import functools
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from systemtrade import data_handler as data
+from systemtrade import strategy
+from systemtrade import portfolio as port
+from systemtrade import execution_handler as execute
+from systemtrade import backtest as test
+from systemtrade.event import DequeEventBus
+from systemtrade.output import NullOutputSink
+
+
+CSV_DIR = "../../data/"
+SYMBOL_LIST = ["BBL", "KBANK"]
+
+
+class TestSocketDataHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def run_backtest(self, data_handler, data_handler_params=None):
+        backtest = test.BacktestEqualWeightPortFromCSV(
+            CSV_DIR, SYMBOL_LIST, 100000.0, datetime.datetime(1992, 1, 2),
+            data_handler=data_handler, data_handler_params=data_handler_params,
+            execution_handler=execute.SimulatedExecutionHandler,
+            portfolio=port.EqualWeightedPortfolio,
+            strategy=functools.partial(
+                strategy.SimpleMovingAverageCrossStrategy,
+                short_window=20, long_window=60
+            ),
+            header_format="mine", output_sink=NullOutputSink()
+        )
+        backtest.simulate_trading()
+        return backtest
+
+    def test_matches_historic_backtest(self):
+        server = data.ReplayFeedServer(
+            CSV_DIR, SYMBOL_LIST, test.backtest_eq_from_csv.header_names("mine"),
+            address=os.path.join(self.tmp_dir, "feed.sock")
+        )
+        server.start()
+        try:
+            live = self.run_backtest(
+                data.SocketDataHandler, {"address": server.address}
+            )
+        finally:
+            server.stop()
+        historic = self.run_backtest(data.HistoricCSVDataHandler)
+        self.assertTrue(historic.latency is None)
+
+        np.testing.assert_array_equal(
+            live.portfolio.equity_curve["total"].values,
+            historic.portfolio.equity_curve["total"].values
+        )
+        self.assertEqual(live.orders, historic.orders)
+        latency = live.latency.get_summary()
+        self.assertEqual(latency.loc["bar arrival to order", "calls"], live.orders)
+
+    def test_paced_tcp_feed(self):
+        server = data.ReplayFeedServer(
+            CSV_DIR, ["BBL"], test.backtest_eq_from_csv.header_names("mine"),
+            bar_interval=0.001
+        )
+        server.start()
+        try:
+            handler = data.SocketDataHandler(
+                DequeEventBus(), None, ["BBL"],
+                test.backtest_eq_from_csv.header_names("mine"), server.address,
+                timeout=10.0
+            )
+            for _ in range(5):
+                handler.update_bars()
+            handler.close()
+        finally:
+            server.stop()
+        self.assertEqual(
+            handler.get_latest_bar_datetime("BBL"),
+            server.calendar_store.get_datetime(4)
+        )
+
+    def test_rejects_other_fields(self):
+        server = data.ReplayFeedServer(
+            CSV_DIR, ["BBL"], test.backtest_eq_from_csv.header_names("mine"),
+            address=os.path.join(self.tmp_dir, "feed.sock")
+        )
+        server.start()
+        try:
+            self.assertRaises(
+                ValueError, data.SocketDataHandler, DequeEventBus(),
+                None, ["BBL"], ["date", "close"], server.address
+            )
+        finally:
+            server.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from systemtrade import data_handler as data
+from systemtrade.event import DequeEventBus
+
+
+HEADER_NAMES = ["datetime", "open", "high", "low", "close", "volume"]
+FIELDS = ["open", "high", "low", "close", "volume", "returns"]
+
+
+class TestStreamingCSVDataHandler(unittest.TestCase):
+
+    def setUp(self):
+        # A listed throughout, B listed late with gaps and a missing
+        # close, C delisted early
+        self.csv_dir = tempfile.mkdtemp() + os.sep
+        dates = ["2015-01-%02d" % d for d in range(1, 21)]
+        self.write_csv("A", [(d, 10.0 + i) for i, d in enumerate(dates)])
+        self.write_csv("B", [
+            (d, None if i == 9 else 20.0 + i)
+            for i, d in enumerate(dates) if i >= 5 and i % 3 != 0
+        ])
+        self.write_csv("C", [(d, 30.0 - i) for i, d in enumerate(dates[:8]) if i != 4])
+        self.symbol_list = ["A", "B", "C"]
+
+    def tearDown(self):
+        shutil.rmtree(self.csv_dir)
+
+    def write_csv(self, symbol, bars):
+        with open(self.csv_dir + "%s.csv" % symbol, "w") as f:
+            f.write(",".join(HEADER_NAMES) + "\n")
+            for d, close in bars:
+                close = "" if close is None else close
+                f.write("%s,1,2,0.5,%s,100\n" % (d, close))
+
+    def assertSameBars(self, max_lookback=None, **params):
+        historic = data.HistoricCSVDataHandler(
+            DequeEventBus(), self.csv_dir, self.symbol_list, HEADER_NAMES
+        )
+        streaming = data.StreamingCSVDataHandler(
+            DequeEventBus(), self.csv_dir, self.symbol_list, HEADER_NAMES, **params
+        )
+        streaming.set_max_lookback(max_lookback)
+        n = max_lookback or 30
+
+        bars = 0
+        while historic.continue_backtest:
+            historic.update_bars()
+            streaming.update_bars()
+            self.assertEqual(streaming.continue_backtest, historic.continue_backtest)
+            if not historic.continue_backtest:
+                break
+            bars += 1
+            for s in self.symbol_list:
+                self.assertEqual(
+                    streaming.get_latest_bar_datetime(s),
+                    historic.get_latest_bar_datetime(s)
+                )
+                for field in FIELDS:
+                    np.testing.assert_array_equal(
+                        streaming.get_latest_bars_values(s, field, n),
+                        historic.get_latest_bars_values(s, field, n)
+                    )
+        self.assertEqual(bars, 20)
+
+    def test_chunk_sizes(self):
+        for chunk_size in (1, 7, 10000):
+            self.assertSameBars(chunk_size=chunk_size)
+
+    def test_bounded_lookback(self):
+        self.assertSameBars(max_lookback=3, chunk_size=7)
+
+    def test_unsorted_file(self):
+        self.write_csv("C", [("2015-01-02", 30.0), ("2015-01-01", 31.0)])
+
+        def run():
+            streaming = data.StreamingCSVDataHandler(
+                DequeEventBus(), self.csv_dir, self.symbol_list, HEADER_NAMES,
+                chunk_size=1
+            )
+            while streaming.continue_backtest:
+                streaming.update_bars()
+        self.assertRaises(ValueError, run)
+
+
+if __name__ == "__main__":
+    unittest.main()
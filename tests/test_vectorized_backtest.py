@@ -0,0 +1,64 @@
+import datetime
+import functools
+import unittest
+
+import numpy as np
+
+from systemtrade import data_handler as data
+from systemtrade import strategy
+from systemtrade import portfolio as port
+from systemtrade import execution_handler as execute
+from systemtrade import backtest as test
+from systemtrade.output import NullOutputSink
+
+
+class TestPositionsFromSignals(unittest.TestCase):
+
+    def test_state_machine(self):
+        entry = np.array([[0, 1, 1, 0, 1, 1, 0, 0]], dtype=bool)
+        exit = np.array([[1, 0, 1, 1, 1, 0, 1, 0]], dtype=bool)
+        state = test.positions_from_signals(entry, exit)
+        np.testing.assert_array_equal(state, [[0, 1, 0, 0, 1, 1, 0, 0]])
+
+
+class TestVectorizedBacktest(unittest.TestCase):
+
+    def assertEquivalent(self, strategy_cls, symbol_list, **params):
+        args = ("../../data/", symbol_list, 100000.0, datetime.datetime(1992, 1, 2))
+        event_backtest = test.BacktestEqualWeightPortFromCSV(
+            *args, data_handler=data.HistoricCSVDataHandler,
+            execution_handler=execute.SimulatedExecutionHandler,
+            portfolio=port.EqualWeightedPortfolio,
+            strategy=functools.partial(strategy_cls, **params),
+            header_format="mine", output_sink=NullOutputSink()
+        )
+        event_backtest.simulate_trading()
+        vectorized_backtest = test.VectorizedBacktest(
+            *args, data_handler=data.HistoricCSVDataHandler,
+            strategy=strategy_cls, header_format="mine",
+            strategy_params=params
+        )
+        vectorized_backtest.simulate_trading()
+        self.assertEqual(test.check_equivalence(event_backtest, vectorized_backtest), [])
+
+    def test_buy_and_hold(self):
+        self.assertEquivalent(strategy.BuyAndHoldStrategy, ["BBL", "KBANK"])
+
+    def test_sma_cross(self):
+        self.assertEquivalent(
+            strategy.SimpleMovingAverageCrossStrategy, ["BBL", "KBANK"],
+            short_window=20, long_window=60
+        )
+
+    def test_channel_breakout(self):
+        self.assertEquivalent(
+            strategy.ChannelBreakoutStrategy, ["BBL"],
+            high_window=10, low_window=5, use_high_low=True
+        )
+
+    def test_new_high(self):
+        self.assertEquivalent(strategy.NewHighStrategy, ["BBL"], ema_window=10)
+
+
+if __name__ == "__main__":
+    unittest.main()